@@ -4,4 +4,15 @@ from django.apps import AppConfig
 class AboutConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'about'
-    verbose_name = 'About Page Content'
\ No newline at end of file
+    verbose_name = 'About Page Content'
+
+    def ready(self):
+        from utils import cache
+
+        from . import signals  # noqa: F401
+
+        cache.register_dependency(
+            'about',
+            'about.AboutSection', 'about.TimelineEvent', 'about.Director',
+            'about.Facility', 'about.Statistic', 'about.ContactInfo',
+        )
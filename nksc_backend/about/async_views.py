@@ -0,0 +1,28 @@
+"""
+Async version of ``/api/about/``, routed when ``ASYNC_READ_VIEWS`` is on (see
+``utils/async_views.py``) for GET and HEAD only; the admin's POST still goes
+to ``AboutAPIView``. The snapshot is a file read, so it runs in a worker
+thread and the event loop stays free meanwhile.
+"""
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+
+from utils.async_views import json_response
+from utils.http_cache import set_cache_headers
+from utils.images import requested_preset
+
+from . import snapshot
+
+
+async def get_about(request):
+    """Get all about data in a single API call"""
+    if requested_preset(request) is not None:
+        # Resized image URLs are per request, so these skip the snapshot
+        return json_response(await sync_to_async(snapshot.build_payload)(request))
+
+    body, etag = await sync_to_async(snapshot.get)(request)
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(body, content_type='application/json')
+    return set_cache_headers(response, etag)
@@ -0,0 +1,12 @@
+# about/management/commands/rebuild_about_snapshot.py
+from django.core.management.base import BaseCommand
+
+from about import snapshot
+
+
+class Command(BaseCommand):
+    help = 'Re-render the cached /api/about/ snapshots (e.g. after editing about data with raw SQL)'
+
+    def handle(self, *args, **options):
+        rebuilt = snapshot.rebuild_all()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {rebuilt} about page snapshots'))
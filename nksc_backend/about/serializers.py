@@ -1,11 +1,15 @@
 from rest_framework import serializers
+
+from monitoring.serializers import TimedModelSerializer
+from utils.images import image_url
+
 from .models import (
     AboutSection, TimelineEvent, Director, 
     Facility, Statistic, ContactInfo
 )
 
 
-class AboutSectionSerializer(serializers.ModelSerializer):
+class AboutSectionSerializer(TimedModelSerializer):
     class Meta:
         model = AboutSection
         fields = [
@@ -15,7 +19,7 @@ class AboutSectionSerializer(serializers.ModelSerializer):
         ]
 
 
-class TimelineEventSerializer(serializers.ModelSerializer):
+class TimelineEventSerializer(TimedModelSerializer):
     class Meta:
         model = TimelineEvent
         fields = [
@@ -28,12 +32,12 @@ class TimelineEventSerializer(serializers.ModelSerializer):
         request = self.context.get('request')
         
         if request and instance.image:
-            data['image'] = request.build_absolute_uri(instance.image.url)
+            data['image'] = image_url(request, instance.image)
         
         return data
 
 
-class DirectorSerializer(serializers.ModelSerializer):
+class DirectorSerializer(TimedModelSerializer):
     is_current = serializers.ReadOnlyField()
     
     class Meta:
@@ -50,12 +54,12 @@ class DirectorSerializer(serializers.ModelSerializer):
         request = self.context.get('request')
         
         if request and instance.image:
-            data['image'] = request.build_absolute_uri(instance.image.url)
+            data['image'] = image_url(request, instance.image)
         
         return data
 
 
-class FacilitySerializer(serializers.ModelSerializer):
+class FacilitySerializer(TimedModelSerializer):
     class Meta:
         model = Facility
         fields = [
@@ -69,18 +73,18 @@ class FacilitySerializer(serializers.ModelSerializer):
         request = self.context.get('request')
         
         if request and instance.image:
-            data['image'] = request.build_absolute_uri(instance.image.url)
+            data['image'] = image_url(request, instance.image)
         
         return data
 
 
-class StatisticSerializer(serializers.ModelSerializer):
+class StatisticSerializer(TimedModelSerializer):
     class Meta:
         model = Statistic
         fields = ['id', 'label', 'value', 'prefix', 'suffix', 'icon', 'display_order']
 
 
-class ContactInfoSerializer(serializers.ModelSerializer):
+class ContactInfoSerializer(TimedModelSerializer):
     class Meta:
         model = ContactInfo
         fields = ['id', 'contact_type', 'label', 'value', 'icon', 'display_order']
\ No newline at end of file
@@ -0,0 +1,16 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+
+from . import snapshot
+from .models import AboutSection, TimelineEvent, Director, Facility, Statistic, ContactInfo
+
+SNAPSHOT_MODELS = (AboutSection, TimelineEvent, Director, Facility, Statistic, ContactInfo)
+
+
+def rebuild_about_snapshot(sender, **kwargs):
+    transaction.on_commit(snapshot.schedule_rebuild)
+
+
+for model in SNAPSHOT_MODELS:
+    post_save.connect(rebuild_about_snapshot, sender=model, dispatch_uid=f'about-snapshot-save-{model.__name__}')
+    post_delete.connect(rebuild_about_snapshot, sender=model, dispatch_uid=f'about-snapshot-delete-{model.__name__}')
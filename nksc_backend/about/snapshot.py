@@ -0,0 +1,172 @@
+"""
+Precomputed about page.
+
+The whole ``/api/about/`` response is rendered once into a JSON file under
+``ABOUT_SNAPSHOT_DIR`` and served as-is with an ``ETag``. The about models
+change rarely; any save or delete of one of them re-renders every snapshot in
+the background once the transaction commits.
+
+Image URLs in the payload are absolute, so there is one snapshot per API base
+URL (scheme and host); the base is encoded in the file name so a rebuild knows
+what to render. Each worker memoizes the file in the Django cache and re-reads
+it only when the file is replaced, so a rebuild in one worker is picked up
+by all of them.
+"""
+import base64
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpRequest
+from rest_framework.utils.encoders import JSONEncoder
+
+from utils import background
+
+from .models import AboutSection, TimelineEvent, Director, Facility, Statistic, ContactInfo
+from .serializers import (
+    AboutSectionSerializer, TimelineEventSerializer,
+    DirectorSerializer, FacilitySerializer,
+    StatisticSerializer, ContactInfoSerializer
+)
+
+_rebuild_lock = threading.Lock()
+_rebuild_queued = False
+
+
+def snapshot_dir():
+    return getattr(settings, 'ABOUT_SNAPSHOT_DIR', os.path.join(settings.MEDIA_ROOT, 'about_snapshot'))
+
+
+def build_payload(request):
+    """The about page response: every active section, event, director, facility, statistic and contact."""
+    context = {'request': request}
+    directors = DirectorSerializer(
+        Director.objects.filter(is_active=True).order_by('director_type', '-display_order', 'name'),
+        many=True, context=context
+    ).data
+
+    return {
+        'success': True,
+        'data': {
+            'sections': AboutSectionSerializer(
+                AboutSection.objects.filter(is_active=True).order_by('display_order', 'title'),
+                many=True, context=context
+            ).data,
+            'timeline_events': TimelineEventSerializer(
+                TimelineEvent.objects.filter(is_active=True).order_by('-display_order', 'year'),
+                many=True, context=context
+            ).data,
+            'directors': {
+                'current': [d for d in directors if d['director_type'] == 'current'],
+                'previous': [d for d in directors if d['director_type'] == 'previous']
+            },
+            'facilities': FacilitySerializer(
+                Facility.objects.filter(is_active=True).order_by('display_order', 'title'),
+                many=True, context=context
+            ).data,
+            'statistics': StatisticSerializer(
+                Statistic.objects.filter(is_active=True).order_by('display_order', 'label'), many=True
+            ).data,
+            'contact_info': ContactInfoSerializer(
+                ContactInfo.objects.filter(is_active=True).order_by('display_order', 'contact_type'), many=True
+            ).data
+        }
+    }
+
+
+class _BaseRequest(HttpRequest):
+    """Just enough of a request for serializers to build absolute URLs under ``base``."""
+
+    def __init__(self, base):
+        super().__init__()
+        parts = urlsplit(base)
+        self._base_scheme = parts.scheme
+        self.META['HTTP_HOST'] = parts.netloc
+
+    def _get_scheme(self):
+        return self._base_scheme
+
+
+def _base(request):
+    return request.build_absolute_uri('/')
+
+
+def _path(base):
+    name = base64.urlsafe_b64encode(base.encode('utf-8')).decode('ascii')
+    return os.path.join(snapshot_dir(), f"{name}.json")
+
+
+def _write(base, body):
+    os.makedirs(snapshot_dir(), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=snapshot_dir(), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as fh:
+            fh.write(body)
+        os.replace(tmp_path, _path(base))
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def render(request):
+    body = json.dumps(build_payload(request), cls=JSONEncoder, ensure_ascii=False).encode('utf-8')
+    _write(_base(request), body)
+    return body
+
+
+def get(request):
+    """``(body, etag)`` of the snapshot for this request's base URL, rendering it if missing."""
+    base = _base(request)
+    path = _path(base)
+    try:
+        stat_result = os.stat(path)
+    except FileNotFoundError:
+        render(request)
+        stat_result = os.stat(path)
+    version = (stat_result.st_ino, stat_result.st_mtime_ns)
+
+    key = f"about-snapshot:{hashlib.sha1(base.encode('utf-8')).hexdigest()}"
+    cached = cache.get(key)
+    if cached is None or cached[0] != version:
+        with open(path, 'rb') as fh:
+            body = fh.read()
+        cached = (version, body, f'"{hashlib.sha1(body).hexdigest()}"')
+        cache.set(key, cached, None)
+    return cached[1], cached[2]
+
+
+def rebuild_all():
+    """Re-render every existing snapshot (one per base URL that has been served)."""
+    global _rebuild_queued
+    with _rebuild_lock:
+        _rebuild_queued = False
+
+    try:
+        names = os.listdir(snapshot_dir())
+    except FileNotFoundError:
+        return 0
+
+    rebuilt = 0
+    for name in names:
+        if not name.endswith('.json'):
+            continue
+        base = base64.urlsafe_b64decode(name[:-len('.json')]).decode('utf-8')
+        render(_BaseRequest(base))
+        rebuilt += 1
+    return rebuilt
+
+
+def schedule_rebuild():
+    """Queue ``rebuild_all`` on the background pool; changes made before it starts share one rebuild."""
+    global _rebuild_queued
+    with _rebuild_lock:
+        if _rebuild_queued:
+            return
+        _rebuild_queued = True
+    background.submit(rebuild_all)
@@ -1,3 +1,53 @@
-from django.test import TestCase
+import shutil
+import tempfile
 
-# Create your tests here.
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from .models import Director, Statistic
+
+
+class AboutSnapshotTests(TestCase):
+    def setUp(self):
+        snapshot_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, snapshot_dir, ignore_errors=True)
+        # Saves rebuild the snapshot in a background job; run it inline so the next GET sees it
+        settings_override = override_settings(ABOUT_SNAPSHOT_DIR=snapshot_dir, BACKGROUND_TASKS_ASYNC=False)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        Director.objects.create(name="A. Director", position="Director", director_type='current', period="2020 - 2025")
+        Statistic.objects.create(label="Publications", value="120")
+        self.client = APIClient()
+
+    def test_served_from_snapshot_with_etag(self):
+        response = self.client.get('/api/about/')
+        self.assertEqual(response.status_code, 200)
+        data = response.json()['data']
+        self.assertEqual([d['name'] for d in data['directors']['current']], ["A. Director"])
+        self.assertEqual(data['statistics'][0]['value'], "120")
+
+        with self.assertNumQueries(0):
+            again = self.client.get('/api/about/')
+        self.assertEqual(again.content, response.content)
+
+        etag = response['ETag']
+        with self.assertNumQueries(0):
+            revalidated = self.client.get('/api/about/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(revalidated.status_code, 304)
+
+    def test_saves_and_deletes_rebuild_snapshot(self):
+        etag = self.client.get('/api/about/')['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Statistic.objects.filter(label="Publications").get().delete()
+        response = self.client.get('/api/about/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['data']['statistics'], [])
+
+        etag = response['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            Statistic.objects.create(label="Projects", value="8")
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/about/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.json()['data']['statistics'][0]['label'], "Projects")
@@ -1,4 +1,9 @@
+from django.conf import settings
 from django.urls import path
+
+from utils.async_views import split_by_method
+
+from . import async_views
 from .views import (
     AboutAPIView,
     AboutSectionsAPIView,
@@ -22,4 +27,9 @@ urlpatterns = [
     path('facilities/', FacilitiesAPIView.as_view(), name='facilities'),
     path('statistics/', StatisticsAPIView.as_view(), name='statistics'),
     path('contact/', ContactInfoAPIView.as_view(), name='contact-info'),
-]
\ No newline at end of file
+]
+
+if settings.ASYNC_READ_VIEWS:
+    urlpatterns = [
+        path('', split_by_method(async_views.get_about, AboutAPIView.as_view()), name='about-data'),
+    ] + urlpatterns
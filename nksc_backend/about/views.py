@@ -3,8 +3,15 @@ from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import AllowAny, IsAdminUser
 from django.db.models import Q
+from django.http import HttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response
 
+from utils.cache import cached_response
+from utils.http_cache import conditional_read, set_cache_headers
+from utils.images import requested_preset
+
+from . import snapshot
 from .models import (
     AboutSection, TimelineEvent, Director, 
     Facility, Statistic, ContactInfo
@@ -27,51 +34,15 @@ class AboutAPIView(APIView):
     
     def get(self, request):
         """Get all about data in a single API call"""
-        
-        # Get active sections by type
-        sections = AboutSection.objects.filter(is_active=True).order_by('display_order', 'title')
-        
-        # Get timeline events
-        timeline_events = TimelineEvent.objects.filter(is_active=True).order_by('-display_order', 'year')
-        
-        # Get directors
-        directors = Director.objects.filter(is_active=True).order_by('director_type', '-display_order', 'name')
-        
-        # Get facilities
-        facilities = Facility.objects.filter(is_active=True).order_by('display_order', 'title')
-        
-        # Get statistics
-        statistics = Statistic.objects.filter(is_active=True).order_by('display_order', 'label')
-        
-        # Get contact info
-        contact_info = ContactInfo.objects.filter(is_active=True).order_by('display_order', 'contact_type')
-        
-        # Serialize data
-        sections_data = AboutSectionSerializer(sections, many=True, context={'request': request}).data
-        timeline_data = TimelineEventSerializer(timeline_events, many=True, context={'request': request}).data
-        directors_data = DirectorSerializer(directors, many=True, context={'request': request}).data
-        facilities_data = FacilitySerializer(facilities, many=True, context={'request': request}).data
-        stats_data = StatisticSerializer(statistics, many=True).data
-        contact_data = ContactInfoSerializer(contact_info, many=True).data
-        
-        # Group directors by type
-        current_directors = [d for d in directors_data if d['director_type'] == 'current']
-        previous_directors = [d for d in directors_data if d['director_type'] == 'previous']
-        
-        return Response({
-            'success': True,
-            'data': {
-                'sections': sections_data,
-                'timeline_events': timeline_data,
-                'directors': {
-                    'current': current_directors,
-                    'previous': previous_directors
-                },
-                'facilities': facilities_data,
-                'statistics': stats_data,
-                'contact_info': contact_data
-            }
-        })
+        if requested_preset(request) is not None:
+            # Resized image URLs are per request, so these skip the snapshot
+            return Response(snapshot.build_payload(request))
+
+        body, etag = snapshot.get(request)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = HttpResponse(body, content_type='application/json')
+        return set_cache_headers(response, etag)
     
     def post(self, request):
         """Create multiple about data entries at once (Admin only)"""
@@ -152,6 +123,8 @@ class AboutSectionsAPIView(APIView):
             return [AllowAny()]
         return [AllowAny()]
     
+    @conditional_read('about')
+    @cached_response('about')
     def get(self, request):
         section_type = request.query_params.get('type', None)
         
@@ -198,6 +171,8 @@ class TimelineEventsAPIView(APIView):
             return [AllowAny()]
         return [AllowAny()]
     
+    @conditional_read('about')
+    @cached_response('about')
     def get(self, request):
         events = TimelineEvent.objects.filter(is_active=True).order_by('-display_order', 'year')
         serializer = TimelineEventSerializer(events, many=True, context={'request': request})
@@ -236,6 +211,8 @@ class DirectorsAPIView(APIView):
             return [AllowAny()]
         return [AllowAny()]
     
+    @conditional_read('about')
+    @cached_response('about')
     def get(self, request):
         director_type = request.query_params.get('type', None)
         
@@ -279,6 +256,8 @@ class CurrentDirectorAPIView(APIView):
     """Get current director"""
     permission_classes = [AllowAny]
     
+    @conditional_read('about')
+    @cached_response('about')
     def get(self, request):
         current_director = Director.objects.filter(
             director_type='current',
@@ -307,6 +286,8 @@ class FacilitiesAPIView(APIView):
             return [AllowAny()]
         return [AllowAny()]
     
+    @conditional_read('about')
+    @cached_response('about')
     def get(self, request):
         facilities = Facility.objects.filter(is_active=True).order_by('display_order', 'title')
         serializer = FacilitySerializer(facilities, many=True, context={'request': request})
@@ -347,6 +328,8 @@ class StatisticsAPIView(APIView):
             return [AllowAny()]
         return [IsAdminUser()]
     
+    @conditional_read('about')
+    @cached_response('about')
     def get(self, request):
         stats = Statistic.objects.filter(is_active=True).order_by('display_order', 'label')
         serializer = StatisticSerializer(stats, many=True)
@@ -385,6 +368,8 @@ class ContactInfoAPIView(APIView):
             return [AllowAny()]
         return [IsAdminUser()]
     
+    @conditional_read('about')
+    @cached_response('about')
     def get(self, request):
         contact_info = ContactInfo.objects.filter(is_active=True).order_by('display_order', 'contact_type')
         serializer = ContactInfoSerializer(contact_info, many=True)
@@ -0,0 +1,125 @@
+"""
+Compare the sync and async server profiles on the public read path.
+
+Start the same code twice, once per profile, against the same database:
+
+    SERVER_PROFILE=sync  GUNICORN_BIND=127.0.0.1:8000 gunicorn -c gunicorn.conf.py
+    SERVER_PROFILE=async GUNICORN_BIND=127.0.0.1:8001 gunicorn -c gunicorn.conf.py
+
+then run
+
+    python benchmark_read_path.py sync=http://127.0.0.1:8000 async=http://127.0.0.1:8001
+
+Every path is requested ``--requests`` times by ``--concurrency`` clients and
+the script prints requests per second, p50 and p99 latency and the error
+count per profile and path. ``--slow PATH`` keeps ``--slow-clients`` clients
+requesting a slow endpoint (e.g. an article PDF split) for the whole run, to
+show how each profile copes when some workers are busy.
+
+Conditional GETs are not sent, so every request does the full work; the
+Django cache still applies.
+"""
+import argparse
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_PATHS = [
+    '/api/news/urgent/',
+    '/api/news/upcoming-events/',
+    '/api/news/research/',
+    '/api/news/categories/',
+    '/api/news/stats/',
+    '/api/gallery/photos/',
+    '/api/gallery/years/',
+    '/api/gallery/stats/',
+    '/api/journals/get-all-journals/',
+    '/api/staff/departments/',
+    '/api/staff/stats/',
+    '/api/about/',
+]
+
+
+def fetch(url, timeout):
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            response.read()
+            ok = response.status == 200
+    except (urllib.error.URLError, OSError):
+        ok = False
+    return time.perf_counter() - started, ok
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def run(url, requests, concurrency, timeout):
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda _: fetch(url, timeout), range(requests)))
+    elapsed = time.perf_counter() - started
+
+    latencies = [latency for latency, ok in results if ok]
+    return {
+        'rps': len(latencies) / elapsed if elapsed else 0.0,
+        'p50': statistics.median(latencies) * 1000 if latencies else None,
+        'p99': percentile(latencies, 0.99) * 1000 if latencies else None,
+        'errors': len(results) - len(latencies),
+    }
+
+
+def keep_busy(url, clients, timeout, stop):
+    def loop():
+        while not stop.is_set():
+            fetch(url, timeout)
+
+    threads = [threading.Thread(target=loop, daemon=True) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    return threads
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('servers', nargs='+', metavar='NAME=BASE_URL',
+                        help='profiles to compare, e.g. sync=http://127.0.0.1:8000')
+    parser.add_argument('--path', action='append', dest='paths', help='path to request (repeatable)')
+    parser.add_argument('--requests', type=int, default=500, help='requests per path (default 500)')
+    parser.add_argument('--concurrency', type=int, default=32, help='concurrent clients (default 32)')
+    parser.add_argument('--timeout', type=float, default=30.0, help='per-request timeout in seconds')
+    parser.add_argument('--slow', metavar='PATH', help='slow endpoint kept busy during the run')
+    parser.add_argument('--slow-clients', type=int, default=2, help='clients requesting --slow (default 2)')
+    args = parser.parse_args()
+
+    servers = [server.split('=', 1) if '=' in server else (server, server) for server in args.servers]
+    paths = args.paths or DEFAULT_PATHS
+
+    print(f"{'profile':<8} {'path':<34} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for name, base in servers:
+        base = base.rstrip('/')
+        for path in paths:
+            # One warm-up request fills the caches so both profiles start equal
+            fetch(base + path, args.timeout)
+
+            stop = threading.Event()
+            busy = keep_busy(base + args.slow, args.slow_clients, args.timeout, stop) if args.slow else []
+            try:
+                result = run(base + path, args.requests, args.concurrency, args.timeout)
+            finally:
+                stop.set()
+                for thread in busy:
+                    thread.join()
+
+            p50 = f"{result['p50']:.1f}" if result['p50'] is not None else '-'
+            p99 = f"{result['p99']:.1f}" if result['p99'] is not None else '-'
+            print(f"{name:<8} {path:<34} {result['rps']:>9.1f} {p50:>9} {p99:>9} {result['errors']:>7}")
+
+
+if __name__ == '__main__':
+    main()
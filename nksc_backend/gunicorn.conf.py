@@ -0,0 +1,46 @@
+# /www/wwwroot/nksc_backend/gunicorn.conf.py
+# Deployment profiles, picked with SERVER_PROFILE (see settings.py):
+#
+#   sync  (default)  sync workers on nksc_backend.wsgi; one request per worker
+#   async            uvicorn workers on nksc_backend.asgi; the hot public reads
+#                    run as async views, everything else in a thread pool
+#
+# `gunicorn -c gunicorn.conf.py` serves the selected profile; GUNICORN_WORKERS
+# and GUNICORN_TIMEOUT override the worker count and timeout.
+import glob
+import os
+
+profile = os.environ.get('SERVER_PROFILE', 'sync')
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('GUNICORN_WORKERS', 3))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+accesslog = '-'
+errorlog = '-'
+loglevel = 'info'
+
+if profile == 'async':
+    wsgi_app = 'nksc_backend.asgi:application'
+    worker_class = 'uvicorn_worker.UvicornWorker'
+else:
+    wsgi_app = 'nksc_backend.wsgi:application'
+    worker_class = 'sync'
+
+
+def metrics_dir():
+    # Per-worker metric files (see monitoring/metrics.py)
+    return os.environ.get('METRICS_DIR', os.path.join(os.path.dirname(__file__), 'logs', 'metrics'))
+
+
+def on_starting(server):
+    # Files of the previous run
+    for path in glob.glob(os.path.join(metrics_dir(), '*.json')):
+        os.remove(path)
+
+
+def child_exit(server, worker):
+    # A dead worker's file would be summed forever, and its pid may be reused
+    try:
+        os.remove(os.path.join(metrics_dir(), f'{worker.pid}.json'))
+    except FileNotFoundError:
+        pass
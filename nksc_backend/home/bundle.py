@@ -0,0 +1,159 @@
+"""
+Everything the landing page needs, in one document.
+
+The Angular SSR server used to make seven calls per render (urgent news,
+upcoming events, research news, news stats, featured galleries, the chairman
+and the about statistics). Here each of those reads is a *section*; the
+sections run concurrently on a small thread pool, each with its own database
+connection, and are serialized with the lightweight list serializers.
+
+The assembled document is cached under a key made of the versions of every
+cache namespace it reads (``news``, ``media_stuff``, ``user_management``,
+``about``), the API base URL (media URLs are absolute), the image-size query
+parameters and today's date (upcoming events roll over at midnight). A write
+to any of those apps therefore produces a new key on the next request.
+"""
+import contextvars
+import hashlib
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+from rest_framework.utils.encoders import JSONEncoder
+
+from about.models import Statistic
+from about.serializers import StatisticSerializer
+from media_stuff.models import GalleryEvent
+from media_stuff.serializers import GalleryEventListSerializer
+from news.models import News
+from news.serializers import NewsListSerializer
+from news.stats import news_stats
+from user_management.models import Chairman
+from user_management.serializers import ChairmanSerializer
+from utils import cache
+from utils.images import requested_preset
+
+NAMESPACES = ('news', 'media_stuff', 'user_management', 'about')
+NEWS_LIMIT = 10
+FEATURED_GALLERY_LIMIT = 20
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+# ─────────────────────────────────────────────────────────────
+# SECTIONS
+# ─────────────────────────────────────────────────────────────
+
+def _published_news():
+    return News.objects.select_related('category').defer('content').filter(is_published=True)
+
+
+def urgent_news(request):
+    news = _published_news().filter(urgency__in=['urgent', 'breaking']).order_by('-publish_date')[:NEWS_LIMIT]
+    return NewsListSerializer(news, many=True, context={'request': request}).data
+
+
+def upcoming_events(request):
+    events = _published_news().filter(
+        is_event=True, event_date__gte=timezone.now().date()
+    ).order_by('event_date')[:NEWS_LIMIT]
+    return NewsListSerializer(events, many=True, context={'request': request}).data
+
+
+def research_news(request):
+    news = _published_news().filter(is_research=True).order_by('-publish_date')[:NEWS_LIMIT]
+    return NewsListSerializer(news, many=True, context={'request': request}).data
+
+
+def featured_galleries(request):
+    events = GalleryEvent.objects.for_listing().filter(
+        status='published', is_featured=True
+    ).order_by('-event_date', '-created_at')[:FEATURED_GALLERY_LIMIT]
+    return GalleryEventListSerializer(events, many=True, context={'request': request}).data
+
+
+def current_chairman(request):
+    chairman = Chairman.objects.filter(is_active=True).order_by('display_order', '-created_at').first()
+    return ChairmanSerializer(chairman, context={'request': request}).data if chairman else None
+
+
+def about_statistics(request):
+    statistics = Statistic.objects.filter(is_active=True).order_by('display_order', 'label')
+    return StatisticSerializer(statistics, many=True).data
+
+
+SECTIONS = {
+    'urgent_news': urgent_news,
+    'upcoming_events': upcoming_events,
+    'research_news': research_news,
+    'news_stats': lambda request: news_stats(),
+    'featured_galleries': featured_galleries,
+    'chairman': current_chairman,
+    'statistics': about_statistics,
+}
+
+
+# ─────────────────────────────────────────────────────────────
+# FAN-OUT
+# ─────────────────────────────────────────────────────────────
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'HOME_BUNDLE_WORKERS', 4),
+                    thread_name_prefix='nksc-home',
+                )
+    return _executor
+
+
+def _run_section(section, request):
+    # Pool threads keep their own connections; apply CONN_MAX_AGE like a request would
+    close_old_connections()
+    try:
+        return section(request)
+    finally:
+        close_old_connections()
+
+
+def build(request):
+    """Run every section, concurrently unless ``HOME_BUNDLE_WORKERS`` is 0."""
+    if not getattr(settings, 'HOME_BUNDLE_WORKERS', 4):
+        return {name: section(request) for name, section in SECTIONS.items()}
+
+    # Each section runs in a copy of this request's context, so it reads from the
+    # request's replica (see nksc_backend/db_router.py)
+    futures = {
+        name: _get_executor().submit(contextvars.copy_context().run, _run_section, section, request)
+        for name, section in SECTIONS.items()
+    }
+    return {name: future.result() for name, future in futures.items()}
+
+
+# ─────────────────────────────────────────────────────────────
+# CACHE
+# ─────────────────────────────────────────────────────────────
+
+def _key_parts(request):
+    versions = ','.join(f'{name}={cache.namespace(name).version()}' for name in NAMESPACES)
+    image_preset = ':'.join(requested_preset(request) or ())
+    return ('bundle', versions, request.build_absolute_uri('/'), image_preset, timezone.now().date().isoformat())
+
+
+def get(request):
+    """``(document, etag)`` for this request, from the cache or freshly built."""
+    home = cache.namespace('home')
+    parts = _key_parts(request)
+    cached = home.get(*parts)
+    if cached is None:
+        document = {'success': True, 'data': build(request)}
+        body = json.dumps(document, cls=JSONEncoder, sort_keys=True).encode('utf-8')
+        cached = (document, f'"{hashlib.sha1(body).hexdigest()}"')
+        home.set(cached, *parts, timeout=getattr(settings, 'HOME_BUNDLE_CACHE_TIMEOUT', 300))
+    return cached
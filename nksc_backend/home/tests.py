@@ -0,0 +1,91 @@
+import datetime
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from about.models import Statistic
+from media_stuff.models import GalleryEvent
+from news.models import News
+from user_management.models import Chairman
+
+
+def create_home_content():
+    for number, extra in enumerate((
+        {'urgency': 'breaking'},
+        {'is_event': True, 'event_date': timezone.now().date() + datetime.timedelta(days=3)},
+        {'is_research': True},
+    )):
+        News.objects.create(
+            title=f"News {number}", slug=f"news-{number}", short_description="Short",
+            content="<p>Body</p>", is_published=True, **extra
+        )
+    GalleryEvent.objects.create(
+        title="Featured", description="D", short_description="S", event_date=datetime.date(2024, 1, 1),
+        location="NKSC", status='published', is_featured=True,
+    )
+    Chairman.objects.create(
+        name_bangla="চেয়ারম্যান", name_english="Chairman",
+        designation_bangla="চেয়ারম্যান", designation_english="Chairman", bio_bangla="Bio",
+    )
+    Statistic.objects.create(label="Publications", value="120")
+
+
+class HomeBundleTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_home_content()
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.client = APIClient()
+
+    @override_settings(HOME_BUNDLE_WORKERS=0)
+    def test_bundle_is_cached_until_a_dependency_changes(self):
+        response = self.client.get('/api/home/')
+        data = response.data['data']
+        self.assertEqual([item['slug'] for item in data['urgent_news']], ['news-0'])
+        self.assertEqual([item['slug'] for item in data['upcoming_events']], ['news-1'])
+        self.assertEqual([item['slug'] for item in data['research_news']], ['news-2'])
+        self.assertNotIn('content', data['urgent_news'][0])
+        self.assertEqual(data['news_stats']['total_news'], 3)
+        self.assertEqual([item['title'] for item in data['featured_galleries']], ["Featured"])
+        self.assertEqual(data['chairman']['name_english'], "Chairman")
+        self.assertEqual(data['statistics'][0]['value'], "120")
+
+        with self.assertNumQueries(0):
+            cached = self.client.get('/api/home/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(cached.status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            statistic = Statistic.objects.get()
+            statistic.value = "121"
+            statistic.save()
+        response = self.client.get('/api/home/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data']['statistics'][0]['value'], "121")
+
+    @override_settings(HOME_BUNDLE_WORKERS=0)
+    def test_signed_in_bundle_is_not_shared(self):
+        self.client.force_authenticate(User.objects.create_user('editor', is_staff=True))
+        response = self.client.get('/api/home/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data']['statistics'][0]['value'], "120")
+        self.assertNotIn('ETag', response)
+        self.assertNotIn('public', response.get('Cache-Control', ''))
+
+
+class HomeBundleConcurrencyTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        create_home_content()
+
+    def test_sections_run_on_the_pool(self):
+        response = APIClient().get('/api/home/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data']['news_stats']['total_news'], 3)
+        self.assertEqual(response.data['data']['chairman']['name_english'], "Chairman")
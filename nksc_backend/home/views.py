@@ -0,0 +1,29 @@
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from django.utils.cache import get_conditional_response
+
+from nksc_backend.db_router import allow_replica_reads
+from utils.http_cache import set_cache_headers
+
+from . import bundle
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def get_home_bundle(request):
+    """
+    Landing page data in one call: urgent news, upcoming events, research news,
+    news stats, featured galleries, the current chairman and about statistics.
+    """
+    if request.user.is_authenticated:
+        # Like conditional_read: signed-in users get a fresh response without validators,
+        # so a shared cache never stores theirs
+        return Response({'success': True, 'data': bundle.build(request)})
+
+    allow_replica_reads(*bundle.NAMESPACES)
+    document, etag = bundle.get(request)
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = Response(document)
+    return set_cache_headers(response, etag)
@@ -1,5 +1,8 @@
 from django.contrib import admin
-from .models import Journal, JournalArticle
+from django.db.models import Count
+
+from . import search
+from .models import Author, Journal, JournalArticle, Keyword
 
 
 class JournalArticleInline(admin.StackedInline):
@@ -43,10 +46,20 @@ class JournalAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_counts()
+
+    def get_search_results(self, request, queryset, search_term):
+        ids = search.matching_ids(search_term, 'journal')
+        if ids is None:
+            return super().get_search_results(request, queryset, search_term)
+        return queryset.filter(pk__in=ids), False
+
     def article_count(self, obj):
-        count = obj.articles.count()
+        count = obj.article_count
         return f"{count} article{'s' if count != 1 else ''}"
     article_count.short_description = "Articles"
+    article_count.admin_order_field = "article_count"
 
 
 @admin.register(JournalArticle)
@@ -80,6 +93,36 @@ class JournalArticleAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_search_results(self, request, queryset, search_term):
+        ids = search.matching_ids(search_term, 'article')
+        if ids is None:
+            return super().get_search_results(request, queryset, search_term)
+        return queryset.filter(pk__in=ids), False
+
     def short_title(self, obj):
         return obj.title[:70] + ("..." if len(obj.title) > 70 else "")
     short_title.short_description = "Title"
+
+
+class NameWithArticleCountAdmin(admin.ModelAdmin):
+    list_display = ("name", "article_count")
+    search_fields = ("name", "normalized_name")
+    ordering = ["name"]
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(article_count=Count('article_links'))
+
+    def article_count(self, obj):
+        return obj.article_count
+    article_count.short_description = "Articles"
+    article_count.admin_order_field = "article_count"
+
+
+@admin.register(Author)
+class AuthorAdmin(NameWithArticleCountAdmin):
+    pass
+
+
+@admin.register(Keyword)
+class KeywordAdmin(NameWithArticleCountAdmin):
+    pass
@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class JournalConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'journal'
+
+    def ready(self):
+        from utils import cache
+
+        from . import signals  # noqa: F401
+
+        cache.register_dependency('journal', 'journal.Journal', 'journal.JournalArticle')
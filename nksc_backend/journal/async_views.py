@@ -0,0 +1,28 @@
+"""
+Async versions of the public journal reads, routed when ``ASYNC_READ_VIEWS``
+is on (see ``utils/async_views.py``). Bodies match the views in ``views.py``.
+"""
+from rest_framework import status
+
+from utils.async_views import async_read
+
+from .models import Journal
+from .serializers import JournalListSerializer
+
+
+@async_read('journal')
+async def get_all_journals(request):
+    """Public API – list all published journals (lightweight, no articles nested)"""
+    journals = Journal.objects.filter(is_published=True).with_counts().order_by("-created_at")
+
+    serializer = JournalListSerializer(
+        [journal async for journal in journals],
+        many=True,
+        context={"request": request}
+    )
+
+    return {
+        "message": "Journals retrieved successfully",
+        "code": status.HTTP_200_OK,
+        "data": serializer.data,
+    }
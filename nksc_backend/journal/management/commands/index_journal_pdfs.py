@@ -0,0 +1,30 @@
+# journal/management/commands/index_journal_pdfs.py
+from django.core.management.base import BaseCommand
+
+from journal.models import Journal
+from journal.pdf_index import index_journal
+
+
+class Command(BaseCommand):
+    help = 'Parse journal PDFs once and store page count, size, page offsets and bookmarks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('journal_ids', nargs='*', type=int, help='Only index these journals')
+        parser.add_argument('--missing', action='store_true', help='Skip journals that already have a ready index')
+
+    def handle(self, *args, **options):
+        journals = Journal.objects.exclude(pdf_file='')
+        if options['journal_ids']:
+            journals = journals.filter(id__in=options['journal_ids'])
+        if options['missing']:
+            journals = journals.exclude(pdf_index__status='ready')
+
+        for journal in journals:
+            index = index_journal(journal.id)
+            if index and index.is_ready:
+                self.stdout.write(f'Indexed {journal}: {index.page_count} pages')
+            else:
+                error = index.error if index else 'no PDF'
+                self.stdout.write(self.style.ERROR(f'{journal}: {error}'))
+
+        self.stdout.write(self.style.SUCCESS('Journal PDF indexing finished'))
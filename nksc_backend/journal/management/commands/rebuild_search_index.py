@@ -0,0 +1,12 @@
+# journal/management/commands/rebuild_search_index.py
+from django.core.management.base import BaseCommand
+
+from journal import search
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index of journals and journal articles'
+
+    def handle(self, *args, **options):
+        journals, articles = search.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Indexed {journals} journals and {articles} articles'))
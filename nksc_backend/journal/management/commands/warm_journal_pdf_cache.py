@@ -0,0 +1,30 @@
+# journal/management/commands/warm_journal_pdf_cache.py
+from django.core.management.base import BaseCommand
+
+from journal import pdf_cache
+from journal.models import Journal
+
+
+class Command(BaseCommand):
+    help = 'Hash journal PDFs and pre-split every article/prelims range into the PDF cache'
+
+    def add_arguments(self, parser):
+        parser.add_argument('journal_ids', nargs='*', type=int, help='Only warm these journals')
+        parser.add_argument('--rehash', action='store_true', help='Recompute the stored PDF hashes first')
+
+    def handle(self, *args, **options):
+        journals = Journal.objects.exclude(pdf_file='')
+        if options['journal_ids']:
+            journals = journals.filter(id__in=options['journal_ids'])
+
+        for journal in journals:
+            if options['rehash']:
+                journal.pdf_hash = ''
+            try:
+                pdf_cache.warm_journal_cache(journal)
+            except Exception as e:
+                self.stdout.write(self.style.ERROR(f'{journal}: {e}'))
+                continue
+            self.stdout.write(f'Warmed {journal}')
+
+        self.stdout.write(self.style.SUCCESS('Journal PDF cache is up to date'))
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.11 on 2026-10-17 11:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('journal', '0004_journalarticle'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='journal',
+            name='pdf_hash',
+            field=models.CharField(blank=True, editable=False, help_text='SHA-256 of pdf_file, keys the pre-split PDF cache', max_length=64),
+        ),
+    ]
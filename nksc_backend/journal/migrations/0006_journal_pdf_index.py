@@ -0,0 +1,43 @@
+# Generated by Django 4.2.11 on 2026-10-17 11:19
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('journal', '0005_journal_pdf_hash'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='journal',
+            name='file_size_mb',
+            field=models.DecimalField(blank=True, decimal_places=2, default=0, help_text='Filled from the PDF after upload', max_digits=5),
+        ),
+        migrations.AlterField(
+            model_name='journal',
+            name='pages',
+            field=models.PositiveIntegerField(blank=True, default=0, help_text='Filled from the PDF after upload'),
+        ),
+        migrations.CreateModel(
+            name='JournalPdfIndex',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('pdf_hash', models.CharField(blank=True, help_text='Hash of the file this index was built from', max_length=64)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('ready', 'Ready'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('page_count', models.PositiveIntegerField(default=0)),
+                ('file_size_bytes', models.PositiveBigIntegerField(default=0)),
+                ('page_offsets', models.JSONField(blank=True, default=list, help_text='Per page: object number and byte offset of the page object in the file')),
+                ('outline', models.JSONField(blank=True, default=list, help_text='Bookmarks as nested {title, page, children}')),
+                ('error', models.TextField(blank=True)),
+                ('indexed_at', models.DateTimeField(blank=True, null=True)),
+                ('journal', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='pdf_index', to='journal.journal')),
+            ],
+            options={
+                'verbose_name': 'Journal PDF Index',
+                'verbose_name_plural': 'Journal PDF Indexes',
+            },
+        ),
+    ]
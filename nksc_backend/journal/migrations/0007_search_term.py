@@ -0,0 +1,98 @@
+# Generated by Django 4.2.11 on 2026-10-17 11:24
+
+import math
+import re
+import unicodedata
+from collections import defaultdict
+
+from django.db import migrations, models
+
+# A frozen copy of the tokenizer in journal/search.py as it was when this
+# migration was written, so later changes to that module can't break it.
+# Rebuild with the current tokenizer using ``manage.py rebuild_search_index``.
+TOKEN_RE = re.compile(r'[\w\u0980-\u09FF]+')
+JOINERS_RE = re.compile('[\u200c\u200d]')
+BENGALI_DIGITS = str.maketrans('০১২৩৪৫৬৭৮৯', '0123456789')
+MAX_TERM_LENGTH = 64
+BULK_SIZE = 1000
+
+JOURNAL_FIELDS = {
+    'title': 3.0, 'issn': 2.0, 'editor': 2.0, 'volume': 1.5, 'issue': 1.5, 'description': 1.0,
+}
+ARTICLE_FIELDS = {
+    'title': 3.0, 'title_bn': 3.0, 'keywords': 2.5, 'authors': 2.0, 'abstract': 1.0, 'abstract_bn': 1.0,
+}
+
+
+def normalize(text):
+    text = unicodedata.normalize('NFC', text or '')
+    return JOINERS_RE.sub('', text).casefold().translate(BENGALI_DIGITS)
+
+
+STOPWORDS = frozenset(normalize(word) for word in (
+    'a an and are as at be by for from has in is it its of on or that the to was were with '
+    'এবং ও এ এই যে সে করে হয় থেকে জন্য করা তার একটি না'
+).split())
+
+
+def tokenize(text):
+    tokens = []
+    for token in TOKEN_RE.findall(normalize(text)):
+        if token in STOPWORDS or (len(token) < 2 and not token.isdigit()):
+            continue
+        tokens.append(token[:MAX_TERM_LENGTH])
+    return tokens
+
+
+def document_terms(obj, field_weights):
+    weights = defaultdict(float)
+    for field, field_weight in field_weights.items():
+        counts = defaultdict(int)
+        for token in tokenize(str(getattr(obj, field, '') or '')):
+            counts[token] += 1
+        for token, count in counts.items():
+            weights[token] += field_weight * (1 + math.log(count))
+    return weights
+
+
+def build_search_index(apps, schema_editor):
+    SearchTerm = apps.get_model('journal', 'SearchTerm')
+    batch = []
+    for object_type, model_name, field_weights in (
+        ('journal', 'Journal', JOURNAL_FIELDS),
+        ('article', 'JournalArticle', ARTICLE_FIELDS),
+    ):
+        model = apps.get_model('journal', model_name)
+        for obj in model.objects.only('pk', *field_weights).iterator():
+            batch.extend(
+                SearchTerm(term=term, object_type=object_type, object_id=obj.pk, weight=round(weight, 4))
+                for term, weight in document_terms(obj, field_weights).items()
+            )
+            if len(batch) >= BULK_SIZE:
+                SearchTerm.objects.bulk_create(batch, batch_size=BULK_SIZE)
+                batch = []
+    SearchTerm.objects.bulk_create(batch, batch_size=BULK_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('journal', '0006_journal_pdf_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64)),
+                ('object_type', models.CharField(choices=[('journal', 'Journal'), ('article', 'Journal Article')], max_length=10)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('weight', models.FloatField(help_text='Field-weighted term frequency in this record')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['term', 'object_type'], name='journal_sea_term_3b84cb_idx'), models.Index(fields=['object_type', 'object_id'], name='journal_sea_object__7aef89_idx')],
+            },
+        ),
+        migrations.RunPython(build_search_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 4.2.11 on 2026-10-17 11:26
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('journal', '0007_search_term'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Author',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('normalized_name', models.CharField(editable=False, max_length=255, unique=True)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Keyword',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('normalized_name', models.CharField(editable=False, max_length=255, unique=True)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArticleKeyword',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveSmallIntegerField(default=1)),
+                ('article', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='article_keywords', to='journal.journalarticle')),
+                ('keyword', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='article_links', to='journal.keyword')),
+            ],
+            options={
+                'ordering': ['position'],
+                'unique_together': {('article', 'keyword')},
+            },
+        ),
+        migrations.CreateModel(
+            name='ArticleAuthor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveSmallIntegerField(default=1)),
+                ('article', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='article_authors', to='journal.journalarticle')),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='article_links', to='journal.author')),
+            ],
+            options={
+                'ordering': ['position'],
+                'unique_together': {('article', 'author')},
+            },
+        ),
+        migrations.AddField(
+            model_name='journalarticle',
+            name='normalized_authors',
+            field=models.ManyToManyField(blank=True, related_name='articles', through='journal.ArticleAuthor', to='journal.author'),
+        ),
+        migrations.AddField(
+            model_name='journalarticle',
+            name='normalized_keywords',
+            field=models.ManyToManyField(blank=True, related_name='articles', through='journal.ArticleKeyword', to='journal.keyword'),
+        ),
+    ]
@@ -0,0 +1,62 @@
+from django.db import migrations
+
+
+def _names(text):
+    """Split a comma-separated field, keeping the first spelling of each name."""
+    names = {}
+    for name in (text or '').split(','):
+        name = ' '.join(name.split())[:255]
+        if name:
+            names.setdefault(name.casefold(), name)
+    return names
+
+
+def backfill(apps, schema_editor):
+    JournalArticle = apps.get_model('journal', 'JournalArticle')
+    Author = apps.get_model('journal', 'Author')
+    Keyword = apps.get_model('journal', 'Keyword')
+    ArticleAuthor = apps.get_model('journal', 'ArticleAuthor')
+    ArticleKeyword = apps.get_model('journal', 'ArticleKeyword')
+
+    articles = list(JournalArticle.objects.values_list('id', 'authors', 'keywords'))
+    ids = {}
+    for model, column in ((Author, 1), (Keyword, 2)):
+        names = {}
+        for article in articles:
+            for key, name in _names(article[column]).items():
+                names.setdefault(key, name)
+        # get_or_create rather than bulk_create: the unique index compares with the
+        # column's collation, which on MySQL also ignores accents, so names that differ
+        # in Python may still be the same row
+        ids[model] = {
+            key: model.objects.get_or_create(normalized_name=key, defaults={'name': name})[0].pk
+            for key, name in names.items()
+        }
+
+    author_links, keyword_links = [], []
+    for article_id, author_text, keyword_text in articles:
+        for links, link_model, model, field, text in (
+            (author_links, ArticleAuthor, Author, 'author_id', author_text),
+            (keyword_links, ArticleKeyword, Keyword, 'keyword_id', keyword_text),
+        ):
+            targets = list(dict.fromkeys(ids[model][key] for key in _names(text)))
+            for position, target_id in enumerate(targets, start=1):
+                links.append(link_model(article_id=article_id, position=position, **{field: target_id}))
+    ArticleAuthor.objects.bulk_create(author_links, batch_size=500)
+    ArticleKeyword.objects.bulk_create(keyword_links, batch_size=500)
+
+
+def clear(apps, schema_editor):
+    apps.get_model('journal', 'Author').objects.all().delete()
+    apps.get_model('journal', 'Keyword').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('journal', '0008_authors_keywords'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, clear),
+    ]
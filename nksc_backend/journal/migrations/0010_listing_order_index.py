@@ -0,0 +1,17 @@
+# Generated by Django 4.2.11 on 2026-10-17 11:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('journal', '0009_backfill_authors_keywords'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='journal',
+            index=models.Index(fields=['is_published', 'year', 'created_at'], name='journal_jou_is_publ_abcfe6_idx'),
+        ),
+    ]
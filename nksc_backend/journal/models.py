@@ -1,7 +1,16 @@
+from django.core.exceptions import ValidationError
 from django.db import models
 
+from utils.models import LoadedValuesMixin
 
-class Journal(models.Model):
+
+class JournalQuerySet(models.QuerySet):
+    def with_counts(self):
+        """Annotate ``article_count`` in the same query instead of one COUNT per journal."""
+        return self.annotate(article_count=models.Count('articles'))
+
+
+class Journal(LoadedValuesMixin, models.Model):
     title = models.CharField(max_length=255)
     volume = models.CharField(max_length=50)
     year = models.PositiveIntegerField()
@@ -11,23 +20,79 @@ class Journal(models.Model):
     doi_url = models.URLField(blank=True)
 
     description = models.TextField()
-    pages = models.PositiveIntegerField()
-    file_size_mb = models.DecimalField(max_digits=5, decimal_places=2)
+    pages = models.PositiveIntegerField(default=0, blank=True, help_text="Filled from the PDF after upload")
+    file_size_mb = models.DecimalField(max_digits=5, decimal_places=2, default=0, blank=True,
+                                       help_text="Filled from the PDF after upload")
 
     pdf_file = models.FileField(upload_to="journals/")
+    pdf_hash = models.CharField(max_length=64, blank=True, editable=False,
+                                help_text="SHA-256 of pdf_file, keys the pre-split PDF cache")
     preview_image = models.ImageField(upload_to="journal_previews/", blank=True, null=True)
 
     is_published = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = JournalQuerySet.as_manager()
+
+    TRACKED_FIELDS = ('pdf_file', 'pdf_hash', 'pages')
+
     class Meta:
         ordering = ['-year', '-created_at']
+        indexes = [
+            # Keyset pagination walks this index (see utils/pagination.py)
+            models.Index(fields=['is_published', 'year', 'created_at']),
+        ]
 
     def __str__(self):
         return f"{self.title} - Vol. {self.volume} ({self.year})"
 
 
-class JournalArticle(models.Model):
+class JournalPdfIndex(models.Model):
+    """Page index of a journal PDF, parsed once in the background after upload"""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('processing', 'Processing'),
+        ('ready', 'Ready'),
+        ('failed', 'Failed'),
+    ]
+
+    journal = models.OneToOneField(Journal, on_delete=models.CASCADE, related_name='pdf_index')
+    pdf_hash = models.CharField(max_length=64, blank=True, help_text="Hash of the file this index was built from")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+
+    page_count = models.PositiveIntegerField(default=0)
+    file_size_bytes = models.PositiveBigIntegerField(default=0)
+    page_offsets = models.JSONField(
+        default=list, blank=True,
+        help_text="Per page: object number and byte offset of the page object in the file"
+    )
+    outline = models.JSONField(default=list, blank=True, help_text="Bookmarks as nested {title, page, children}")
+
+    error = models.TextField(blank=True)
+    indexed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Journal PDF Index"
+        verbose_name_plural = "Journal PDF Indexes"
+
+    def __str__(self):
+        return f"PDF index for {self.journal} ({self.status})"
+
+    @property
+    def is_ready(self):
+        return self.status == 'ready'
+
+
+class JournalArticleQuerySet(models.QuerySet):
+    def with_names(self):
+        """Prefetch the normalized authors and keywords the serializers read (one query each)."""
+        return self.prefetch_related(
+            models.Prefetch('article_authors', queryset=ArticleAuthor.objects.select_related('author')),
+            models.Prefetch('article_keywords', queryset=ArticleKeyword.objects.select_related('keyword')),
+        )
+
+
+class JournalArticle(LoadedValuesMixin, models.Model):
     LANGUAGE_CHOICES = [
         ('en', 'English'),
         ('bn', 'Bengali'),
@@ -74,15 +139,35 @@ class JournalArticle(models.Model):
     # Language
     language = models.CharField(max_length=10, choices=LANGUAGE_CHOICES, default='en')
 
+    # Normalized copies of authors/keywords, kept in sync on save (see sync_authors_and_keywords)
+    normalized_authors = models.ManyToManyField(
+        'Author', through='ArticleAuthor', related_name='articles', blank=True
+    )
+    normalized_keywords = models.ManyToManyField(
+        'Keyword', through='ArticleKeyword', related_name='articles', blank=True
+    )
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = JournalArticleQuerySet.as_manager()
+
+    TRACKED_FIELDS = ('journal_id', 'start_page', 'order_in_journal', 'authors', 'keywords')
+
     class Meta:
         ordering = ['order_in_journal']
 
     def __str__(self):
         return f"[{self.journal.volume}/{self.journal.year}] {self.title[:60]}"
 
+    def clean(self):
+        from .pdf_index import validate_start_page
+
+        if self.journal_id and self.start_page:
+            error = validate_start_page(self.journal, self.start_page)
+            if error:
+                raise ValidationError({'start_page': error})
+
     def get_authors_list(self):
         """Return authors as a Python list"""
         if not self.authors:
@@ -93,4 +178,124 @@ class JournalArticle(models.Model):
         """Return keywords as a Python list"""
         if not self.keywords:
             return []
-        return [k.strip() for k in self.keywords.split(',') if k.strip()]
\ No newline at end of file
+        return [k.strip() for k in self.keywords.split(',') if k.strip()]
+
+    def sync_authors_and_keywords(self):
+        """Mirror the comma-separated ``authors`` and ``keywords`` into the normalized tables."""
+        _sync_links(self, ArticleAuthor, Author, 'author', self.get_authors_list())
+        _sync_links(self, ArticleKeyword, Keyword, 'keyword', self.get_keywords_list())
+
+
+def normalize_name(name):
+    """Lookup key for author/keyword names: whitespace collapsed, case folded."""
+    return ' '.join(name.split()).casefold()
+
+
+def _sync_links(article, link_model, target_model, target_field, names):
+    wanted = {}
+    for name in names:
+        name = ' '.join(name.split())[:255]
+        wanted.setdefault(normalize_name(name), name)
+
+    existing = {
+        link.pop(f'{target_field}__normalized_name'): link
+        for link in link_model.objects.filter(article=article).values(
+            'id', 'position', f'{target_field}__normalized_name'
+        )
+    }
+    targets = {
+        target.normalized_name: target
+        for target in target_model.objects.filter(normalized_name__in=wanted)
+    }
+    for key, name in wanted.items():
+        if key not in targets:
+            targets[key], _ = target_model.objects.get_or_create(normalized_name=key, defaults={'name': name})
+
+    link_model.objects.filter(article=article).exclude(
+        **{f'{target_field}__normalized_name__in': list(wanted)}
+    ).delete()
+    for position, key in enumerate(wanted, start=1):
+        link = existing.get(key)
+        if link is None:
+            link_model.objects.create(article=article, position=position, **{target_field: targets[key]})
+        elif link['position'] != position:
+            link_model.objects.filter(pk=link['id']).update(position=position)
+
+
+class Author(models.Model):
+    name = models.CharField(max_length=255)
+    normalized_name = models.CharField(max_length=255, unique=True, editable=False)
+
+    class Meta:
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+    def save(self, *args, **kwargs):
+        self.normalized_name = normalize_name(self.name)
+        super().save(*args, **kwargs)
+
+
+class Keyword(models.Model):
+    name = models.CharField(max_length=255)
+    normalized_name = models.CharField(max_length=255, unique=True, editable=False)
+
+    class Meta:
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+    def save(self, *args, **kwargs):
+        self.normalized_name = normalize_name(self.name)
+        super().save(*args, **kwargs)
+
+
+class ArticleAuthor(models.Model):
+    """Author of an article, in byline order"""
+    article = models.ForeignKey(JournalArticle, on_delete=models.CASCADE, related_name='article_authors')
+    author = models.ForeignKey(Author, on_delete=models.CASCADE, related_name='article_links')
+    position = models.PositiveSmallIntegerField(default=1)
+
+    class Meta:
+        ordering = ['position']
+        unique_together = [('article', 'author')]
+
+    def __str__(self):
+        return f"{self.author} ({self.position})"
+
+
+class ArticleKeyword(models.Model):
+    article = models.ForeignKey(JournalArticle, on_delete=models.CASCADE, related_name='article_keywords')
+    keyword = models.ForeignKey(Keyword, on_delete=models.CASCADE, related_name='article_links')
+    position = models.PositiveSmallIntegerField(default=1)
+
+    class Meta:
+        ordering = ['position']
+        unique_together = [('article', 'keyword')]
+
+    def __str__(self):
+        return str(self.keyword)
+
+
+class SearchTerm(models.Model):
+    """One posting of the journal search index: a token, the record it occurs in and its weight"""
+    OBJECT_TYPES = [
+        ('journal', 'Journal'),
+        ('article', 'Journal Article'),
+    ]
+
+    term = models.CharField(max_length=64)
+    object_type = models.CharField(max_length=10, choices=OBJECT_TYPES)
+    object_id = models.PositiveBigIntegerField()
+    weight = models.FloatField(help_text="Field-weighted term frequency in this record")
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['term', 'object_type']),
+            models.Index(fields=['object_type', 'object_id']),
+        ]
+
+    def __str__(self):
+        return f"{self.term} → {self.object_type} #{self.object_id}"
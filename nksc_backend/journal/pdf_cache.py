@@ -0,0 +1,208 @@
+"""
+On-disk cache of pre-split journal PDFs.
+
+Every article (and the prelims) of a journal issue is written once as its own
+PDF under ``JOURNAL_PDF_CACHE_DIR/<journal pdf sha256>/<start>-<end>.pdf``.
+Because the key contains both the file hash and the page range, replacing the
+journal PDF or moving an article's start page simply produces new keys; stale
+files are pruned the next time the journal cache is warmed.
+"""
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def cache_root():
+    return settings.JOURNAL_PDF_CACHE_DIR
+
+
+def compute_pdf_hash(journal):
+    """Return the sha256 hex digest of the journal PDF (streamed, not loaded in memory)."""
+    digest = hashlib.sha256()
+    with open(journal.pdf_file.path, 'rb') as fh:
+        for chunk in iter(lambda: fh.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def ensure_pdf_hash(journal):
+    """Make sure ``journal.pdf_hash`` is populated, storing it without touching other columns."""
+    if not journal.pdf_hash:
+        journal.pdf_hash = compute_pdf_hash(journal)
+        type(journal).objects.filter(pk=journal.pk).update(pdf_hash=journal.pdf_hash)
+    return journal.pdf_hash
+
+
+def cached_pdf_path(pdf_hash, start_page, end_page):
+    return os.path.join(cache_root(), pdf_hash, f"{start_page}-{end_page}.pdf")
+
+
+# ─────────────────────────────────────────────────────────────
+# PAGE RANGES
+# ─────────────────────────────────────────────────────────────
+
+def journal_page_count(journal):
+    """
+    ``journal.pages``, else the page count of a finished PDF index, else None:
+    the upload has not been indexed yet (see ``pdf_index``).
+    """
+    if journal.pages:
+        return journal.pages
+    from .models import JournalPdfIndex
+
+    return JournalPdfIndex.objects.filter(
+        journal=journal, status='ready'
+    ).values_list('page_count', flat=True).first() or None
+
+
+def prelims_page_range(journal, articles=None):
+    """Pages before the first article, or None when there is nothing to split off."""
+    if articles is None:
+        articles = list(journal.articles.order_by('order_in_journal'))
+    first_article = articles[0] if articles else None
+    if first_article and first_article.start_page and first_article.start_page > 1:
+        return 1, first_article.start_page - 1
+    return None
+
+
+def article_page_range(article, articles=None):
+    """
+    Pages of a single article: from its start page up to the page before the next
+    article, or to the end of the journal. Returns None when the article has no
+    start page, and ``(start_page, None)`` when it is the last article and the
+    journal's page count is not known yet.
+    """
+    if not article.start_page:
+        return None
+
+    if articles is None:
+        next_article = article.journal.articles.filter(
+            order_in_journal__gt=article.order_in_journal
+        ).order_by('order_in_journal').first()
+    else:
+        next_article = next(
+            (a for a in articles if a.order_in_journal > article.order_in_journal),
+            None
+        )
+
+    if next_article and next_article.start_page:
+        end_page = next_article.start_page - 1
+    else:
+        end_page = journal_page_count(article.journal)  # Use the total pages of the journal
+        if end_page is None:
+            return article.start_page, None
+
+    return article.start_page, max(article.start_page, end_page)
+
+
+def journal_page_ranges(journal):
+    """All page ranges (prelims + articles) the cache should hold for a journal."""
+    articles = list(journal.articles.order_by('order_in_journal'))
+    ranges = set()
+
+    prelims = prelims_page_range(journal, articles)
+    if prelims:
+        ranges.add(prelims)
+
+    for article in articles:
+        article.journal = journal
+        page_range = article_page_range(article, articles)
+        if page_range and page_range[1] is not None:
+            ranges.add(page_range)
+
+    return ranges
+
+
+# ─────────────────────────────────────────────────────────────
+# BUILD / LOOKUP
+# ─────────────────────────────────────────────────────────────
+
+def _write_page_range(reader, start_page, end_page, destination):
+    from pypdf import PdfWriter
+
+    writer = PdfWriter()
+    start_idx = max(0, start_page - 1)
+    end_idx = min(len(reader.pages) - 1, end_page - 1)
+    for i in range(start_idx, end_idx + 1):
+        writer.add_page(reader.pages[i])
+
+    # Write next to the destination and rename, so readers never see a partial file
+    directory = os.path.dirname(destination)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.part')
+    try:
+        with os.fdopen(fd, 'wb') as fh:
+            writer.write(fh)
+        os.replace(tmp_path, destination)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def get_cached_pdf(journal, start_page, end_page):
+    """Return the path of the cached PDF for a page range, building it on a cache miss."""
+    pdf_hash = ensure_pdf_hash(journal)
+    path = cached_pdf_path(pdf_hash, start_page, end_page)
+    if not os.path.exists(path):
+        from pypdf import PdfReader
+
+        _write_page_range(PdfReader(journal.pdf_file.path), start_page, end_page, path)
+    return path
+
+
+def warm_journal_cache(journal, reader=None):
+    """
+    Build every missing page range of a journal and drop ranges that no longer exist.
+    Pass an already parsed ``reader`` to avoid opening the file a second time.
+    """
+    if not journal.pdf_file:
+        return
+
+    pdf_hash = ensure_pdf_hash(journal)
+    ranges = journal_page_ranges(journal)
+
+    # The same file may back several journal records; keep every range any of them needs
+    wanted = set()
+    for other in type(journal).objects.filter(pdf_hash=pdf_hash).exclude(pk=journal.pk):
+        ranges_of_other = journal_page_ranges(other)
+        wanted.update(os.path.basename(cached_pdf_path(pdf_hash, *r)) for r in ranges_of_other)
+    wanted.update(os.path.basename(cached_pdf_path(pdf_hash, *r)) for r in ranges)
+    directory = os.path.join(cache_root(), pdf_hash)
+
+    missing = [r for r in ranges if not os.path.exists(cached_pdf_path(pdf_hash, *r))]
+    if missing:
+        if reader is None:
+            from pypdf import PdfReader
+
+            reader = PdfReader(journal.pdf_file.path)
+        for start_page, end_page in sorted(missing):
+            _write_page_range(reader, start_page, end_page, cached_pdf_path(pdf_hash, start_page, end_page))
+
+    if os.path.isdir(directory):
+        for name in os.listdir(directory):
+            if name.endswith('.pdf') and name not in wanted:
+                os.remove(os.path.join(directory, name))
+
+
+def purge_pdf_hash(pdf_hash):
+    """Remove every cached range of one journal file."""
+    if not pdf_hash:
+        return
+    shutil.rmtree(os.path.join(cache_root(), pdf_hash), ignore_errors=True)
+
+
+def refresh_journal_cache(journal):
+    """Warm the cache, logging instead of raising so a broken PDF never blocks a save."""
+    try:
+        warm_journal_cache(journal)
+    except Exception:
+        logger.exception("Could not warm PDF cache for journal %s", journal.pk)
@@ -0,0 +1,134 @@
+"""
+One-time parse of an uploaded journal PDF.
+
+``index_journal`` runs in the background after a journal PDF is uploaded or
+replaced. It records the true page count, byte size, the byte offset of every
+page object and the outline (bookmarks) in ``JournalPdfIndex``, copies the page
+count and size onto the journal, and warms the pre-split PDF cache from the
+same parsed reader. Until it has run, the page count of a new upload is
+unknown; nothing on the request path parses the file to find it.
+"""
+import logging
+import os
+from decimal import Decimal
+
+from django.utils import timezone
+
+from utils import cache
+
+from . import pdf_cache
+from .models import Journal, JournalPdfIndex
+
+logger = logging.getLogger(__name__)
+
+MAX_OUTLINE_DEPTH = 4
+MAX_FILE_SIZE_MB = Decimal('999.99')  # Journal.file_size_mb is max_digits=5, decimal_places=2
+# Shown by the public index endpoint; the exception itself goes to the log
+FAILED_MESSAGE = "The PDF could not be read. Please upload the file again."
+
+
+def _page_offsets(reader):
+    offsets = []
+    for number, page in enumerate(reader.pages, start=1):
+        ref = page.indirect_reference
+        if ref is None:
+            offsets.append({'page': number, 'object': None, 'offset': None})
+            continue
+        # Objects stored inside a compressed object stream have no direct byte offset
+        offset = reader.xref.get(ref.generation, {}).get(ref.idnum)
+        offsets.append({'page': number, 'object': ref.idnum, 'offset': offset})
+    return offsets
+
+
+def _outline_tree(reader, items, depth=0):
+    """pypdf returns bookmarks as a flat list where a nested list holds the previous item's children."""
+    nodes = []
+    for item in items:
+        if isinstance(item, list):
+            if nodes and depth < MAX_OUTLINE_DEPTH:
+                nodes[-1]['children'] = _outline_tree(reader, item, depth + 1)
+            continue
+
+        try:
+            page_number = reader.get_destination_page_number(item)
+        except Exception:
+            page_number = -1
+        nodes.append({
+            'title': str(getattr(item, 'title', '') or ''),
+            'page': page_number + 1 if page_number >= 0 else None,
+            'children': [],
+        })
+    return nodes
+
+
+def extract_pdf_index(reader):
+    try:
+        outline = _outline_tree(reader, reader.outline)
+    except Exception:
+        logger.warning("Could not read PDF outline", exc_info=True)
+        outline = []
+
+    return {
+        'page_count': len(reader.pages),
+        'page_offsets': _page_offsets(reader),
+        'outline': outline,
+    }
+
+
+def index_journal(journal_id):
+    """Parse a journal PDF once and store its index. Returns the JournalPdfIndex (or None)."""
+    journal = Journal.objects.filter(pk=journal_id).first()
+    if not journal or not journal.pdf_file:
+        return None
+
+    index, _ = JournalPdfIndex.objects.get_or_create(journal=journal)
+    index.status = 'processing'
+    index.error = ''
+    index.save(update_fields=['status', 'error'])
+
+    try:
+        from pypdf import PdfReader
+
+        path = journal.pdf_file.path
+        reader = PdfReader(path)
+        data = extract_pdf_index(reader)
+
+        index.pdf_hash = pdf_cache.ensure_pdf_hash(journal)
+        index.page_count = data['page_count']
+        index.page_offsets = data['page_offsets']
+        index.outline = data['outline']
+        index.file_size_bytes = os.path.getsize(path)
+        index.status = 'ready'
+        index.indexed_at = timezone.now()
+        index.save()
+    except Exception:
+        logger.exception("Could not index PDF for journal %s", journal_id)
+        index.status = 'failed'
+        index.error = FAILED_MESSAGE
+        index.save(update_fields=['status', 'error'])
+        return index
+
+    # Keep the journal's own numbers in line with the file
+    size_mb = (Decimal(index.file_size_bytes) / (1024 * 1024)).quantize(Decimal('0.01'))
+    journal.pages = index.page_count
+    journal.file_size_mb = min(size_mb, MAX_FILE_SIZE_MB)
+    Journal.objects.filter(pk=journal.pk).update(pages=journal.pages, file_size_mb=journal.file_size_mb)
+    cache.invalidate('journal')  # update() skips the model signals
+
+    try:
+        pdf_cache.warm_journal_cache(journal, reader=reader)
+    except Exception:
+        logger.exception("Could not warm PDF cache for journal %s", journal_id)
+
+    return index
+
+
+def validate_start_page(journal, start_page):
+    """Return an error message if ``start_page`` lies outside the indexed PDF, else None."""
+    index = JournalPdfIndex.objects.filter(journal=journal, status='ready').only('page_count').first()
+    if index and start_page > index.page_count:
+        return (
+            f"Start page {start_page} is beyond the end of the journal PDF "
+            f"({index.page_count} pages)."
+        )
+    return None
@@ -0,0 +1,248 @@
+"""
+Local full-text search over journals and their articles.
+
+Every journal and article is broken into tokens when it is saved and stored as
+postings in ``SearchTerm`` (token, record, weight). A query is answered from
+those postings alone: an indexed equality lookup per query token, plus a prefix
+lookup for the last token so results appear while the user is still typing.
+
+Tokenization is Unicode- and Bengali-aware: text is NFC-normalized, zero-width
+joiners are dropped, Bengali digits are folded to ASCII and words are cut on
+anything that is neither a word character nor in the Bengali block, so vowel
+signs and the virama stay inside their word.
+
+Ranking is tf-idf: each posting carries a field-weighted, sublinear term
+frequency (a hit in a title counts more than one in an abstract), multiplied by
+the token's inverse document frequency and by the share of query tokens the
+record matched. Postings are reduced to the best weight per record and query
+token in the database, and at most ``MAX_MATCHES`` of those (the heaviest)
+are ranked.
+"""
+import math
+import re
+import unicodedata
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Case, Count, F, FloatField, Max, Q, Value, When
+
+TOKEN_RE = re.compile(r'[\w\u0980-\u09FF]+')
+JOINERS_RE = re.compile('[\u200c\u200d]')
+BENGALI_DIGITS = str.maketrans('০১২৩৪৫৬৭৮৯', '0123456789')
+
+MAX_TERM_LENGTH = 64
+MIN_PREFIX_LENGTH = 3
+PREFIX_MATCH_FACTOR = 0.6
+MAX_MATCHES = 2000
+BULK_SIZE = 1000
+
+JOURNAL_FIELDS = {
+    'title': 3.0,
+    'issn': 2.0,
+    'editor': 2.0,
+    'volume': 1.5,
+    'issue': 1.5,
+    'description': 1.0,
+}
+ARTICLE_FIELDS = {
+    'title': 3.0,
+    'title_bn': 3.0,
+    'keywords': 2.5,
+    'authors': 2.0,
+    'abstract': 1.0,
+    'abstract_bn': 1.0,
+}
+
+
+def normalize(text):
+    text = unicodedata.normalize('NFC', text or '')
+    return JOINERS_RE.sub('', text).casefold().translate(BENGALI_DIGITS)
+
+
+STOPWORDS = frozenset(normalize(word) for word in (
+    'a an and are as at be by for from has in is it its of on or that the to was were with '
+    'এবং ও এ এই যে সে করে হয় থেকে জন্য করা তার একটি না'
+).split())
+
+
+def tokenize(text):
+    """Split text into normalized search tokens (stopwords and single letters dropped)."""
+    tokens = []
+    for token in TOKEN_RE.findall(normalize(text)):
+        if token in STOPWORDS or (len(token) < 2 and not token.isdigit()):
+            continue
+        tokens.append(token[:MAX_TERM_LENGTH])
+    return tokens
+
+
+def document_terms(obj, field_weights):
+    """Weighted terms of one record: per field, the field weight times 1 + log(tf)."""
+    weights = defaultdict(float)
+    for field, field_weight in field_weights.items():
+        counts = defaultdict(int)
+        for token in tokenize(str(getattr(obj, field, '') or '')):
+            counts[token] += 1
+        for token, count in counts.items():
+            weights[token] += field_weight * (1 + math.log(count))
+    return weights
+
+
+def _postings(object_type, obj, term_model):
+    field_weights = JOURNAL_FIELDS if object_type == 'journal' else ARTICLE_FIELDS
+    return [
+        term_model(term=term, object_type=object_type, object_id=obj.pk, weight=round(weight, 4))
+        for term, weight in document_terms(obj, field_weights).items()
+    ]
+
+
+# ─────────────────────────────────────────────────────────────
+# INDEXING
+# ─────────────────────────────────────────────────────────────
+
+def update(object_type, obj):
+    """Replace the postings of one journal or article."""
+    from .models import SearchTerm
+
+    with transaction.atomic():
+        SearchTerm.objects.filter(object_type=object_type, object_id=obj.pk).delete()
+        SearchTerm.objects.bulk_create(_postings(object_type, obj, SearchTerm), batch_size=BULK_SIZE)
+
+
+def remove(object_type, object_id):
+    from .models import SearchTerm
+
+    SearchTerm.objects.filter(object_type=object_type, object_id=object_id).delete()
+
+
+def rebuild():
+    """Rebuild the whole index. Returns the number of (journals, articles) indexed."""
+    from .models import Journal, JournalArticle, SearchTerm
+
+    counts = {'journal': 0, 'article': 0}
+    with transaction.atomic():
+        SearchTerm.objects.all().delete()
+        batch = []
+        for object_type, model, field_weights in (
+            ('journal', Journal, JOURNAL_FIELDS),
+            ('article', JournalArticle, ARTICLE_FIELDS),
+        ):
+            for obj in model.objects.only('pk', *field_weights).iterator():
+                batch.extend(_postings(object_type, obj, SearchTerm))
+                counts[object_type] += 1
+                if len(batch) >= BULK_SIZE:
+                    SearchTerm.objects.bulk_create(batch, batch_size=BULK_SIZE)
+                    batch = []
+        SearchTerm.objects.bulk_create(batch, batch_size=BULK_SIZE)
+    return counts['journal'], counts['article']
+
+
+# ─────────────────────────────────────────────────────────────
+# QUERYING
+# ─────────────────────────────────────────────────────────────
+
+def _query_tokens(query):
+    return list(dict.fromkeys(tokenize(query)))
+
+
+def _matching_postings(tokens, object_types):
+    """
+    Postings of ``object_types`` that match the query, annotated with the query
+    ``token`` they match and their ``match_weight`` (a prefix hit on the last
+    token counts ``PREFIX_MATCH_FACTOR`` of its weight).
+    """
+    from .models import SearchTerm
+
+    last = tokens[-1]
+    exact = Q(term__in=tokens)
+    condition = exact
+    if len(last) >= MIN_PREFIX_LENGTH:
+        condition |= Q(term__startswith=last)
+
+    # Compared on the database, so a term that is collation-equal to a query token counts as that token
+    return SearchTerm.objects.filter(condition, object_type__in=object_types).annotate(
+        token=Case(*(When(term=token, then=Value(token)) for token in tokens), default=Value(last)),
+        match_weight=Case(
+            When(exact, then=F('weight')),
+            default=F('weight') * PREFIX_MATCH_FACTOR,
+            output_field=FloatField(),
+        ),
+    )
+
+
+def _matches(postings, limit=None):
+    """
+    Per record, the best weight found for each query token:
+    ``{(object_type, object_id): {token: weight}}``. With ``limit`` only the
+    heaviest (record, token) pairs are kept.
+    """
+    rows = postings.values('object_type', 'object_id', 'token').annotate(
+        best=Max('match_weight')
+    ).order_by('-best', 'object_type', 'object_id')
+    if limit:
+        rows = rows[:limit]
+
+    matches = defaultdict(dict)
+    for row in rows:
+        matches[(row['object_type'], row['object_id'])][row['token']] = row['best']
+    return matches
+
+
+def _document_frequency(postings):
+    """Number of records of each type that match each query token: ``{(object_type, token): count}``."""
+    rows = postings.values('object_type', 'token').annotate(
+        documents=Count('object_id', distinct=True)
+    ).order_by()
+    return {(row['object_type'], row['token']): row['documents'] for row in rows}
+
+
+def _document_counts(object_types):
+    from .models import Journal, JournalArticle
+
+    models_by_type = {'journal': Journal, 'article': JournalArticle}
+    return {object_type: models_by_type[object_type].objects.count() for object_type in object_types}
+
+
+def search(query, object_types=('journal', 'article')):
+    """
+    Rank journals and/or articles for a free-text query.
+    Returns ``[(object_type, object_id, score), ...]``, best match first.
+    """
+    tokens = _query_tokens(query)
+    if not tokens:
+        return []
+
+    postings = _matching_postings(tokens, object_types)
+    matches = _matches(postings, limit=MAX_MATCHES)
+    if not matches:
+        return []
+
+    document_frequency = _document_frequency(postings)
+    total_documents = _document_counts(object_types)
+
+    results = []
+    for (object_type, object_id), found in matches.items():
+        score = sum(
+            weight * math.log(1 + total_documents[object_type] / document_frequency[(object_type, token)])
+            for token, weight in found.items()
+        )
+        score *= len(found) / len(tokens)
+        results.append((object_type, object_id, round(score, 4)))
+
+    results.sort(key=lambda result: (-result[2], result[0], result[1]))
+    return results
+
+
+def matching_ids(query, object_type):
+    """
+    Ids of records of one type that contain every query token (the last one as a prefix).
+    Returns None when the query has no searchable tokens, meaning "don't filter".
+    """
+    tokens = _query_tokens(query)
+    if not tokens:
+        return None
+
+    return set(
+        _matching_postings(tokens, [object_type]).values('object_id').annotate(
+            found=Count('token', distinct=True)
+        ).filter(found=len(tokens)).values_list('object_id', flat=True)
+    )
@@ -1,8 +1,19 @@
 from rest_framework import serializers
-from .models import Journal, JournalArticle
 
+from monitoring.serializers import TimedModelSerializer
+from utils.images import image_url
 
-class JournalArticleSerializer(serializers.ModelSerializer):
+from .models import Author, Journal, JournalArticle, JournalPdfIndex, Keyword
+from .pdf_index import validate_start_page
+
+
+def article_count(journal):
+    """Use the ``with_counts()`` annotation when present, otherwise count the articles."""
+    count = getattr(journal, 'article_count', None)
+    return count if count is not None else journal.articles.count()
+
+
+class JournalArticleSerializer(TimedModelSerializer):
     authors_list = serializers.SerializerMethodField()
     keywords_list = serializers.SerializerMethodField()
 
@@ -16,14 +27,46 @@ class JournalArticleSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['created_at', 'updated_at']
 
+    # Read from the normalized tables; list views prefetch them with JournalArticle.objects.with_names()
     def get_authors_list(self, obj):
-        return obj.get_authors_list()
+        return [link.author.name for link in obj.article_authors.all()]
 
     def get_keywords_list(self, obj):
-        return obj.get_keywords_list()
+        return [link.keyword.name for link in obj.article_keywords.all()]
+
+    def validate(self, attrs):
+        journal = attrs.get('journal', getattr(self.instance, 'journal', None))
+        start_page = attrs.get('start_page', getattr(self.instance, 'start_page', None))
+        if journal and start_page:
+            error = validate_start_page(journal, start_page)
+            if error:
+                raise serializers.ValidationError({'start_page': error})
+        return attrs
+
+
+class AuthorSerializer(TimedModelSerializer):
+    article_count = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Author
+        fields = ['id', 'name', 'article_count']
+
+
+class KeywordSerializer(TimedModelSerializer):
+    article_count = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Keyword
+        fields = ['id', 'name', 'article_count']
+
+
+class JournalPdfIndexSerializer(TimedModelSerializer):
+    class Meta:
+        model = JournalPdfIndex
+        fields = ['status', 'page_count', 'file_size_bytes', 'outline', 'indexed_at', 'error']
 
 
-class JournalSerializer(serializers.ModelSerializer):
+class JournalSerializer(TimedModelSerializer):
     articles = JournalArticleSerializer(many=True, read_only=True)
     article_count = serializers.SerializerMethodField()
 
@@ -36,7 +79,7 @@ class JournalSerializer(serializers.ModelSerializer):
         ]
 
     def get_article_count(self, obj):
-        return obj.articles.count()
+        return article_count(obj)
 
     def to_representation(self, instance):
         data = super().to_representation(instance)
@@ -48,14 +91,14 @@ class JournalSerializer(serializers.ModelSerializer):
             data["pdf_file"] = None
 
         if instance.preview_image and request:
-            data["preview_image"] = request.build_absolute_uri(instance.preview_image.url)
+            data["preview_image"] = image_url(request, instance.preview_image)
         else:
             data["preview_image"] = None
 
         return data
 
 
-class JournalListSerializer(serializers.ModelSerializer):
+class JournalListSerializer(TimedModelSerializer):
     """Lightweight serializer for list views — excludes articles for performance."""
     article_count = serializers.SerializerMethodField()
 
@@ -68,7 +111,7 @@ class JournalListSerializer(serializers.ModelSerializer):
         ]
 
     def get_article_count(self, obj):
-        return obj.articles.count()
+        return article_count(obj)
 
     def to_representation(self, instance):
         data = super().to_representation(instance)
@@ -80,7 +123,7 @@ class JournalListSerializer(serializers.ModelSerializer):
             data["pdf_file"] = None
 
         if instance.preview_image and request:
-            data["preview_image"] = request.build_absolute_uri(instance.preview_image.url)
+            data["preview_image"] = image_url(request, instance.preview_image)
         else:
             data["preview_image"] = None
 
@@ -0,0 +1,141 @@
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from utils import background
+from utils.models import previous_values
+
+from . import pdf_cache, pdf_index, search
+from .models import Journal, JournalArticle, JournalPdfIndex
+
+
+def _purge_if_unused(pdf_hash):
+    if pdf_hash and not Journal.objects.filter(pdf_hash=pdf_hash).exists():
+        pdf_cache.purge_pdf_hash(pdf_hash)
+
+
+def reindex_journal_pdf(journal_id, stale_hash=''):
+    """Background job for a new or replaced PDF: index it (which also warms the cache)."""
+    pdf_index.index_journal(journal_id)
+    _purge_if_unused(stale_hash)
+
+
+def refresh_journal_pdf_cache(journal_id):
+    """Background job after the article layout changed: rebuild the affected page ranges."""
+    journal = Journal.objects.filter(pk=journal_id).first()
+    if journal and journal.pdf_file:
+        pdf_cache.refresh_journal_cache(journal)
+
+
+# ─────────────────────────────────────────────────────────────
+# JOURNAL
+# ─────────────────────────────────────────────────────────────
+
+@receiver(pre_save, sender=Journal)
+def remember_journal_pdf(sender, instance, **kwargs):
+    previous = previous_values(instance)
+
+    if previous is None:
+        instance._pdf_changed = True
+        instance._stale_pdf_hash = ''
+        instance._pages_changed = False
+        return
+
+    instance._pdf_changed = (
+        not instance.pdf_file._committed or previous['pdf_file'] != instance.pdf_file.name
+    )
+    instance._stale_pdf_hash = previous['pdf_hash']
+    instance._pages_changed = previous['pages'] != instance.pages
+
+
+@receiver(post_save, sender=Journal)
+def process_journal_pdf(sender, instance, created, **kwargs):
+    if getattr(instance, '_pdf_changed', created):
+        # New file: forget the old hash and index, then parse it once in the background
+        Journal.objects.filter(pk=instance.pk).update(pdf_hash='')
+        JournalPdfIndex.objects.filter(journal=instance).update(status='pending')
+        background.submit_on_commit(
+            reindex_journal_pdf, instance.pk, stale_hash=getattr(instance, '_stale_pdf_hash', '')
+        )
+    elif getattr(instance, '_pages_changed', False):
+        # The last article runs to the end of the journal
+        background.submit_on_commit(refresh_journal_pdf_cache, instance.pk)
+
+
+@receiver(post_save, sender=Journal)
+def remember_saved_journal(sender, instance, **kwargs):
+    instance.remember_loaded_values()
+
+
+@receiver(post_delete, sender=Journal)
+def purge_journal_pdf_cache(sender, instance, **kwargs):
+    pdf_hash = instance.pdf_hash
+    transaction.on_commit(lambda: _purge_if_unused(pdf_hash))
+
+
+@receiver(post_save, sender=Journal)
+def index_journal_for_search(sender, instance, **kwargs):
+    search.update('journal', instance)
+
+
+@receiver(post_delete, sender=Journal)
+def remove_journal_from_search(sender, instance, **kwargs):
+    search.remove('journal', instance.pk)
+
+
+# ─────────────────────────────────────────────────────────────
+# JOURNAL ARTICLE
+# ─────────────────────────────────────────────────────────────
+
+PAGE_LAYOUT_FIELDS = ('journal_id', 'start_page', 'order_in_journal')
+NORMALIZED_FIELDS = ('authors', 'keywords')
+
+
+@receiver(pre_save, sender=JournalArticle)
+def remember_article_layout(sender, instance, **kwargs):
+    previous = previous_values(instance)
+
+    instance._previous_journal_id = previous['journal_id'] if previous else None
+    instance._layout_changed = previous is None or any(
+        previous[field] != getattr(instance, field) for field in PAGE_LAYOUT_FIELDS
+    )
+    instance._names_changed = previous is None or any(
+        previous[field] != getattr(instance, field) for field in NORMALIZED_FIELDS
+    )
+
+
+@receiver(post_save, sender=JournalArticle)
+def sync_article_authors_and_keywords(sender, instance, **kwargs):
+    if getattr(instance, '_names_changed', True):
+        instance.sync_authors_and_keywords()
+
+
+@receiver(post_save, sender=JournalArticle)
+def refresh_article_pdf_cache(sender, instance, created, **kwargs):
+    if not getattr(instance, '_layout_changed', True):
+        return
+
+    background.submit_on_commit(refresh_journal_pdf_cache, instance.journal_id)
+    previous_journal_id = getattr(instance, '_previous_journal_id', None)
+    if previous_journal_id and previous_journal_id != instance.journal_id:
+        background.submit_on_commit(refresh_journal_pdf_cache, previous_journal_id)
+
+
+@receiver(post_save, sender=JournalArticle)
+def remember_saved_article(sender, instance, **kwargs):
+    instance.remember_loaded_values()
+
+
+@receiver(post_delete, sender=JournalArticle)
+def refresh_pdf_cache_after_article_delete(sender, instance, **kwargs):
+    background.submit_on_commit(refresh_journal_pdf_cache, instance.journal_id)
+
+
+@receiver(post_save, sender=JournalArticle)
+def index_article_for_search(sender, instance, **kwargs):
+    search.update('article', instance)
+
+
+@receiver(post_delete, sender=JournalArticle)
+def remove_article_from_search(sender, instance, **kwargs):
+    search.remove('article', instance.pk)
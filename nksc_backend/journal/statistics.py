@@ -0,0 +1,135 @@
+"""
+Statistics and category breakdowns for ``filter_journals``.
+
+Everything ``stats=true`` and ``categories=true`` report is derived from one
+grouped query over (year, editor, volume, issue, is_published). Journals are
+few, so the grouped rows are small and are folded into totals, distributions
+and distinct lists in Python. The rows are memoized in the cache per filter
+signature (the SQL of the filtered queryset) in the ``journal`` cache
+namespace, so any journal save or delete retires every signature at once.
+"""
+import hashlib
+
+from django.conf import settings
+from django.db.models import Count, Max, Min, Sum
+from django.utils.functional import cached_property
+
+from utils import cache
+
+GROUP_FIELDS = ('year', 'editor', 'volume', 'issue', 'is_published')
+TOP_EDITORS = 10
+
+
+def _signature(queryset):
+    sql = str(queryset.order_by().query)
+    return hashlib.sha1(sql.encode('utf-8')).hexdigest()
+
+
+class JournalStatistics:
+    """Lazily loads the grouped rows for a filtered journal queryset, at most once."""
+
+    def __init__(self, queryset):
+        self.queryset = queryset
+
+    @cached_property
+    def rows(self):
+        return cache.namespace('journal').get_or_set(
+            ('stats', _signature(self.queryset)),
+            self._grouped_rows,
+            timeout=getattr(settings, 'JOURNAL_STATS_CACHE_TIMEOUT', 600),
+        )
+
+    def _grouped_rows(self):
+        return list(
+            self.queryset.order_by().values(*GROUP_FIELDS).annotate(
+                count=Count('id'),
+                total_pages=Sum('pages'),
+                total_file_size=Sum('file_size_mb'),
+                latest=Max('created_at'),
+                oldest=Min('created_at'),
+            )
+        )
+
+    @property
+    def total(self):
+        return sum(row['count'] for row in self.rows)
+
+    def _count_by(self, field):
+        counts = {}
+        for row in self.rows:
+            counts[row[field]] = counts.get(row[field], 0) + row['count']
+        return counts
+
+    def _distinct(self, field, reverse=False):
+        return sorted({row[field] for row in self.rows}, reverse=reverse)
+
+    def statistics(self):
+        rows = self.rows
+        total = self.total
+        total_pages = sum(row['total_pages'] or 0 for row in rows)
+        total_file_size = sum(row['total_file_size'] or 0 for row in rows)
+        years = [row['year'] for row in rows]
+        latest_dates = [row['latest'] for row in rows if row['latest']]
+        oldest_dates = [row['oldest'] for row in rows if row['oldest']]
+
+        latest_by_year = {}
+        for row in rows:
+            if row['latest'] and (row['year'] not in latest_by_year or row['latest'] > latest_by_year[row['year']]):
+                latest_by_year[row['year']] = row['latest']
+
+        year_counts = self._count_by('year')
+        editor_counts = self._count_by('editor')
+        volume_counts = self._count_by('volume')
+        published_counts = self._count_by('is_published')
+
+        return {
+            "overall": {
+                "total_journals": total,
+                "year_range": {
+                    "min": min(years) if years else None,
+                    "max": max(years) if years else None
+                },
+                "pages": {
+                    "total": total_pages,
+                    "average": round(total_pages / total, 2) if total else 0
+                },
+                "file_size": {
+                    "total_mb": round(total_file_size, 2),
+                    "average_mb": round(total_file_size / total, 2) if total else 0
+                },
+                "date_range": {
+                    "oldest": min(oldest_dates) if oldest_dates else None,
+                    "latest": max(latest_dates) if latest_dates else None
+                }
+            },
+            "distribution": {
+                "by_year": [
+                    {"year": year, "count": year_counts[year], "latest": latest_by_year.get(year)}
+                    for year in sorted(year_counts, reverse=True)
+                ],
+                "by_editor": [
+                    {"editor": editor, "count": count}
+                    for editor, count in sorted(editor_counts.items(), key=lambda item: (-item[1], item[0]))
+                ][:TOP_EDITORS],
+                "by_volume": [
+                    {"volume": volume, "count": volume_counts[volume]}
+                    for volume in sorted(volume_counts)
+                ],
+                "by_published_status": [
+                    {"is_published": is_published, "count": count}
+                    for is_published, count in published_counts.items()
+                ]
+            }
+        }
+
+    def categories(self):
+        categories = {}
+        for name, field, reverse in (
+            ("years", 'year', True),
+            ("volumes", 'volume', False),
+            ("editors", 'editor', False),
+            ("issues", 'issue', False),
+        ):
+            values = self._distinct(field, reverse=reverse)
+            categories[name] = {"count": len(values), "list": values}
+        return categories
@@ -1,3 +1,498 @@
-from django.test import TestCase
+import hashlib
+import io
+import json
+import os
+import shutil
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from pypdf import PdfReader, PdfWriter
+from rest_framework.test import APIClient
+
+from . import async_views, pdf_cache, pdf_index, search
+from .models import Author, Journal, JournalArticle, JournalPdfIndex, SearchTerm
+
+
+class JournalArticleCountQueryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for number in range(1, 6):
+            journal = Journal.objects.create(
+                title=f"Journal {number}",
+                volume=str(number),
+                year=2020 + number,
+                issue="1",
+                editor="Editor",
+                description="Description",
+                pdf_file=f"journals/journal-{number}.pdf",
+                is_published=True,
+            )
+            for order in range(number):
+                JournalArticle.objects.create(
+                    journal=journal,
+                    title=f"Article {order}",
+                    authors="Author",
+                    order_in_journal=order,
+                )
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_with_counts_annotates_article_count(self):
+        counts = dict(Journal.objects.with_counts().values_list('volume', 'article_count'))
+        self.assertEqual(counts, {'1': 1, '2': 2, '3': 3, '4': 4, '5': 5})
+
+    def test_get_all_journals_counts_articles_in_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/journals/get-all-journals/')
+
+        self.assertEqual(response.status_code, 200)
+        counts = {item['volume']: item['article_count'] for item in response.data['data']}
+        self.assertEqual(counts, {'1': 1, '2': 2, '3': 3, '4': 4, '5': 5})
+
+    def test_async_get_all_journals_matches_the_sync_view(self):
+        expected = self.client.get('/api/journals/get-all-journals/')
+        with self.assertNumQueries(1):
+            response = async_to_sync(async_views.get_all_journals)(
+                RequestFactory().get('/api/journals/get-all-journals/')
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content), json.loads(expected.content))
+        self.assertTrue(response.has_header('ETag'))
+
+    def test_filter_all_does_not_count_per_journal(self):
+        # The total COUNT and the annotated list
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/journals/filter/', {'all': 'true'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['data']), 5)
+        self.assertEqual(response.data['data'][0]['article_count'], 5)
+
+    def test_filter_cursor_pages_without_count(self):
+        seen = []
+        cursor = ''
+        while True:
+            # No COUNT: just the annotated keyset page
+            with self.assertNumQueries(1):
+                response = self.client.get('/api/journals/filter/', {'cursor': cursor, 'page_size': 2})
+            seen.extend(item['volume'] for item in response.data['data'])
+            if not response.data['pagination']['has_next']:
+                break
+            cursor = response.data['pagination']['next_cursor']
+
+        self.assertEqual(seen, ['5', '4', '3', '2', '1'])
+        self.assertEqual(
+            self.client.get('/api/journals/filter/', {'cursor': 'not-a-cursor'}).status_code, 400
+        )
+
+    def test_filter_page_does_not_count_per_journal(self):
+        # The total COUNT (shared with the paginator) and the annotated page
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/journals/filter/', {'page_size': 2})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item['article_count'] for item in response.data['data']], [5, 4])
+
+
+class JournalStatisticsQueryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for number, (year, editor) in enumerate([(2021, "A"), (2021, "B"), (2023, "A")], start=1):
+            Journal.objects.create(
+                title=f"Journal {number}",
+                volume=str(number),
+                year=year,
+                issue="1",
+                editor=editor,
+                description="Description",
+                pdf_file=f"journals/journal-{number}.pdf",
+                pages=100,
+                is_published=True,
+            )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def test_stats_and_categories_share_one_grouped_query(self):
+        params = {'stats': 'true', 'categories': 'true', 'sort_by': 'title'}
+        # The grouped statistics query and the page; the total comes from the grouped rows
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/journals/filter/', params)
+
+        self.assertEqual(response.status_code, 200)
+        statistics = response.data['statistics']
+        self.assertEqual(statistics['overall']['total_journals'], 3)
+        self.assertEqual(statistics['overall']['pages'], {'total': 300, 'average': 100.0})
+        self.assertEqual(
+            statistics['distribution']['by_editor'],
+            [{'editor': 'A', 'count': 2}, {'editor': 'B', 'count': 1}]
+        )
+        self.assertEqual(
+            statistics['distribution']['by_published_status'],
+            [{'is_published': True, 'count': 3}]
+        )
+        self.assertEqual(response.data['categories']['years'], {'count': 2, 'list': [2023, 2021]})
+        self.assertEqual(response.data['pagination']['total_items'], 3)
+
+        # Memoized for the same filters: only the page itself is queried
+        with self.assertNumQueries(1):
+            self.client.get('/api/journals/filter/', params)
+
+    def test_saving_a_journal_invalidates_statistics(self):
+        params = {'summary': 'true'}
+        self.client.get('/api/journals/filter/', params)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Journal.objects.filter(volume='1').first().save()
+
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/journals/filter/', params)
+        self.assertEqual(response.data['data']['statistics']['overall']['total_journals'], 3)
+
+
+class JournalSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.journal = Journal.objects.create(
+            title="Nazrul Studies", volume="5", year=2023, issue="1", editor="Rahim",
+            description="Essays", pdf_file="journals/nazrul.pdf", is_published=True,
+        )
+        cls.hidden = Journal.objects.create(
+            title="Draft", volume="6", year=2024, issue="1", editor="Rahim",
+            description="Poetry drafts", pdf_file="journals/draft.pdf", is_published=False,
+        )
+        cls.poetry = JournalArticle.objects.create(
+            journal=cls.journal, title="Rebel poetry of Nazrul", title_bn="নজরুলের বিদ্রোহী কবিতা",
+            authors="Afroza Bulbul", abstract="A study of rebellion.", keywords="poetry, rebellion",
+        )
+        cls.rivers = JournalArticle.objects.create(
+            journal=cls.journal, title="Rivers of Bengal", authors="John Doe",
+            abstract="Rivers and climate; poetry is mentioned once.", keywords="climate",
+        )
+        JournalArticle.objects.create(
+            journal=cls.hidden, title="Unpublished poetry", authors="X", abstract="Poetry",
+        )
+
+    def test_tokenize_keeps_bengali_words_whole(self):
+        self.assertEqual(
+            search.tokenize("নজরুলের বিদ্রোহী ও কবিতা, Rebel-poetry ২০২৩"),
+            ['নজরুলের', 'বিদ্রোহী', 'কবিতা', 'rebel', 'poetry', '2023'],
+        )
+
+    def test_search_ranks_title_and_keyword_hits_first(self):
+        response = self.client.get('/api/journals/search/', {'q': 'poetry', 'type': 'article'})
+
+        self.assertEqual(response.status_code, 200)
+        ids = [result['item']['id'] for result in response.data['data']]
+        self.assertEqual(ids, [self.poetry.id, self.rivers.id])
+
+    def test_search_bengali_and_prefix(self):
+        response = self.client.get('/api/journals/search/', {'q': 'বিদ্রোহী'})
+        self.assertEqual([result['item']['id'] for result in response.data['data']], [self.poetry.id])
+
+        response = self.client.get('/api/journals/search/', {'q': 'nazr', 'type': 'journal'})
+        self.assertEqual([result['item']['id'] for result in response.data['data']], [self.journal.id])
+
+    def test_search_ranks_at_most_max_matches(self):
+        with mock.patch.object(search, 'MAX_MATCHES', 1):
+            ranked = search.search('poetry', ['article'])
+
+        self.assertEqual([object_id for _, object_id, _ in ranked], [self.poetry.id])
+
+    def test_rebuild_matches_incremental_index(self):
+        def postings():
+            return sorted(SearchTerm.objects.values_list('term', 'object_type', 'object_id', 'weight'))
+
+        incremental = postings()
+        self.assertEqual(search.rebuild(), (2, 3))
+        self.assertEqual(postings(), incremental)
+
+    def test_index_follows_edits_and_deletes(self):
+        self.rivers.title = "Estuaries of Bengal"
+        self.rivers.save()
+        self.assertEqual(search.matching_ids("estuaries", 'article'), {self.rivers.id})
+
+        self.rivers.delete()
+        self.assertEqual(search.matching_ids("estuaries", 'article'), set())
+
+    def test_filter_journals_search_uses_index(self):
+        response = self.client.get('/api/journals/filter/', {'search': 'essays'})
+        self.assertEqual([item['id'] for item in response.data['data']], [self.journal.id])
+
+
+class AuthorKeywordTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.journal = Journal.objects.create(
+            title="Journal", volume="1", year=2023, issue="1", editor="Editor",
+            description="Description", pdf_file="journals/journal.pdf", is_published=True,
+        )
+        cls.first = JournalArticle.objects.create(
+            journal=cls.journal, title="First", authors="Afroza Bulbul, John  Doe",
+            abstract="Abstract", keywords="Poetry, History", order_in_journal=1,
+        )
+        cls.second = JournalArticle.objects.create(
+            journal=cls.journal, title="Second", authors="john doe",
+            abstract="Abstract", keywords="poetry", order_in_journal=2,
+        )
+
+    def test_names_are_normalized_and_ordered(self):
+        self.assertEqual(Author.objects.count(), 2)
+        self.assertEqual(self.first.get_authors_list(), ["Afroza Bulbul", "John  Doe"])
+        self.assertEqual(
+            [link.author.name for link in self.first.article_authors.all()],
+            ["Afroza Bulbul", "John Doe"]
+        )
+
+        self.first.authors = "John Doe, Afroza Bulbul"
+        self.first.keywords = ""
+        self.first.save()
+        self.assertEqual(
+            list(self.first.article_authors.values_list('author__name', 'position')),
+            [("John Doe", 1), ("Afroza Bulbul", 2)]
+        )
+        self.assertFalse(self.first.article_keywords.exists())
+
+    def test_articles_by_author(self):
+        author = Author.objects.get(normalized_name="john doe")
+        response = self.client.get(f'/api/journals/authors/{author.id}/articles/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item['id'] for item in response.data['data']], [self.first.id, self.second.id])
+        self.assertEqual(response.data['data'][0]['authors_list'], ["Afroza Bulbul", "John Doe"])
+
+    def test_keyword_facets(self):
+        response = self.client.get('/api/journals/keywords/', {'journal_id': self.journal.id})
+
+        self.assertEqual(
+            [(item['name'], item['article_count']) for item in response.data['data']],
+            [("Poetry", 2), ("History", 1)]
+        )
+
+    def test_article_list_prefetches_names(self):
+        # Journal lookup, articles, their authors and their keywords
+        with self.assertNumQueries(4):
+            response = self.client.get(f'/api/journals/{self.journal.id}/articles/')
+        self.assertEqual(response.data['data'][1]['keywords_list'], ["Poetry"])
+
+
+def make_pdf(pages, outline=()):
+    writer = PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(width=200, height=200)
+    for title, page_index in outline:
+        writer.add_outline_item(title, page_index)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+class JournalPdfTestCase(TestCase):
+    """A journal with a real six page PDF: prelims 1-2, articles at 3-4 and 5-6."""
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        self.cache_dir = os.path.join(media_root, 'journal_cache')
+        settings_override = override_settings(
+            MEDIA_ROOT=media_root, JOURNAL_PDF_CACHE_DIR=self.cache_dir, BACKGROUND_TASKS_ASYNC=False
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.pdf = make_pdf(6, outline=[("First", 2), ("Second", 4)])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.journal = Journal.objects.create(
+                title="Journal", volume="1", year=2023, issue="1", editor="Editor",
+                description="Description", is_published=True,
+                pdf_file=SimpleUploadedFile("journal.pdf", self.pdf, 'application/pdf'),
+            )
+            self.first = JournalArticle.objects.create(
+                journal=self.journal, title="First", authors="A", start_page=3, order_in_journal=1,
+            )
+            JournalArticle.objects.create(
+                journal=self.journal, title="Second", authors="B", start_page=5, order_in_journal=2,
+            )
+        self.journal.refresh_from_db()
+
+
+class JournalPdfCacheTests(JournalPdfTestCase):
+    def test_split_is_cached_under_file_hash_and_page_range(self):
+        pdf_hash = hashlib.sha256(self.pdf).hexdigest()
+        path = pdf_cache.get_cached_pdf(self.journal, 3, 4)
+
+        self.assertEqual(self.journal.pdf_hash, pdf_hash)
+        self.assertEqual(path, os.path.join(self.cache_dir, pdf_hash, '3-4.pdf'))
+        self.assertEqual(len(PdfReader(path).pages), 2)
+        # Warmed in the background after upload: prelims and both articles
+        self.assertEqual(sorted(os.listdir(os.path.dirname(path))), ['1-2.pdf', '3-4.pdf', '5-6.pdf'])
+
+    def test_hit_is_served_without_parsing_the_journal(self):
+        with mock.patch('pypdf.PdfReader') as reader:
+            response = self.client.get(f'/api/journals/articles/{self.first.id}/pdf/')
+
+        reader.assert_not_called()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(PdfReader(io.BytesIO(b''.join(response.streaming_content))).pages), 2)
+
+    def test_replacing_the_file_rekeys_and_purges_the_cache(self):
+        old_directory = os.path.join(self.cache_dir, self.journal.pdf_hash)
+        replacement = make_pdf(8)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.journal.pdf_file = SimpleUploadedFile("journal-v2.pdf", replacement, 'application/pdf')
+            self.journal.save()
+        self.journal.refresh_from_db()
+
+        self.assertFalse(os.path.exists(old_directory))
+        self.assertEqual(self.journal.pdf_hash, hashlib.sha256(replacement).hexdigest())
+        self.assertEqual(self.journal.pages, 8)
+        self.assertTrue(os.path.exists(pdf_cache.cached_pdf_path(self.journal.pdf_hash, 5, 8)))
+
+    def test_saving_compares_with_the_loaded_row(self):
+        self.journal.title = "Renamed"
+        self.first.title = "Renamed"
+        with CaptureQueriesContext(connection) as queries, \
+                mock.patch('journal.signals.background.submit_on_commit') as submit:
+            self.journal.save()
+            self.first.save()
+
+        tables = {connection.ops.quote_name(table) for table in ('journal_journal', 'journal_journalarticle')}
+        selects = [
+            query['sql'] for query in queries
+            if query['sql'].startswith('SELECT') and query['sql'].split(' FROM ')[1].split()[0] in tables
+        ]
+        self.assertEqual(selects, [])
+        # Neither the file nor the page layout changed: nothing to rebuild
+        submit.assert_not_called()
+
+
+class JournalPdfIndexTests(JournalPdfTestCase):
+    def test_upload_is_indexed_in_the_background(self):
+        index = JournalPdfIndex.objects.get(journal=self.journal)
+
+        self.assertEqual(index.status, 'ready')
+        self.assertEqual((index.page_count, index.file_size_bytes), (6, len(self.pdf)))
+        self.assertEqual(index.pdf_hash, self.journal.pdf_hash)
+        self.assertEqual([offset['page'] for offset in index.page_offsets], [1, 2, 3, 4, 5, 6])
+        self.assertTrue(all(offset['object'] for offset in index.page_offsets))
+        self.assertEqual(self.journal.pages, 6)
+        self.assertEqual(str(self.journal.file_size_mb), '0.00')
+
+        response = self.client.get(f'/api/journals/{self.journal.id}/pdf-index/')
+        self.assertEqual(response.data['data']['status'], 'ready')
+        self.assertEqual(
+            [(item['title'], item['page']) for item in response.data['data']['outline']],
+            [("First", 3), ("Second", 5)]
+        )
+
+    def test_failure_reports_a_generic_message(self):
+        with self.assertLogs('journal.pdf_index', 'ERROR'), self.captureOnCommitCallbacks(execute=True):
+            broken = Journal.objects.create(
+                title="Broken", volume="2", year=2023, issue="1", editor="Editor", description="Description",
+                pdf_file=SimpleUploadedFile("broken.pdf", b"%PDF-1.4 not really", 'application/pdf'),
+            )
+
+        response = self.client.get(f'/api/journals/{broken.id}/pdf-index/')
+        self.assertEqual(response.data['data']['status'], 'failed')
+        self.assertEqual(response.data['data']['error'], pdf_index.FAILED_MESSAGE)
+
+    def test_page_ranges_before_indexing(self):
+        # Background jobs only run on commit, which never happens here
+        journal = Journal.objects.create(
+            title="Fresh", volume="3", year=2023, issue="1", editor="Editor", description="Description",
+            pdf_file=SimpleUploadedFile("fresh.pdf", make_pdf(9), 'application/pdf'),
+        )
+        last = JournalArticle.objects.create(
+            journal=journal, title="Last", authors="A", start_page=4, order_in_journal=1,
+        )
+
+        # The end of the last article is unknown, and the file is not parsed to find it
+        self.assertEqual(journal.pages, 0)
+        with mock.patch('pypdf.PdfReader') as reader:
+            self.assertEqual(pdf_cache.article_page_range(last), (4, None))
+            self.assertEqual(pdf_cache.journal_page_ranges(journal), {(1, 3)})
+            response = self.client.get(f'/api/journals/articles/{last.id}/pdf/')
+        reader.assert_not_called()
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '30')
+
+        pdf_index.index_journal(journal.id)
+        last.refresh_from_db()
+        self.assertEqual(pdf_cache.article_page_range(last), (4, 9))
+        self.assertEqual(self.client.get(f'/api/journals/articles/{last.id}/pdf/').status_code, 200)
+
+
+class JournalPdfDeliveryTests(JournalPdfTestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = f'/api/journals/articles/{self.first.id}/pdf/'
+        self.path = pdf_cache.cached_pdf_path(self.journal.pdf_hash, 3, 4)
+        with open(self.path, 'rb') as fh:
+            self.body = fh.read()
+
+    def test_full_file(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.body)
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertIn('First.pdf', response['Content-Disposition'])
+
+    def test_single_range(self):
+        response = self.client.get(self.url, HTTP_RANGE='bytes=10-109')
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], f'bytes 10-109/{len(self.body)}')
+        self.assertEqual(response['Content-Length'], '100')
+        self.assertEqual(b''.join(response.streaming_content), self.body[10:110])
+
+    def test_unsatisfiable_range(self):
+        response = self.client.get(self.url, HTTP_RANGE=f'bytes={len(self.body)}-')
+
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{len(self.body)}')
+
+    def test_if_range_mismatch_sends_the_whole_file(self):
+        response = self.client.get(self.url, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"outdated"')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.body)
+
+        etag = response['ETag']
+        response = self.client.get(self.url, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE=etag)
+        self.assertEqual(response.status_code, 206)
+
+        # If-Range uses strong comparison: a weak tag never matches, even the same one
+        response = self.client.get(self.url, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='W/' + etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_if_none_match(self):
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+    def test_offload_headers(self):
+        with override_settings(FILE_DELIVERY_OFFLOAD='x-accel', FILE_DELIVERY_ACCEL_PREFIX='/protected-media/'):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response['X-Accel-Redirect'],
+            f'/protected-media/journal_cache/{self.journal.pdf_hash}/3-4.pdf'
+        )
+        self.assertEqual(response.content, b'')
+
+        with override_settings(FILE_DELIVERY_OFFLOAD='x-sendfile'):
+            response = self.client.get(self.url)
+        self.assertEqual(response['X-Sendfile'], self.path)
+        self.assertEqual(response['Content-Type'], 'application/pdf')
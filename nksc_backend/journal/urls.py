@@ -1,5 +1,7 @@
+from django.conf import settings
 from django.urls import path
 
+from journal import async_views
 from journal.views import (
     JournalListAPIView,
     JournalCreateAPIView,
@@ -13,6 +15,12 @@ from journal.views import (
     JournalArticleRetrieveAPIView,
     ArticlePdfAPIView,
     JournalPrelimsPdfAPIView,
+    JournalPdfIndexAPIView,
+    JournalSearchAPIView,
+    AuthorListAPIView,
+    AuthorArticlesAPIView,
+    KeywordFacetAPIView,
+    KeywordArticlesAPIView,
     filter_journals,
 )
 
@@ -23,6 +31,7 @@ urlpatterns = [
     path("update/<int:journal_id>/", JournalUpdateAPIView.as_view()),
     path("delete/<int:journal_id>/", JournalDeleteAPIView.as_view()),
     path("filter/", filter_journals),
+    path("search/", JournalSearchAPIView.as_view()),
 
     # Journal detail with articles
     path("detail/<int:journal_id>/", JournalDetailAPIView.as_view()),
@@ -33,8 +42,20 @@ urlpatterns = [
     path("articles/create/", JournalArticleCreateAPIView.as_view()),
     path("articles/update/<int:article_id>/", JournalArticleUpdateAPIView.as_view()),
     path("articles/delete/<int:article_id>/", JournalArticleDeleteAPIView.as_view()),
+
+    # Authors & keywords
+    path("authors/", AuthorListAPIView.as_view()),
+    path("authors/<int:author_id>/articles/", AuthorArticlesAPIView.as_view()),
+    path("keywords/", KeywordFacetAPIView.as_view()),
+    path("keywords/<int:keyword_id>/articles/", KeywordArticlesAPIView.as_view()),
     
     # PDF Extracts
     path("<int:journal_id>/prelims/", JournalPrelimsPdfAPIView.as_view()),
     path("articles/<int:article_id>/pdf/", ArticlePdfAPIView.as_view()),
+    path("<int:journal_id>/pdf-index/", JournalPdfIndexAPIView.as_view()),
 ]
+
+if settings.ASYNC_READ_VIEWS:
+    urlpatterns = [
+        path("get-all-journals/", async_views.get_all_journals),
+    ] + urlpatterns
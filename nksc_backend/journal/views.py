@@ -4,18 +4,30 @@ from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.parsers import MultiPartParser, FormParser
-from django.db.models import Count, Max, Min, Q, Sum, Avg
+from django.db.models import Count, Prefetch, Q
 from django.core.paginator import Paginator
-from django.http import HttpResponse, FileResponse
-import io
+from django.http import HttpResponse
 from datetime import datetime
 from drf_spectacular.utils import (
     extend_schema,
     OpenApiParameter,
 )
 
-from .models import Journal, JournalArticle
-from .serializers import JournalSerializer, JournalListSerializer, JournalArticleSerializer
+from utils.file_delivery import send_file
+from utils.http_cache import conditional_read
+from utils.pagination import CursorPaginator, InvalidCursor, cursor_requested, page_size_param
+
+from . import pdf_cache, search
+from .statistics import JournalStatistics
+from .models import Author, Journal, JournalArticle, JournalPdfIndex, Keyword, normalize_name
+from .serializers import (
+    JournalSerializer,
+    JournalListSerializer,
+    JournalArticleSerializer,
+    JournalPdfIndexSerializer,
+    AuthorSerializer,
+    KeywordSerializer,
+)
 
 
 # ─────────────────────────────────────────────────────────────
@@ -30,7 +42,10 @@ class JournalCreateAPIView(APIView):
         request=JournalSerializer,
         responses={201: JournalSerializer},
         summary="Create Journal",
-        description="Create a journal with PDF upload (multipart/form-data)",
+        description=(
+            "Create a journal with PDF upload (multipart/form-data). Page count and file size "
+            "are read from the PDF in the background; see pdf-index/ for progress."
+        ),
     )
     def post(self, request):
         serializer = JournalListSerializer(
@@ -78,7 +93,7 @@ class JournalUpdateAPIView(APIView):
             )
         ],
         summary="Update Journal",
-        description="Update journal with optional PDF replacement",
+        description="Update journal with optional PDF replacement (a new PDF is re-indexed in the background)",
     )
     def put(self, request, journal_id):
         try:
@@ -118,8 +133,9 @@ class JournalListAPIView(APIView):
         summary="List Journals",
         description="Public API – list all published journals (lightweight, no articles nested)",
     )
+    @conditional_read('journal')
     def get(self, request):
-        journals = Journal.objects.filter(is_published=True).order_by("-created_at")
+        journals = Journal.objects.filter(is_published=True).with_counts().order_by("-created_at")
 
         serializer = JournalListSerializer(
             journals,
@@ -152,9 +168,12 @@ class JournalDetailAPIView(APIView):
         summary="Get Journal Detail with Articles",
         description="Returns journal metadata and all nested articles with full details",
     )
+    @conditional_read('journal')
     def get(self, request, journal_id):
         try:
-            journal = Journal.objects.prefetch_related('articles').get(
+            journal = Journal.objects.prefetch_related(
+                Prefetch('articles', queryset=JournalArticle.objects.with_names())
+            ).get(
                 id=journal_id, is_published=True
             )
         except Journal.DoesNotExist:
@@ -210,32 +229,16 @@ class JournalDeleteAPIView(APIView):
 # PDF EXTRACTOR VIEWS
 # ─────────────────────────────────────────────────────────────
 
-def extract_pdf_pages(pdf_path, start_page, end_page, filename):
+def send_cached_pdf(request, journal, start_page, end_page, filename):
     try:
-        from pypdf import PdfReader, PdfWriter
+        path = pdf_cache.get_cached_pdf(journal, start_page, end_page)
     except ImportError:
         return HttpResponse("pypdf not installed", status=500)
-    
-    try:
-        reader = PdfReader(pdf_path)
-        writer = PdfWriter()
-        
-        start_idx = max(0, start_page - 1)
-        end_idx = min(len(reader.pages) - 1, end_page - 1)
-        
-        for i in range(start_idx, end_idx + 1):
-            writer.add_page(reader.pages[i])
-            
-        out_io = io.BytesIO()
-        writer.write(out_io)
-        out_io.seek(0)
-        
-        response = HttpResponse(out_io.getvalue(), content_type='application/pdf')
-        response['Content-Disposition'] = f'inline; filename="{filename}"'
-        return response
     except Exception as e:
         return HttpResponse(f"Error extracting PDF: {str(e)}", status=500)
 
+    return send_file(request, path, content_type='application/pdf', filename=filename)
+
 class JournalPrelimsPdfAPIView(APIView):
     permission_classes = [AllowAny]
     
@@ -253,12 +256,11 @@ class JournalPrelimsPdfAPIView(APIView):
         if not journal.pdf_file:
             return Response({"message": "No PDF found"}, status=status.HTTP_404_NOT_FOUND)
             
-        first_article = journal.articles.order_by('order_in_journal').first()
-        if first_article and first_article.start_page and first_article.start_page > 1:
-            end_page = first_article.start_page - 1
-            return extract_pdf_pages(journal.pdf_file.path, 1, end_page, f"{journal.volume}_{journal.issue}_prelims.pdf")
+        page_range = pdf_cache.prelims_page_range(journal)
+        if page_range:
+            return send_cached_pdf(request, journal, *page_range, f"{journal.volume}_{journal.issue}_prelims.pdf")
         else:
-            return FileResponse(open(journal.pdf_file.path, 'rb'), content_type='application/pdf')
+            return send_file(request, journal.pdf_file.path, content_type='application/pdf')
 
 
 class ArticlePdfAPIView(APIView):
@@ -267,7 +269,7 @@ class ArticlePdfAPIView(APIView):
     @extend_schema(
         responses={200: bytes, 404: dict},
         summary="Get Article PDF Subset",
-        description="Extracts and returns only the pages of a specific article from the journal PDF."
+        description="Returns only the pages of a specific article, served from the pre-split PDF cache. Supports HTTP Range requests. 503 while a new journal PDF is still being indexed."
     )
     def get(self, request, article_id):
         try:
@@ -279,22 +281,53 @@ class ArticlePdfAPIView(APIView):
         if not journal.pdf_file:
             return Response({"message": "No PDF associated with this journal"}, status=status.HTTP_404_NOT_FOUND)
             
-        start_page = article.start_page
-        if not start_page:
-            return FileResponse(open(journal.pdf_file.path, 'rb'), content_type='application/pdf')
-            
-        next_article = JournalArticle.objects.filter(
-            journal=journal, 
-            order_in_journal__gt=article.order_in_journal
-        ).order_by('order_in_journal').first()
-        
-        if next_article and next_article.start_page:
-            end_page = next_article.start_page - 1
-        else:
-            end_page = journal.pages # Use the total pages of the journal
+        page_range = pdf_cache.article_page_range(article)
+        if not page_range:
+            return send_file(request, journal.pdf_file.path, content_type='application/pdf')
+        if page_range[1] is None:
+            # The last article ends with the journal, whose PDF is still being indexed
+            response = Response(
+                {"message": "The journal PDF is still being processed"},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+            response['Retry-After'] = '30'
+            return response
             
         filename = f"{article.title[:50].replace(' ', '_')}.pdf"
-        return extract_pdf_pages(journal.pdf_file.path, start_page, end_page, filename)
+        return send_cached_pdf(request, journal, *page_range, filename)
+
+class JournalPdfIndexAPIView(APIView):
+    permission_classes = [AllowAny]
+
+    @extend_schema(
+        responses={200: JournalPdfIndexSerializer},
+        parameters=[
+            OpenApiParameter(
+                name="journal_id",
+                type=int,
+                location=OpenApiParameter.PATH,
+                description="Journal ID",
+            )
+        ],
+        summary="Get Journal PDF Index",
+        description="Processing status, true page count, file size and bookmarks of the journal PDF",
+    )
+    def get(self, request, journal_id):
+        try:
+            index = JournalPdfIndex.objects.get(journal_id=journal_id)
+        except JournalPdfIndex.DoesNotExist:
+            return Response(
+                {"code": status.HTTP_404_NOT_FOUND, "message": "PDF index not found"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        return Response(
+            {
+                "message": "PDF index retrieved successfully",
+                "code": status.HTTP_200_OK,
+                "data": JournalPdfIndexSerializer(index).data,
+            }
+        )
 
 # ─────────────────────────────────────────────────────────────
 # JOURNAL ARTICLE VIEWS
@@ -316,6 +349,7 @@ class JournalArticleListAPIView(APIView):
         summary="List Articles for a Journal",
         description="Get all articles for a specific journal",
     )
+    @conditional_read('journal')
     def get(self, request, journal_id):
         try:
             journal = Journal.objects.get(id=journal_id, is_published=True)
@@ -325,7 +359,7 @@ class JournalArticleListAPIView(APIView):
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        articles = journal.articles.all().order_by('order_in_journal')
+        articles = journal.articles.with_names().order_by('order_in_journal')
         serializer = JournalArticleSerializer(articles, many=True)
         return Response(
             {
@@ -359,9 +393,10 @@ class JournalArticleRetrieveAPIView(APIView):
         summary="Get Article Detail",
         description="Get a single article's full details by its ID",
     )
+    @conditional_read('journal')
     def get(self, request, article_id):
         try:
-            article = JournalArticle.objects.get(id=article_id)
+            article = JournalArticle.objects.with_names().select_related('journal').get(id=article_id)
         except JournalArticle.DoesNotExist:
             return Response(
                 {"code": status.HTTP_404_NOT_FOUND, "message": "Article not found"},
@@ -502,12 +537,294 @@ class JournalArticleDeleteAPIView(APIView):
             )
 
 
+# ─────────────────────────────────────────────────────────────
+# AUTHORS & KEYWORDS
+# ─────────────────────────────────────────────────────────────
+
+def _page_params(request, default_size=20, max_size=100):
+    try:
+        page = max(int(request.query_params.get('page', 1)), 1)
+        page_size = min(max(int(request.query_params.get('page_size', default_size)), 1), max_size)
+    except ValueError:
+        page, page_size = 1, default_size
+    return page, page_size
+
+
+def _published_articles():
+    return JournalArticle.objects.filter(journal__is_published=True).select_related('journal').with_names()
+
+
+class AuthorListAPIView(APIView):
+    permission_classes = [AllowAny]
+
+    @extend_schema(
+        responses={200: AuthorSerializer(many=True)},
+        parameters=[
+            OpenApiParameter(name="search", type=str, description="Author name prefix"),
+            OpenApiParameter(name="page", type=int, description="Page number (default: 1)"),
+            OpenApiParameter(name="page_size", type=int, description="Authors per page (default: 20, max: 100)"),
+        ],
+        summary="List Authors",
+        description="Authors of published articles with their article counts",
+    )
+    @conditional_read('journal')
+    def get(self, request):
+        authors = Author.objects.annotate(
+            article_count=Count('article_links', filter=Q(article_links__article__journal__is_published=True))
+        ).filter(article_count__gt=0).order_by('name')
+
+        search_query = request.query_params.get('search', '').strip()
+        if search_query:
+            authors = authors.filter(normalized_name__startswith=normalize_name(search_query))
+
+        page, page_size = _page_params(request)
+        paginator = Paginator(authors, page_size)
+        author_page = paginator.get_page(page)
+
+        return Response(
+            {
+                "code": status.HTTP_200_OK,
+                "message": "Authors retrieved successfully",
+                "data": AuthorSerializer(author_page.object_list, many=True).data,
+                "pagination": {
+                    "current_page": author_page.number,
+                    "total_pages": paginator.num_pages,
+                    "total_items": paginator.count,
+                    "has_next": author_page.has_next(),
+                    "has_previous": author_page.has_previous(),
+                    "page_size": page_size,
+                },
+            }
+        )
+
+
+class AuthorArticlesAPIView(APIView):
+    permission_classes = [AllowAny]
+
+    @extend_schema(
+        responses={200: JournalArticleSerializer(many=True)},
+        parameters=[
+            OpenApiParameter(
+                name="author_id",
+                type=int,
+                location=OpenApiParameter.PATH,
+                description="Author ID",
+            )
+        ],
+        summary="List Articles by Author",
+        description="All published articles of one author, newest journal first",
+    )
+    @conditional_read('journal')
+    def get(self, request, author_id):
+        try:
+            author = Author.objects.get(id=author_id)
+        except Author.DoesNotExist:
+            return Response(
+                {"code": status.HTTP_404_NOT_FOUND, "message": "Author not found"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        articles = _published_articles().filter(article_authors__author=author).order_by(
+            '-journal__year', 'journal_id', 'order_in_journal'
+        )
+        return Response(
+            {
+                "code": status.HTTP_200_OK,
+                "message": "Articles retrieved successfully",
+                "author": {"id": author.id, "name": author.name},
+                "data": JournalArticleSerializer(articles, many=True).data,
+            }
+        )
+
+
+class KeywordFacetAPIView(APIView):
+    permission_classes = [AllowAny]
+
+    @extend_schema(
+        responses={200: KeywordSerializer(many=True)},
+        parameters=[
+            OpenApiParameter(name="journal_id", type=int, description="Only count articles of this journal"),
+            OpenApiParameter(name="year", type=int, description="Only count articles of journals from this year"),
+            OpenApiParameter(name="limit", type=int, description="Number of keywords (default: 50, max: 500)"),
+        ],
+        summary="Keyword Facets",
+        description="Most used keywords of published articles with their article counts",
+    )
+    @conditional_read('journal')
+    def get(self, request):
+        links = Q(article_links__article__journal__is_published=True)
+
+        journal_id = request.query_params.get('journal_id')
+        if journal_id and journal_id.isdigit():
+            links &= Q(article_links__article__journal_id=int(journal_id))
+        year = request.query_params.get('year')
+        if year and year.isdigit():
+            links &= Q(article_links__article__journal__year=int(year))
+
+        limit = request.query_params.get('limit', '50')
+        limit = min(int(limit), 500) if limit.isdigit() and int(limit) > 0 else 50
+
+        keywords = Keyword.objects.annotate(
+            article_count=Count('article_links', filter=links)
+        ).filter(article_count__gt=0).order_by('-article_count', 'name')[:limit]
+
+        return Response(
+            {
+                "code": status.HTTP_200_OK,
+                "message": "Keywords retrieved successfully",
+                "data": KeywordSerializer(keywords, many=True).data,
+            }
+        )
+
+
+class KeywordArticlesAPIView(APIView):
+    permission_classes = [AllowAny]
+
+    @extend_schema(
+        responses={200: JournalArticleSerializer(many=True)},
+        parameters=[
+            OpenApiParameter(
+                name="keyword_id",
+                type=int,
+                location=OpenApiParameter.PATH,
+                description="Keyword ID",
+            )
+        ],
+        summary="List Articles by Keyword",
+        description="All published articles tagged with one keyword, newest journal first",
+    )
+    @conditional_read('journal')
+    def get(self, request, keyword_id):
+        try:
+            keyword = Keyword.objects.get(id=keyword_id)
+        except Keyword.DoesNotExist:
+            return Response(
+                {"code": status.HTTP_404_NOT_FOUND, "message": "Keyword not found"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        articles = _published_articles().filter(article_keywords__keyword=keyword).order_by(
+            '-journal__year', 'journal_id', 'order_in_journal'
+        )
+        return Response(
+            {
+                "code": status.HTTP_200_OK,
+                "message": "Articles retrieved successfully",
+                "keyword": {"id": keyword.id, "name": keyword.name},
+                "data": JournalArticleSerializer(articles, many=True).data,
+            }
+        )
+
+
+# ─────────────────────────────────────────────────────────────
+# SEARCH
+# ─────────────────────────────────────────────────────────────
+
+class JournalSearchAPIView(APIView):
+    permission_classes = [AllowAny]
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(name="q", type=str, description="Search text (English or Bengali)"),
+            OpenApiParameter(
+                name="type", type=str, enum=["all", "journal", "article"],
+                description="Restrict results to journals or articles (default: all)",
+            ),
+            OpenApiParameter(name="page", type=int, description="Page number (default: 1)"),
+            OpenApiParameter(name="page_size", type=int, description="Results per page (default: 10, max: 50)"),
+        ],
+        summary="Search Journals and Articles",
+        description=(
+            "Ranked full-text search over published journals (title, description, editor, volume, "
+            "issue, ISSN) and their articles (titles, abstracts, keywords and authors in English "
+            "and Bengali). The last word also matches as a prefix."
+        ),
+    )
+    @conditional_read('journal')
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response(
+                {"code": status.HTTP_400_BAD_REQUEST, "message": "Query parameter 'q' is required"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        result_type = request.query_params.get('type', 'all')
+        object_types = [result_type] if result_type in ('journal', 'article') else ['journal', 'article']
+
+        try:
+            page = max(int(request.query_params.get('page', 1)), 1)
+            page_size = min(max(int(request.query_params.get('page_size', 10)), 1), 50)
+        except ValueError:
+            page, page_size = 1, 10
+
+        ranked = search.search(query, object_types)
+
+        # Only published journals (and the articles in them) are public
+        journal_ids = [object_id for object_type, object_id, _ in ranked if object_type == 'journal']
+        article_ids = [object_id for object_type, object_id, _ in ranked if object_type == 'article']
+        visible = {
+            'journal': set(Journal.objects.filter(
+                pk__in=journal_ids, is_published=True
+            ).values_list('pk', flat=True)) if journal_ids else set(),
+            'article': set(JournalArticle.objects.filter(
+                pk__in=article_ids, journal__is_published=True
+            ).values_list('pk', flat=True)) if article_ids else set(),
+        }
+        ranked = [result for result in ranked if result[1] in visible[result[0]]]
+
+        paginator = Paginator(ranked, page_size)
+        result_page = paginator.get_page(page)
+
+        page_ids = {'journal': [], 'article': []}
+        for object_type, object_id, _ in result_page.object_list:
+            page_ids[object_type].append(object_id)
+        journals = Journal.objects.filter(pk__in=page_ids['journal']).with_counts().in_bulk()
+        articles = JournalArticle.objects.filter(
+            pk__in=page_ids['article']
+        ).select_related('journal').with_names().in_bulk()
+
+        data = []
+        for object_type, object_id, score in result_page.object_list:
+            if object_type == 'journal':
+                item = JournalListSerializer(journals[object_id], context={"request": request}).data
+            else:
+                article = articles[object_id]
+                item = JournalArticleSerializer(article).data
+                item['journal_info'] = {
+                    "id": article.journal.id,
+                    "title": article.journal.title,
+                    "volume": article.journal.volume,
+                    "year": article.journal.year,
+                    "issue": article.journal.issue,
+                }
+            data.append({"type": object_type, "score": score, "item": item})
+
+        return Response(
+            {
+                "code": status.HTTP_200_OK,
+                "message": "Search completed successfully",
+                "query": query,
+                "data": data,
+                "pagination": {
+                    "current_page": result_page.number,
+                    "total_pages": paginator.num_pages,
+                    "total_items": paginator.count,
+                    "has_next": result_page.has_next(),
+                    "has_previous": result_page.has_previous(),
+                    "page_size": page_size,
+                },
+            }
+        )
+
+
 # ─────────────────────────────────────────────────────────────
 # FILTER JOURNALS (unchanged from original, updated serializer)
 # ─────────────────────────────────────────────────────────────
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@conditional_read('journal', daily=True)
 def filter_journals(request):
 
     try:
@@ -613,14 +930,12 @@ def filter_journals(request):
             except ValueError:
                 pass
 
-        # Search across multiple fields
+        # Search across title, description, volume, editor, issue and ISSN (full-text index)
         search_query = request.query_params.get('search')
         if search_query:
-            search_filters = Q()
-            search_fields = ['title', 'description', 'volume', 'editor', 'issue', 'issn']
-            for field in search_fields:
-                search_filters |= Q(**{f'{field}__icontains': search_query})
-            filters &= search_filters
+            search_ids = search.matching_ids(search_query, 'journal')
+            if search_ids is not None:
+                filters &= Q(pk__in=search_ids)
 
         # Apply all filters
         journals = base_query.filter(filters)
@@ -656,11 +971,16 @@ def filter_journals(request):
 
         journals = journals.order_by(sort_field)
 
+        # One grouped query (memoized per filter) backs statistics, categories and the total
+        journal_stats = JournalStatistics(journals)
+        include_stats = request.query_params.get('stats', 'false').lower() == 'true'
+        include_categories = request.query_params.get('categories', 'false').lower() == 'true'
+
         # ========== 4. CHECK IF ONLY STATISTICS ARE NEEDED ==========
         summary_only = request.query_params.get('summary', 'false').lower() == 'true'
 
         if summary_only:
-            stats = _calculate_statistics(journals)
+            stats = journal_stats.statistics()
             return Response({
                 "code": status.HTTP_200_OK,
                 "message": "Journal statistics retrieved successfully",
@@ -671,10 +991,32 @@ def filter_journals(request):
             })
 
         # ========== 5. PAGINATION ==========
+        # Cursor mode (?cursor=) pages by keyset and never counts unless stats were asked for
+        use_cursor = cursor_requested(request)
+        if include_stats or include_categories:
+            total_found = journal_stats.total
+        elif use_cursor:
+            total_found = None
+        else:
+            total_found = journals.count()
+
         return_all = request.query_params.get('all', 'false').lower() == 'true'
         page_data = None
 
-        if not return_all:
+        if use_cursor:
+            page_size = page_size_param(request, default=10)
+            ordering = [sort_field] if sort_field.lstrip('-') == 'created_at' else [sort_field, '-created_at']
+            paginator = CursorPaginator(journals.with_counts(), ordering, page_size)
+            try:
+                journal_page = paginator.get_page(request.query_params.get('cursor'))
+            except InvalidCursor as e:
+                return Response(
+                    {"code": status.HTTP_400_BAD_REQUEST, "message": str(e)},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            journals_to_serialize = journal_page.object_list
+            page_data = journal_page.pagination_data(page_size)
+        elif not return_all:
             page = request.query_params.get('page', 1)
             page_size = request.query_params.get('page_size', 10)
 
@@ -692,8 +1034,10 @@ def filter_journals(request):
                 page_size = 10
 
             paginator = Paginator(journals, page_size)
+            paginator.count = total_found  # already known, skip the paginator's own COUNT
             journal_page = paginator.get_page(page)
-            journals_to_serialize = journal_page.object_list
+            # Annotate only the rows on this page; the count and stats queries stay ungrouped
+            journals_to_serialize = journal_page.object_list.with_counts()
 
             page_data = {
                 "current_page": journal_page.number,
@@ -706,16 +1050,16 @@ def filter_journals(request):
                 "end_index": journal_page.end_index()
             }
         else:
-            journals_to_serialize = journals
+            journals_to_serialize = journals.with_counts()
             page_data = {
                 "current_page": 1,
                 "total_pages": 1,
-                "total_items": journals.count(),
+                "total_items": total_found,
                 "has_next": False,
                 "has_previous": False,
-                "page_size": journals.count(),
+                "page_size": total_found,
                 "start_index": 1,
-                "end_index": journals.count()
+                "end_index": total_found
             }
 
         # ========== 6. SERIALIZE DATA ==========
@@ -739,18 +1083,16 @@ def filter_journals(request):
         }
 
         # ========== 8. ADD STATISTICS IF REQUESTED ==========
-        include_stats = request.query_params.get('stats', 'false').lower() == 'true'
         if include_stats:
-            response_data["statistics"] = _calculate_statistics(journals)
+            response_data["statistics"] = journal_stats.statistics()
 
         # ========== 9. ADD CATEGORIES IF REQUESTED ==========
-        include_categories = request.query_params.get('categories', 'false').lower() == 'true'
         if include_categories:
-            response_data["categories"] = _calculate_categories(journals)
+            response_data["categories"] = journal_stats.categories()
 
         # ========== 10. ADD SUMMARY INFO ==========
         response_data["summary"] = {
-            "total_found": journals.count(),
+            "total_found": total_found,
             "query_time": datetime.now().isoformat(),
             "search_performed": bool(search_query)
         }
@@ -769,89 +1111,6 @@ def filter_journals(request):
         )
 
 
-def _calculate_statistics(journals_queryset):
-    """Helper function to calculate statistics from a queryset"""
-    stats = journals_queryset.aggregate(
-        total_count=Count('id'),
-        year_min=Min('year'),
-        year_max=Max('year'),
-        total_pages=Sum('pages'),
-        avg_pages=Avg('pages'),
-        total_file_size=Sum('file_size_mb'),
-        avg_file_size=Avg('file_size_mb'),
-        latest_date=Max('created_at'),
-        oldest_date=Min('created_at')
-    )
-
-    year_distribution = journals_queryset.values('year').annotate(
-        count=Count('id'),
-        latest=Max('created_at')
-    ).order_by('-year')
-
-    editor_distribution = journals_queryset.values('editor').annotate(
-        count=Count('id')
-    ).order_by('-count')[:10]
-
-    volume_distribution = journals_queryset.values('volume').annotate(
-        count=Count('id')
-    ).order_by('volume')
-
-    published_stats = journals_queryset.values('is_published').annotate(
-        count=Count('id')
-    )
-
-    return {
-        "overall": {
-            "total_journals": stats['total_count'] or 0,
-            "year_range": {
-                "min": stats['year_min'],
-                "max": stats['year_max']
-            },
-            "pages": {
-                "total": stats['total_pages'] or 0,
-                "average": round(stats['avg_pages'] or 0, 2)
-            },
-            "file_size": {
-                "total_mb": round(stats['total_file_size'] or 0, 2),
-                "average_mb": round(stats['avg_file_size'] or 0, 2)
-            },
-            "date_range": {
-                "oldest": stats['oldest_date'],
-                "latest": stats['latest_date']
-            }
-        },
-        "distribution": {
-            "by_year": list(year_distribution),
-            "by_editor": list(editor_distribution),
-            "by_volume": list(volume_distribution),
-            "by_published_status": list(published_stats)
-        }
-    }
-
-
-def _calculate_categories(journals_queryset):
-    """Helper function to calculate category breakdown"""
-    categories = {
-        "years": {
-            "count": journals_queryset.values('year').distinct().count(),
-            "list": list(journals_queryset.values_list('year', flat=True).distinct().order_by('-year'))
-        },
-        "volumes": {
-            "count": journals_queryset.values('volume').distinct().count(),
-            "list": list(journals_queryset.values_list('volume', flat=True).distinct().order_by('volume'))
-        },
-        "editors": {
-            "count": journals_queryset.values('editor').distinct().count(),
-            "list": list(journals_queryset.values_list('editor', flat=True).distinct().order_by('editor'))
-        },
-        "issues": {
-            "count": journals_queryset.values('issue').distinct().count(),
-            "list": list(journals_queryset.values_list('issue', flat=True).distinct().order_by('issue'))
-        }
-    }
-    return categories
-
-
 def _get_applied_filters(request):
     """Helper function to extract applied filters from request"""
     applied_filters = {}
@@ -2,6 +2,7 @@ from django.contrib import admin
 from django.utils.html import format_html
 from django.utils.translation import gettext_lazy as _
 from django import forms
+from media_stuff import derivatives
 from media_stuff.models import *
 
 # ========== SIMPLE FORMS ==========
@@ -54,7 +55,7 @@ class GalleryImageInline(admin.TabularInline):
         if obj.image:
             return format_html(
                 '<img src="{}" style="max-height: 80px; max-width: 120px; border: 1px solid #ddd;" />',
-                obj.image.url
+                derivatives.rendition_url(obj, 'thumbnail', 'jpeg') or obj.image.url
             )
         return "-"
 
@@ -182,7 +183,7 @@ class GalleryEventAdmin(admin.ModelAdmin):
     status_badge.short_description = "Status"
 
     def total_images_display(self, obj):
-        count = obj.images.count()
+        count = obj.image_count
         return format_html(
             '<span style="color: {}; font-weight: bold;">{}</span>',
             '#198754' if count > 0 else '#6c757d',
@@ -192,7 +193,7 @@ class GalleryEventAdmin(admin.ModelAdmin):
     total_images_display.short_description = "Images"
 
     def total_videos_display(self, obj):
-        count = obj.videos.count()
+        count = obj.video_count
         return format_html(
             '<span style="color: {}; font-weight: bold;">{}</span>',
             '#dc3545' if count > 0 else '#6c757d',
@@ -245,7 +246,7 @@ class GalleryImageAdmin(admin.ModelAdmin):
         if obj.image:
             return format_html(
                 '<img src="{}" style="max-height: 60px; max-width: 80px; border: 1px solid #ddd;" />',
-                obj.image.url
+                derivatives.rendition_url(obj, 'thumbnail', 'jpeg') or obj.image.url
             )
         return "-"
 
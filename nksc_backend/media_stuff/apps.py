@@ -4,3 +4,14 @@ from django.apps import AppConfig
 class MediaStuffConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'media_stuff'
+
+    def ready(self):
+        from utils import cache
+
+        from . import signals  # noqa: F401
+
+        cache.register_dependency(
+            'media_stuff',
+            'media_stuff.GalleryCategory', 'media_stuff.GalleryEvent',
+            'media_stuff.GalleryImage', 'media_stuff.GalleryVideo',
+        )
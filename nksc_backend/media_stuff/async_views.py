@@ -0,0 +1,87 @@
+"""
+Async versions of the public gallery reads, routed when ``ASYNC_READ_VIEWS``
+is on (see ``utils/async_views.py``). Bodies match the views in ``views.py``.
+"""
+from django.db.models import Count, Q
+
+from utils.async_views import async_read
+
+from .models import GalleryCategory, GalleryEvent, GalleryImage, GalleryVideo
+from .serializers import GalleryCategorySerializer, GalleryEventListSerializer
+
+
+@async_read('media_stuff', cached=True)
+async def get_all_categories(request):
+    """Get all gallery categories"""
+    categories = GalleryCategory.objects.annotate(
+        published_event_count=Count('events', filter=Q(events__status='published'))
+    ).order_by('display_order')
+
+    categories_data = []
+    async for category in categories:
+        category_data = GalleryCategorySerializer(category).data
+        category_data['event_count'] = category.published_event_count
+        categories_data.append(category_data)
+
+    return {
+        'success': True,
+        'count': len(categories_data),
+        'data': categories_data
+    }
+
+
+async def _listing(request, **filters):
+    events = GalleryEvent.objects.for_listing().filter(status='published', **filters).order_by('-event_date')[:12]
+    serializer = GalleryEventListSerializer(
+        [event async for event in events], many=True, context={'request': request}
+    )
+    return {
+        'success': True,
+        'count': len(serializer.data),
+        'data': serializer.data
+    }
+
+
+@async_read('media_stuff')
+async def get_photo_galleries(request):
+    """Get only photo galleries (events with images)"""
+    return await _listing(request, image_count__gt=0)
+
+
+@async_read('media_stuff')
+async def get_video_galleries(request):
+    """Get only video galleries (events with videos)"""
+    return await _listing(request, video_count__gt=0)
+
+
+@async_read('media_stuff', cached=True)
+async def get_gallery_years(request):
+    """Get distinct years from gallery events"""
+    years = GalleryEvent.objects.filter(
+        status='published'
+    ).dates('event_date', 'year').order_by('-event_date')
+
+    years_list = [{'value': year.year, 'label': str(year.year)} async for year in years]
+
+    return {
+        'success': True,
+        'count': len(years_list),
+        'data': years_list
+    }
+
+
+@async_read('media_stuff', cached=True)
+async def get_gallery_stats(request):
+    """Get gallery statistics"""
+    published = GalleryEvent.objects.filter(status='published')
+    total_views = (await published.aaggregate(total=Count('views_count')))['total'] or 0
+
+    return {
+        'success': True,
+        'stats': {
+            'total_events': await published.acount(),
+            'total_images': await GalleryImage.objects.acount(),
+            'total_videos': await GalleryVideo.objects.acount(),
+            'total_views': total_views,
+        }
+    }
@@ -0,0 +1,180 @@
+"""
+Bulk upload of gallery images.
+
+An editor sends one request with many ``images`` files, or one ``archive`` ZIP.
+The upload runs in two stages:
+
+1. Every file is streamed into storage in chunks, one at a time (ZIP members
+   are decompressed straight into the target file, never into memory).
+2. The stored files are processed on a thread pool: each is decoded to reject
+   non-images, turned upright according to its EXIF orientation and rendered
+   into its responsive renditions (Pillow releases the GIL while it works).
+
+The ``GalleryImage`` rows are then inserted with one ``bulk_create``, numbered
+after the event's existing images, the event's cover and counters are
+recomputed once and the ``media_stuff`` cache namespace is invalidated.
+"""
+import io
+import logging
+import os
+import posixpath
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models import Max
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from utils import cache
+
+from . import derivatives
+from .models import GalleryImage, refresh_events
+
+logger = logging.getLogger(__name__)
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.webp', '.gif'}
+MAX_IMAGE_SIZE = 10 * 1024 * 1024  # same limit as GalleryImageForm
+EXIF_ORIENTATION = 0x0112
+SAVE_OPTIONS = {'JPEG': {'quality': 90, 'optimize': True}, 'WEBP': {'quality': 90}}
+
+
+class BulkUploadError(ValueError):
+    pass
+
+
+def check_file_count(count):
+    """The same limit Django applies to the files of one multipart request."""
+    limit = settings.DATA_UPLOAD_MAX_NUMBER_FILES
+    if limit is not None and count > limit:
+        raise BulkUploadError(f"An upload can hold at most {limit} images")
+
+
+def _is_image_name(name):
+    return os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS
+
+
+def archive_members(archive):
+    """The images of a ZIP upload as streaming ``File`` objects, sorted by path."""
+    try:
+        zf = zipfile.ZipFile(archive)
+    except zipfile.BadZipFile:
+        raise BulkUploadError("The archive is not a valid ZIP file")
+
+    infos = [
+        info for info in zf.infolist()
+        if not info.is_dir()
+        and not info.filename.startswith('__MACOSX/')
+        and not posixpath.basename(info.filename).startswith('.')
+        and _is_image_name(info.filename)
+    ]
+    check_file_count(len(infos))
+
+    for info in sorted(infos, key=lambda info: info.filename):
+        member = File(zf.open(info), name=posixpath.basename(info.filename))
+        member.size = info.file_size  # from the directory, so the stream is read only once
+        yield member
+
+
+def _store(event, upload):
+    """Stream one upload into its final place; returns the stored name."""
+    if upload.size > MAX_IMAGE_SIZE:
+        raise BulkUploadError("Image size should be less than 10MB")
+    if not _is_image_name(upload.name):
+        raise BulkUploadError("Unsupported file type")
+
+    field = GalleryImage._meta.get_field('image')
+    name = field.generate_filename(GalleryImage(event=event), os.path.basename(upload.name))
+    return field.storage.save(name, upload, max_length=field.max_length)
+
+
+def _process(event, name):
+    """Validate and straighten one stored image and render its renditions."""
+    field_file = GalleryImage(event=event, image=name).image
+    storage = field_file.storage
+
+    with storage.open(name, 'rb') as fh, Image.open(fh) as source:
+        source.load()  # decode fully: truncated or bogus files fail here
+        orientation = source.getexif().get(EXIF_ORIENTATION, 1)
+        if orientation != 1:
+            upright = ImageOps.exif_transpose(source)
+            buffer = io.BytesIO()
+            upright.save(buffer, source.format, **SAVE_OPTIONS.get(source.format, {}))
+        else:
+            buffer = None
+
+    if buffer is not None:
+        storage.delete(name)
+        stored_name = storage.save(name, ContentFile(buffer.getvalue()))
+        if stored_name != name:
+            raise BulkUploadError("Storage renamed the straightened image")
+
+    return derivatives.render(field_file)
+
+
+def bulk_upload(event, uploads):
+    """
+    Store, process and insert ``uploads`` (Django ``File`` objects) as images of
+    ``event``. Returns ``(created GalleryImage rows, [{'file', 'error'}])``.
+
+    A file that fails for any reason is reported in the errors and the rest go
+    on; if the upload as a whole fails, every file it stored is removed again.
+    """
+    errors = []
+    stored = []
+    storage = GalleryImage._meta.get_field('image').storage
+
+    def discard(name):
+        derivatives.delete_renditions(name, storage)
+        storage.delete(name)
+
+    try:
+        for upload in uploads:
+            try:
+                stored.append((upload.name, _store(event, upload)))
+            except BulkUploadError as e:
+                errors.append({'file': upload.name, 'error': str(e)})
+            except zipfile.BadZipFile:
+                errors.append({'file': upload.name, 'error': "Corrupt archive member"})
+            except Exception:
+                logger.warning("Could not store gallery upload %s", upload.name, exc_info=True)
+                errors.append({'file': upload.name, 'error': "Could not store the file"})
+
+        workers = getattr(settings, 'GALLERY_UPLOAD_WORKERS', 4)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='nksc-gallery-upload') as pool:
+            futures = [(filename, name, pool.submit(_process, event, name)) for filename, name in stored]
+
+        processed = []
+        for filename, name, future in futures:
+            try:
+                processed.append((name, future.result()))
+            except (BulkUploadError, UnidentifiedImageError, Image.DecompressionBombError, OSError) as e:
+                logger.info("Rejected gallery upload %s: %s", filename, e)
+                errors.append({'file': filename, 'error': "Not a valid image"})
+                discard(name)
+            except Exception:
+                # Pillow raises all sorts for bad headers (ValueError, SyntaxError, ...)
+                logger.warning("Could not process gallery upload %s", filename, exc_info=True)
+                errors.append({'file': filename, 'error': "Not a valid image"})
+                discard(name)
+
+        with transaction.atomic():
+            last_order = event.images.aggregate(last=Max('display_order'))['last']
+            first_order = 0 if last_order is None else last_order + 1
+            GalleryImage.objects.bulk_create([
+                GalleryImage(event=event, image=name, display_order=first_order + offset, renditions=renditions)
+                for offset, (name, renditions) in enumerate(processed)
+            ])
+            # bulk_create skips save(), so refresh the denormalized cover and counts once
+            refresh_events(event.pk)
+            # ...and sends no post_save, so retire the cached gallery responses here
+            cache.namespace('media_stuff').invalidate_on_commit()
+    except BaseException:
+        for _, name in stored:
+            discard(name)
+        raise
+
+    created = list(event.images.filter(image__in=[name for name, _ in processed]))
+    return created, errors
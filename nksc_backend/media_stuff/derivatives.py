@@ -0,0 +1,119 @@
+"""
+Responsive renditions of gallery images.
+
+Each uploaded image is resized once, on the background pool, into a few widths
+in WebP and JPEG, stored next to the original:
+``gallery/events/<id>/images/<uuid>.jpg`` gets ``<uuid>_thumbnail.webp``,
+``<uuid>_medium.jpg`` and so on. Widths the original cannot fill are skipped
+(images are never upscaled). The widths actually written are recorded in
+``GalleryImage.renditions``, so ``srcset`` only ever lists files that exist.
+"""
+import io
+import os
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+from utils import cache
+
+# name -> maximum width in pixels, smallest first
+RENDITIONS = {
+    'thumbnail': 320,
+    'medium': 800,
+    'large': 1600,
+}
+
+FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+EXTENSIONS = {'webp': 'webp', 'jpeg': 'jpg'}
+
+
+def rendition_name(original_name, rendition, fmt):
+    root, _ = os.path.splitext(original_name)
+    return f"{root}_{rendition}.{EXTENSIONS[fmt]}"
+
+
+def _encode(image, fmt):
+    pil_format, options = FORMATS[fmt]
+    buffer = io.BytesIO()
+    image.save(buffer, pil_format, **options)
+    return buffer.getvalue()
+
+
+def _resized(original, width):
+    if original.width <= width:
+        return original
+    height = max(1, round(original.height * width / original.width))
+    return original.resize((width, height), Image.LANCZOS)
+
+
+def render(image_field):
+    """
+    Write every rendition of one image file. Returns ``{rendition: [width, height]}``
+    for the renditions written.
+    """
+    storage = image_field.storage
+    with image_field.open('rb') as fh, Image.open(fh) as source:
+        original = ImageOps.exif_transpose(source).convert('RGB')
+
+    renditions = {}
+    previous_width = 0
+    for rendition, max_width in RENDITIONS.items():
+        if previous_width and original.width <= previous_width:
+            break  # would only repeat the previous rendition at the original size
+        previous_width = max_width
+        image = _resized(original, max_width)
+        for fmt in FORMATS:
+            name = rendition_name(image_field.name, rendition, fmt)
+            if storage.exists(name):
+                storage.delete(name)
+            storage.save(name, ContentFile(_encode(image, fmt)))
+        renditions[rendition] = [image.width, image.height]
+    return renditions
+
+
+def delete_renditions(original_name, storage):
+    for rendition in RENDITIONS:
+        for fmt in FORMATS:
+            name = rendition_name(original_name, rendition, fmt)
+            if storage.exists(name):
+                storage.delete(name)
+
+
+def generate(image_id):
+    """Background job: render one GalleryImage and record its renditions."""
+    from .models import GalleryImage
+
+    gallery_image = GalleryImage.objects.filter(pk=image_id).first()
+    if gallery_image is None or not gallery_image.image:
+        return None
+
+    renditions = render(gallery_image.image)
+    # Only if the file wasn't replaced meanwhile; update() keeps save() side effects out
+    if GalleryImage.objects.filter(pk=image_id, image=gallery_image.image.name).update(renditions=renditions):
+        # No post_save either: retire cached responses still listing the image without its srcset
+        cache.namespace('media_stuff').invalidate_on_commit()
+    return renditions
+
+
+# ─────────────────────────────────────────────────────────────
+# URLS
+# ─────────────────────────────────────────────────────────────
+
+def rendition_url(gallery_image, rendition, fmt='webp'):
+    """Storage URL of one rendition, or None while it has not been generated."""
+    if rendition not in (gallery_image.renditions or {}):
+        return None
+    return gallery_image.image.storage.url(rendition_name(gallery_image.image.name, rendition, fmt))
+
+
+def srcset(gallery_image, fmt='webp', build_url=None):
+    """``srcset`` value (``url 320w, url 800w``) of the generated renditions, or None."""
+    candidates = []
+    renditions = sorted((gallery_image.renditions or {}).items(), key=lambda item: item[1][0])
+    for rendition, (width, _) in renditions:
+        url = rendition_url(gallery_image, rendition, fmt)
+        candidates.append(f"{build_url(url) if build_url else url} {width}w")
+    return ', '.join(candidates) or None
@@ -0,0 +1,30 @@
+# media_stuff/management/commands/generate_gallery_renditions.py
+from django.core.management.base import BaseCommand
+
+from media_stuff import derivatives
+from media_stuff.models import GalleryImage
+
+
+class Command(BaseCommand):
+    help = 'Generate thumbnail/medium/large WebP and JPEG renditions of gallery images'
+
+    def add_arguments(self, parser):
+        parser.add_argument('image_ids', nargs='*', type=int, help='Only render these images')
+        parser.add_argument('--all', action='store_true', help='Also re-render images that already have renditions')
+
+    def handle(self, *args, **options):
+        images = GalleryImage.objects.exclude(image='')
+        if options['image_ids']:
+            images = images.filter(id__in=options['image_ids'])
+        elif not options['all']:
+            images = images.filter(renditions={})
+
+        rendered = 0
+        for image_id in images.values_list('id', flat=True).iterator():
+            try:
+                derivatives.generate(image_id)
+                rendered += 1
+            except Exception as e:
+                self.stderr.write(f'Image {image_id}: {e}')
+
+        self.stdout.write(self.style.SUCCESS(f'Rendered {rendered} gallery images'))
@@ -0,0 +1,19 @@
+# media_stuff/management/commands/recompute_gallery_counters.py
+from django.core.management.base import BaseCommand
+
+from media_stuff.models import GalleryEvent
+
+
+class Command(BaseCommand):
+    help = 'Recompute the denormalized cover image and image/video counts of gallery events'
+
+    def add_arguments(self, parser):
+        parser.add_argument('event_ids', nargs='*', type=int, help='Only repair these events')
+
+    def handle(self, *args, **options):
+        events = GalleryEvent.objects.all()
+        if options['event_ids']:
+            events = events.filter(id__in=options['event_ids'])
+
+        updated = events.refresh_media_counters()
+        self.stdout.write(self.style.SUCCESS(f'Recomputed media counters of {updated} events'))
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.11 on 2026-10-17 11:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('media_stuff', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='galleryevent',
+            index=models.Index(fields=['status', 'event_date', 'created_at'], name='media_stuff_status_164afa_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.11 on 2026-10-17 11:35
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+from media_stuff.models import media_counter_values
+
+
+def fill_media_counters(apps, schema_editor):
+    GalleryEvent = apps.get_model('media_stuff', 'GalleryEvent')
+    GalleryImage = apps.get_model('media_stuff', 'GalleryImage')
+    GalleryVideo = apps.get_model('media_stuff', 'GalleryVideo')
+    GalleryEvent.objects.update(**media_counter_values(GalleryImage, GalleryVideo))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('media_stuff', '0002_listing_order_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='galleryevent',
+            name='cover_image',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='media_stuff.galleryimage'),
+        ),
+        migrations.AddField(
+            model_name='galleryevent',
+            name='image_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='galleryevent',
+            name='video_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_media_counters, migrations.RunPython.noop),
+    ]
@@ -1,9 +1,14 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Case, Count, OuterRef, Q, Subquery, When
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from django.utils.text import slugify
 import uuid
 import os
 
+from utils import view_counter
+from utils.models import LoadedValuesMixin, previous_values
+
 
 def gallery_image_path(instance, filename):
     """Generate path for gallery images"""
@@ -43,9 +48,53 @@ class GalleryCategory(models.Model):
 
     @property
     def total_events(self):
+        if getattr(self, 'published_event_count', None) is not None:
+            return self.published_event_count
         return self.events.filter(status='published').count()
 
 
+def _count_subquery(queryset, field):
+    """COUNT(*) of ``queryset`` grouped by ``field``, as a scalar subquery (0 when empty)."""
+    counts = queryset.order_by().values(field).annotate(total=Count('pk')).values('total')
+    return Coalesce(Subquery(counts, output_field=models.IntegerField()), 0)
+
+
+def media_counter_values(image_model, video_model):
+    """
+    ``update()`` kwargs that recompute the denormalized cover/count columns of
+    events from their images and videos. The model arguments let data
+    migrations pass their historical models.
+    """
+    images = image_model.objects.filter(event=OuterRef('pk'))
+    return {
+        'image_count': _count_subquery(images, 'event'),
+        'video_count': _count_subquery(video_model.objects.filter(event=OuterRef('pk')), 'event'),
+        'cover_image': Subquery(images.order_by('-is_cover', 'display_order', 'created_at', 'pk').values('pk')[:1]),
+    }
+
+
+class GalleryEventQuerySet(models.QuerySet):
+    def for_listing(self):
+        """
+        Everything GalleryEventListSerializer shows, in a single query. Counts
+        and the cover are denormalized columns; only events without images
+        look up their first video for a thumbnail.
+        """
+        first_video = GalleryVideo.objects.filter(event=OuterRef('pk')).order_by('display_order', 'created_at')
+        needs_video_cover = Q(cover_image__isnull=True, video_count__gt=0)
+        return self.select_related('category', 'cover_image').annotate(
+            first_video_url=Case(When(needs_video_cover, then=Subquery(first_video.values('video_url')[:1]))),
+            first_video_platform=Case(When(needs_video_cover, then=Subquery(first_video.values('platform')[:1]))),
+            category_event_count=_count_subquery(
+                GalleryEvent.objects.filter(category=OuterRef('category'), status='published'), 'category'
+            ),
+        )
+
+    def refresh_media_counters(self):
+        """Recompute cover_image, image_count and video_count in one UPDATE."""
+        return self.update(**media_counter_values(GalleryImage, GalleryVideo))
+
+
 class GalleryEvent(models.Model):
     STATUS_CHOICES = [
         ('draft', 'Draft - Not visible on website'),
@@ -100,15 +149,34 @@ class GalleryEvent(models.Model):
     # Statistics
     views_count = models.PositiveIntegerField(default=0, editable=False)
 
+    # Denormalized from images/videos on save and delete (see refresh_events)
+    # (repair with `manage.py recompute_gallery_counters`)
+    cover_image = models.ForeignKey(
+        'GalleryImage',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name='+'
+    )
+    image_count = models.PositiveIntegerField(default=0, editable=False)
+    video_count = models.PositiveIntegerField(default=0, editable=False)
+
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True, editable=False)
     updated_at = models.DateTimeField(auto_now=True, editable=False)
     published_at = models.DateTimeField(null=True, blank=True, editable=False)
 
+    objects = GalleryEventQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Gallery Event"
         verbose_name_plural = "Gallery Events"
         ordering = ['-event_date', '-created_at']
+        indexes = [
+            # Keyset pagination walks this index (see utils/pagination.py)
+            models.Index(fields=['status', 'event_date', 'created_at']),
+        ]
 
     def save(self, *args, **kwargs):
         # Generate slug if not exists
@@ -145,27 +213,32 @@ class GalleryEvent(models.Model):
 
     @property
     def total_images(self):
-        return self.images.count()
+        return self.image_count
 
     @property
     def total_videos(self):
-        return self.videos.count()
-
-    @property
-    def cover_image(self):
-        """Get the first image marked as cover, or first image"""
-        cover = self.images.filter(is_cover=True).first()
-        if cover:
-            return cover
-        return self.images.first()
+        return self.video_count
 
     def increment_views(self):
+        # Buffered: written in batches by utils.view_counter, not on this request
+        view_counter.record(self)
         self.views_count += 1
-        self.save(update_fields=['views_count'])
 
 
-class GalleryImage(models.Model):
+def _previous_event_id(media):
+    """The event an image/video belonged to before this save (None for new rows), as loaded."""
+    previous = previous_values(media)
+    return previous['event_id'] if previous else None
+
+
+def refresh_events(*event_ids):
+    """Recompute the denormalized cover and counts of these events."""
+    GalleryEvent.objects.filter(pk__in={pk for pk in event_ids if pk}).refresh_media_counters()
+
+
+class GalleryImage(LoadedValuesMixin, models.Model):
     """Model for gallery images - Simple upload process"""
+    TRACKED_FIELDS = ('event_id', 'image')
 
     event = models.ForeignKey(
         GalleryEvent,
@@ -199,6 +272,9 @@ class GalleryImage(models.Model):
         help_text="Check to set as cover image for the event"
     )
 
+    # Resized copies written by media_stuff.derivatives: {rendition: [width, height]}
+    renditions = models.JSONField(default=dict, blank=True, editable=False)
+
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True, editable=False)
 
@@ -213,18 +289,23 @@ class GalleryImage(models.Model):
         return f"Image for {self.event.title}"
 
     def save(self, *args, **kwargs):
-        # If this image is set as cover, unset other covers
-        if self.is_cover:
-            GalleryImage.objects.filter(
-                event=self.event,
-                is_cover=True
-            ).exclude(id=self.id).update(is_cover=False)
+        with transaction.atomic():
+            previous_event_id = _previous_event_id(self)
 
-        super().save(*args, **kwargs)
+            # If this image is set as cover, unset other covers
+            if self.is_cover:
+                GalleryImage.objects.filter(
+                    event=self.event,
+                    is_cover=True
+                ).exclude(id=self.id).update(is_cover=False)
 
+            super().save(*args, **kwargs)
+            refresh_events(self.event_id, previous_event_id)
 
-class GalleryVideo(models.Model):
+
+class GalleryVideo(LoadedValuesMixin, models.Model):
     """Simple video model with just URL and caption"""
+    TRACKED_FIELDS = ('event_id',)
 
     VIDEO_PLATFORMS = [
         ('youtube', 'YouTube'),
@@ -290,7 +371,10 @@ class GalleryVideo(models.Model):
         else:
             self.platform = 'other'
 
-        super().save(*args, **kwargs)
+        with transaction.atomic():
+            previous_event_id = _previous_event_id(self)
+            super().save(*args, **kwargs)
+            refresh_events(self.event_id, previous_event_id)
 
     @property
     def video_id(self):
@@ -1,8 +1,12 @@
 from rest_framework import serializers
+
+from monitoring.serializers import TimedModelSerializer
+
+from . import derivatives
 from .models import GalleryCategory, GalleryEvent, GalleryImage, GalleryVideo
 
 
-class GalleryCategorySerializer(serializers.ModelSerializer):
+class GalleryCategorySerializer(TimedModelSerializer):
     name_display = serializers.CharField(source='get_name_display', read_only=True)
     total_events = serializers.IntegerField(read_only=True)
 
@@ -11,12 +15,27 @@ class GalleryCategorySerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'slug', 'description', 'name_display', 'total_events']
 
 
-class GalleryImageSerializer(serializers.ModelSerializer):
+def _rendition_url(request, image, rendition, fmt='jpeg'):
+    """Absolute URL of a generated rendition, falling back to the original file."""
+    url = derivatives.rendition_url(image, rendition, fmt) or image.image.url
+    return request.build_absolute_uri(url)
+
+
+def _srcsets(request, image):
+    """``{format: srcset}`` for <picture>/<img srcset>, or None until the renditions exist."""
+    if not image.renditions:
+        return None
+    return {fmt: derivatives.srcset(image, fmt, request.build_absolute_uri) for fmt in derivatives.FORMATS}
+
+
+class GalleryImageSerializer(TimedModelSerializer):
     image_url = serializers.SerializerMethodField()
+    thumbnail_url = serializers.SerializerMethodField()
+    srcset = serializers.SerializerMethodField()
 
     class Meta:
         model = GalleryImage
-        fields = ['id', 'image_url', 'caption', 'display_order', 'is_cover', 'created_at']
+        fields = ['id', 'image_url', 'thumbnail_url', 'srcset', 'caption', 'display_order', 'is_cover', 'created_at']
 
     def get_image_url(self, obj):
         request = self.context.get('request')
@@ -27,8 +46,20 @@ class GalleryImageSerializer(serializers.ModelSerializer):
                 return None
         return None
 
+    def get_thumbnail_url(self, obj):
+        request = self.context.get('request')
+        if obj.image and request:
+            return _rendition_url(request, obj, 'thumbnail')
+        return None
 
-class GalleryVideoSerializer(serializers.ModelSerializer):
+    def get_srcset(self, obj):
+        request = self.context.get('request')
+        if obj.image and request:
+            return _srcsets(request, obj)
+        return None
+
+
+class GalleryVideoSerializer(TimedModelSerializer):
     embed_url = serializers.CharField(read_only=True)
     thumbnail_url = serializers.CharField(read_only=True)
 
@@ -38,9 +69,10 @@ class GalleryVideoSerializer(serializers.ModelSerializer):
                   'created_at']
 
 
-class GalleryEventListSerializer(serializers.ModelSerializer):
+class GalleryEventListSerializer(TimedModelSerializer):
     category_detail = GalleryCategorySerializer(source='category', read_only=True)
     cover_image = serializers.SerializerMethodField()
+    cover_srcset = serializers.SerializerMethodField()
     year = serializers.IntegerField(source='event_date.year', read_only=True)
     total_images = serializers.IntegerField(read_only=True)
     total_videos = serializers.IntegerField(read_only=True)
@@ -51,28 +83,47 @@ class GalleryEventListSerializer(serializers.ModelSerializer):
             'id', 'title', 'slug', 'short_description',
             'event_date', 'location', 'year',
             'category', 'category_detail', 'is_featured',
-            'total_images', 'total_videos', 'cover_image',
+            'total_images', 'total_videos', 'cover_image', 'cover_srcset',
             'views_count'
         ]
 
+    def to_representation(self, instance):
+        if instance.category is not None and hasattr(instance, 'category_event_count'):
+            # Counted by GalleryEvent.objects.for_listing(); saves a COUNT per row
+            instance.category.published_event_count = instance.category_event_count
+        return super().to_representation(instance)
+
     def get_cover_image(self, obj):
         request = self.context.get('request')
         cover = obj.cover_image
         if cover and request:
             try:
-                return request.build_absolute_uri(cover.image.url)
+                # Listing cards are small: the medium rendition once it exists
+                return _rendition_url(request, cover, 'medium')
             except:
                 pass
 
         # Try to get first video thumbnail if no images
-        first_video = obj.videos.first()
+        if hasattr(obj, 'first_video_url'):
+            # Annotated by GalleryEvent.objects.for_listing()
+            first_video = None
+            if obj.first_video_url:
+                first_video = GalleryVideo(video_url=obj.first_video_url, platform=obj.first_video_platform)
+        else:
+            first_video = obj.videos.first()
         if first_video and first_video.thumbnail_url:
             return first_video.thumbnail_url
 
         return None
 
+    def get_cover_srcset(self, obj):
+        request = self.context.get('request')
+        if obj.cover_image and request:
+            return _srcsets(request, obj.cover_image)
+        return None
+
 
-class GalleryEventSerializer(serializers.ModelSerializer):
+class GalleryEventSerializer(TimedModelSerializer):
     category_detail = GalleryCategorySerializer(source='category', read_only=True)
     images = GalleryImageSerializer(many=True, read_only=True)
     videos = GalleryVideoSerializer(many=True, read_only=True)
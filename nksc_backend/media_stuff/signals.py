@@ -0,0 +1,58 @@
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from utils import background
+from utils.models import previous_values
+
+from . import derivatives
+from .models import GalleryImage, GalleryVideo, refresh_events
+
+
+@receiver(post_delete, sender=GalleryImage)
+@receiver(post_delete, sender=GalleryVideo)
+def refresh_event_media_counters(sender, instance, **kwargs):
+    # Sent inside the deletion's transaction, for single and bulk deletes alike
+    refresh_events(instance.event_id)
+
+
+@receiver(post_save, sender=GalleryImage)
+@receiver(post_save, sender=GalleryVideo)
+def remember_saved_media(sender, instance, **kwargs):
+    instance.remember_loaded_values()
+
+
+# ─────────────────────────────────────────────────────────────
+# IMAGE RENDITIONS
+# ─────────────────────────────────────────────────────────────
+
+@receiver(pre_save, sender=GalleryImage)
+def remember_gallery_image_file(sender, instance, **kwargs):
+    previous = previous_values(instance)
+    previous_name = previous['image'] if previous else None
+
+    instance._stale_image_name = previous_name if previous_name and previous_name != instance.image.name else ''
+    instance._image_changed = (
+        previous_name is None or bool(instance._stale_image_name) or not instance.image._committed
+    )
+
+
+@receiver(post_save, sender=GalleryImage)
+def render_gallery_image(sender, instance, created, **kwargs):
+    if not getattr(instance, '_image_changed', created):
+        return
+
+    GalleryImage.objects.filter(pk=instance.pk).update(renditions={})
+    instance.renditions = {}
+    stale_name = getattr(instance, '_stale_image_name', '')
+    if stale_name:
+        storage = instance.image.storage
+        transaction.on_commit(lambda: derivatives.delete_renditions(stale_name, storage))
+    background.submit_on_commit(derivatives.generate, instance.pk)
+
+
+@receiver(post_delete, sender=GalleryImage)
+def delete_gallery_image_renditions(sender, instance, **kwargs):
+    if instance.image:
+        name, storage = instance.image.name, instance.image.storage
+        transaction.on_commit(lambda: derivatives.delete_renditions(name, storage))
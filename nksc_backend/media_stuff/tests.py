@@ -1,3 +1,342 @@
-from django.test import TestCase
+import datetime
+import io
+import os
+import shutil
+import tempfile
+import zipfile
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from PIL import Image
+from rest_framework.test import APIClient
+
+from utils.cache import namespace
+
+from . import bulk_upload, derivatives
+from .models import GalleryCategory, GalleryEvent, GalleryImage, GalleryVideo
+
+
+class GalleryListingQueryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seminar = GalleryCategory.objects.create(name='seminar')
+        for number in range(1, 7):
+            event = GalleryEvent.objects.create(
+                title=f"Event {number}",
+                description="Description",
+                short_description="Short",
+                event_date=datetime.date(2024, 1, number),
+                location="NKSC Auditorium",
+                category=seminar,
+                status='published',
+            )
+            for order in range(number % 3):
+                GalleryImage.objects.create(
+                    event=event, image=f"gallery/events/{event.id}/images/{order}.jpg",
+                    display_order=order, is_cover=(order == 1),
+                )
+            if number % 2:
+                GalleryVideo.objects.create(
+                    event=event, title="Talk", video_url=f"https://youtu.be/video{number}",
+                )
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_all_events_in_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/gallery/all/')
+
+        self.assertEqual(response.status_code, 200)
+        events = {item['title']: item for item in response.data['data']}
+        self.assertEqual(len(events), 6)
+        self.assertEqual(events["Event 5"]['total_images'], 2)
+        self.assertEqual(events["Event 5"]['total_videos'], 1)
+        self.assertTrue(events["Event 5"]['cover_image'].endswith('/images/1.jpg'))
+        self.assertTrue(events["Event 4"]['cover_image'].endswith('/images/0.jpg'))
+        self.assertEqual(events["Event 3"]['cover_image'], "https://img.youtube.com/vi/video3/hqdefault.jpg")
+        self.assertIsNone(events["Event 6"]['cover_image'])
+        self.assertEqual(events["Event 6"]['category_detail']['total_events'], 6)
+
+    def test_photo_video_and_search_listings_in_one_query(self):
+        for url, params, expected in (
+            ('/api/gallery/photos/', {}, 4),
+            ('/api/gallery/videos/', {}, 3),
+            ('/api/gallery/search/', {'q': 'event'}, 6),
+        ):
+            with self.assertNumQueries(1):
+                response = self.client.get(url, params)
+            self.assertEqual(response.data['count'], expected)
+
+    def test_counters_follow_saves_and_deletes(self):
+        event = GalleryEvent.objects.get(title="Event 5")
+        self.assertEqual((event.image_count, event.video_count), (2, 1))
+        self.assertTrue(event.cover_image.is_cover)
+
+        event.cover_image.delete()
+        event.refresh_from_db()
+        self.assertEqual(event.image_count, 1)
+        self.assertEqual(event.cover_image.display_order, 0)
+
+        GalleryImage.objects.filter(event=event).delete()
+        event.refresh_from_db()
+        self.assertEqual((event.image_count, event.cover_image), (0, None))
+
+        other = GalleryEvent.objects.get(title="Event 6")
+        event.videos.update(event=other)  # bypasses save(), so the counters drift
+        call_command('recompute_gallery_counters', stdout=io.StringIO())
+        event.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual((event.video_count, other.video_count), (0, 1))
+
+
+class GalleryImageRenditionTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        # Renditions are rendered by a background job; run it inside the test's transaction
+        settings_override = override_settings(MEDIA_ROOT=self.media_root, BACKGROUND_TASKS_ASYNC=False)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.event = GalleryEvent.objects.create(
+            title="Event", description="Description", short_description="Short",
+            event_date=datetime.date(2024, 1, 1), location="NKSC", status='published',
+        )
+
+    def _upload(self, width, height):
+        buffer = io.BytesIO()
+        Image.new('RGB', (width, height), 'orange').save(buffer, 'PNG')
+        with self.captureOnCommitCallbacks(execute=True):
+            image = GalleryImage.objects.create(
+                event=self.event, image=SimpleUploadedFile("photo.png", buffer.getvalue(), 'image/png'),
+            )
+        image.refresh_from_db()
+        return image
+
+    def test_upload_renders_renditions_without_upscaling(self):
+        image = self._upload(1000, 500)
+
+        self.assertEqual(image.renditions, {'thumbnail': [320, 160], 'medium': [800, 400], 'large': [1000, 500]})
+        root = os.path.splitext(image.image.path)[0]
+        for name in ('thumbnail.webp', 'thumbnail.jpg', 'large.webp', 'large.jpg'):
+            self.assertTrue(os.path.exists(f"{root}_{name}"), name)
+
+        response = self.client.get(f'/api/gallery/event/{self.event.slug}/images/')
+        item = response.data['data'][0]
+        self.assertTrue(item['thumbnail_url'].endswith('_thumbnail.jpg'))
+        self.assertEqual(
+            [candidate.split()[1] for candidate in item['srcset']['webp'].split(', ')],
+            ['320w', '800w', '1000w']
+        )
+
+    def test_delete_removes_renditions(self):
+        image = self._upload(400, 300)
+        self.assertEqual(image.renditions, {'thumbnail': [320, 240], 'medium': [400, 300]})
+
+        thumbnail = os.path.splitext(image.image.path)[0] + '_thumbnail.webp'
+        with self.captureOnCommitCallbacks(execute=True):
+            image.delete()
+        self.assertFalse(os.path.exists(thumbnail))
+
+    def test_saves_do_not_read_the_row_again(self):
+        image = self._upload(400, 300)
+        image = GalleryImage.objects.get(pk=image.pk)
+        other = GalleryEvent.objects.create(
+            title="Other", description="Description", short_description="Short",
+            event_date=datetime.date(2024, 2, 1), location="NKSC", status='published',
+        )
+
+        image.caption = "Caption"
+        image.event = other
+        with CaptureQueriesContext(connection) as queries:
+            image.save()
+        rereads = [query['sql'] for query in queries if query['sql'].startswith('SELECT')]
+        self.assertEqual(rereads, [])
+
+        # Both events' counters followed the move, and the file was not re-rendered
+        self.event.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual((self.event.image_count, other.image_count), (0, 1))
+        self.assertFalse(image._image_changed)
+
+        # The next save of the same instance starts from what was just saved
+        image.event = self.event
+        image.save()
+        self.event.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual((self.event.image_count, other.image_count), (1, 0))
+
+    def test_rendering_invalidates_cached_responses(self):
+        image = self._upload(400, 300)
+        version = namespace('media_stuff').version()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            derivatives.generate(image.pk)
+
+        self.assertGreater(namespace('media_stuff').version(), version)
+
+
+class GalleryBulkUploadTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.event = GalleryEvent.objects.create(
+            title="Event", description="Description", short_description="Short",
+            event_date=datetime.date(2024, 1, 1), location="NKSC", status='published',
+        )
+        self.url = f'/api/gallery/admin/event/{self.event.slug}/images/bulk/'
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user('editor', is_staff=True))
+
+    @staticmethod
+    def _jpeg(width, height, orientation=1):
+        exif = Image.Exif()
+        exif[0x0112] = orientation
+        buffer = io.BytesIO()
+        Image.new('RGB', (width, height), 'green').save(buffer, 'JPEG', exif=exif)
+        return buffer.getvalue()
+
+    def test_zip_upload(self):
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, 'w') as zf:
+            zf.writestr('b/second.jpg', self._jpeg(400, 200, orientation=6))  # taken sideways
+            zf.writestr('a/first.jpg', self._jpeg(400, 200))
+            zf.writestr('broken.jpg', b'not an image')
+            zf.writestr('notes.txt', b'skipped')
+            zf.writestr('__MACOSX/a/._first.jpg', b'skipped')
+
+        response = self.client.post(self.url, {
+            'archive': SimpleUploadedFile('photos.zip', archive.getvalue(), 'application/zip'),
+        }, format='multipart')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual([error['file'] for error in response.data['errors']], ['broken.jpg'])
+
+        first, second = self.event.images.all()
+        self.assertEqual((first.display_order, second.display_order), (0, 1))
+        with Image.open(second.image.path) as image:
+            self.assertEqual(image.size, (200, 400))
+        self.assertEqual(second.renditions, {'thumbnail': [200, 400]})
+
+        self.event.refresh_from_db()
+        self.assertEqual((self.event.image_count, self.event.cover_image_id), (2, first.id))
+
+    def test_upload_invalidates_cached_responses(self):
+        cache.clear()
+        listing = f'/api/gallery/event/{self.event.slug}/images/'
+        self.assertEqual(self.client.get(listing).data['data'], [])
+        version = namespace('media_stuff').version()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, {
+                'images': [SimpleUploadedFile('photo.jpg', self._jpeg(100, 100), 'image/jpeg')],
+            }, format='multipart')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertGreater(namespace('media_stuff').version(), version)
+        self.assertEqual(len(self.client.get(listing).data['data']), 1)
+
+    def test_writes_succeed_while_the_cache_is_down(self):
+        down = ConnectionError("Error 111 connecting to nksc-redis:6379")
+        with mock.patch('utils.cache.cache.incr', side_effect=down), \
+                mock.patch('utils.cache.cache.set', side_effect=down), \
+                self.assertLogs('utils.cache', 'ERROR'):
+            with self.captureOnCommitCallbacks(execute=True):
+                GalleryEvent.objects.create(
+                    title="Other", description="Description", short_description="Short",
+                    event_date=datetime.date(2024, 2, 1), location="NKSC",
+                )
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(self.url, {
+                    'images': [SimpleUploadedFile('photo.jpg', self._jpeg(100, 100), 'image/jpeg')],
+                }, format='multipart')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(GalleryEvent.objects.filter(title="Other").exists())
+
+    def test_multi_file_upload_appends(self):
+        GalleryImage.objects.create(event=self.event, image='gallery/existing.jpg', display_order=4)
+
+        response = self.client.post(self.url, {
+            'images': [
+                SimpleUploadedFile(f'photo{number}.jpg', self._jpeg(100, 100), 'image/jpeg')
+                for number in range(3)
+            ],
+        }, format='multipart')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            list(self.event.images.values_list('display_order', flat=True)), [4, 5, 6, 7]
+        )
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.image_count, 4)
+
+    def stored_files(self):
+        return sorted(
+            os.path.relpath(os.path.join(directory, name), self.media_root)
+            for directory, _, names in os.walk(self.media_root) for name in names
+        )
+
+    def test_unexpected_image_errors_are_reported_per_file(self):
+        process = bulk_upload._process
+
+        def failing_process(event, name):
+            with Image.open(os.path.join(self.media_root, name)) as image:
+                if image.size == (50, 50):
+                    raise SyntaxError("broken PNG header")
+            return process(event, name)
+
+        with mock.patch.object(bulk_upload, '_process', failing_process), \
+                self.assertLogs('media_stuff.bulk_upload', 'WARNING'):
+            response = self.client.post(self.url, {
+                'images': [
+                    SimpleUploadedFile('good.jpg', self._jpeg(100, 100), 'image/jpeg'),
+                    SimpleUploadedFile('bad.jpg', self._jpeg(50, 50), 'image/jpeg'),
+                ],
+            }, format='multipart')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['errors'], [{'file': 'bad.jpg', 'error': "Not a valid image"}])
+        # Only the good image and its renditions are left
+        root = os.path.splitext(self.event.images.get().image.name)[0]
+        self.assertTrue(all(name.startswith(root) for name in self.stored_files()))
+
+    def test_failed_upload_leaves_no_files(self):
+        with mock.patch.object(GalleryImage.objects, 'bulk_create', side_effect=MemoryError), \
+                self.assertRaises(MemoryError):
+            bulk_upload.bulk_upload(self.event, [
+                SimpleUploadedFile(f'photo{number}.jpg', self._jpeg(400, 200), 'image/jpeg')
+                for number in range(2)
+            ])
+        self.assertEqual(self.stored_files(), [])
+        self.assertFalse(self.event.images.exists())
+
+    def test_file_limit_follows_django(self):
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, 'w') as zf:
+            for number in range(3):
+                zf.writestr(f'{number}.jpg', self._jpeg(10, 10))
+
+        with self.settings(DATA_UPLOAD_MAX_NUMBER_FILES=2):
+            response = self.client.post(self.url, {
+                'archive': SimpleUploadedFile('photos.zip', archive.getvalue(), 'application/zip'),
+            }, format='multipart')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['message'], "An upload can hold at most 2 images")
+        self.assertEqual(self.stored_files(), [])
+
+    def test_requires_staff(self):
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.post(self.url, {}, format='multipart').status_code, 403)
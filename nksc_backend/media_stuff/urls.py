@@ -1,5 +1,6 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import async_views, views
 
 urlpatterns = [
     # Main endpoints
@@ -19,4 +20,16 @@ urlpatterns = [
     path('years/', views.get_gallery_years, name='gallery-years'),
     path('stats/', views.get_gallery_stats, name='gallery-stats'),
     path('search/', views.search_gallery_events, name='search-gallery-events'),
-]
\ No newline at end of file
+
+    # Admin
+    path('admin/event/<slug:slug>/images/bulk/', views.bulk_upload_gallery_images, name='gallery-bulk-upload'),
+]
+
+if settings.ASYNC_READ_VIEWS:
+    urlpatterns = [
+        path('categories/', async_views.get_all_categories, name='gallery-categories'),
+        path('photos/', async_views.get_photo_galleries, name='photo-galleries'),
+        path('videos/', async_views.get_video_galleries, name='video-galleries'),
+        path('years/', async_views.get_gallery_years, name='gallery-years'),
+        path('stats/', async_views.get_gallery_stats, name='gallery-stats'),
+    ] + urlpatterns
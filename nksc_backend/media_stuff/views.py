@@ -1,11 +1,17 @@
-from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import AllowAny
+from rest_framework.decorators import api_view, permission_classes, parser_classes
+from rest_framework.permissions import AllowAny, IsAdminUser
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
 from rest_framework import status
 from django.shortcuts import get_object_or_404
 from django.db.models import Q, Count
 from django.utils import timezone
 
+from utils.cache import cached_response
+from utils.http_cache import conditional_read
+from utils.pagination import CursorPaginator, InvalidCursor
+
+from .bulk_upload import BulkUploadError, archive_members, bulk_upload, check_file_count
 from .models import GalleryCategory, GalleryEvent, GalleryImage, GalleryVideo
 from .serializers import (
     GalleryCategorySerializer,
@@ -20,6 +26,7 @@ from .serializers import (
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@conditional_read('media_stuff')
 def get_all_gallery_events(request):
     """
     Get all published gallery events
@@ -28,16 +35,20 @@ def get_all_gallery_events(request):
     - year: Filter by year
     - featured: true/false
     - search: Search term
-    - limit: Results limit (default: 20)
+    - limit: Results per page (default: 20, max: 100)
+    - cursor: next_cursor of the previous page, for infinite scroll
     """
     category_slug = request.query_params.get('category', None)
     year = request.query_params.get('year', None)
     featured = request.query_params.get('featured', None)
     search = request.query_params.get('search', None)
-    limit = int(request.query_params.get('limit', 20))
+    try:
+        limit = min(max(int(request.query_params.get('limit', 20)), 1), 100)
+    except ValueError:
+        limit = 20
 
     # Get published events
-    events = GalleryEvent.objects.filter(status='published')
+    events = GalleryEvent.objects.for_listing().filter(status='published')
 
     # Apply filters
     if category_slug:
@@ -61,17 +72,24 @@ def get_all_gallery_events(request):
             Q(location__icontains=search)
         )
 
-    # Order results
-    events = events.order_by('-event_date', '-created_at')
+    # Newest first, one page of `limit` events continuing after `cursor`
+    try:
+        event_page = CursorPaginator(events, ['-event_date', '-created_at'], limit).get_page(
+            request.query_params.get('cursor')
+        )
+    except InvalidCursor as e:
+        return Response({
+            'success': False,
+            'message': str(e)
+        }, status=status.HTTP_400_BAD_REQUEST)
 
-    # Apply limit
-    events = events[:limit]
-
-    serializer = GalleryEventListSerializer(events, many=True, context={'request': request})
+    serializer = GalleryEventListSerializer(event_page.object_list, many=True, context={'request': request})
 
     return Response({
         'success': True,
-        'count': events.count(),
+        'count': len(event_page.object_list),
+        'next_cursor': event_page.next_cursor,
+        'has_next': event_page.has_next,
         'data': serializer.data
     })
 
@@ -80,7 +98,9 @@ def get_all_gallery_events(request):
 @permission_classes([AllowAny])
 def get_gallery_event_by_slug(request, slug):
     """Get detailed gallery event by slug"""
-    event = get_object_or_404(GalleryEvent, slug=slug, status='published')
+    event = get_object_or_404(
+        GalleryEvent.objects.select_related('category', 'cover_image'), slug=slug, status='published'
+    )
 
     # Increment view count
     event.increment_views()
@@ -95,6 +115,7 @@ def get_gallery_event_by_slug(request, slug):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@conditional_read('media_stuff')
 def get_gallery_event_images(request, slug):
     """Get all images for a gallery event"""
     event = get_object_or_404(GalleryEvent, slug=slug, status='published')
@@ -112,6 +133,7 @@ def get_gallery_event_images(request, slug):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@conditional_read('media_stuff')
 def get_gallery_event_videos(request, slug):
     """Get all videos for a gallery event"""
     event = get_object_or_404(GalleryEvent, slug=slug, status='published')
@@ -129,6 +151,8 @@ def get_gallery_event_videos(request, slug):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@conditional_read('media_stuff')
+@cached_response('media_stuff')
 def get_all_categories(request):
     """Get all gallery categories"""
     categories = GalleryCategory.objects.all().order_by('display_order')
@@ -149,6 +173,8 @@ def get_all_categories(request):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@conditional_read('media_stuff')
+@cached_response('media_stuff')
 def get_gallery_years(request):
     """Get distinct years from gallery events"""
     years = GalleryEvent.objects.filter(
@@ -166,6 +192,8 @@ def get_gallery_years(request):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@conditional_read('media_stuff')
+@cached_response('media_stuff')
 def get_gallery_stats(request):
     """Get gallery statistics"""
     total_events = GalleryEvent.objects.filter(status='published').count()
@@ -188,49 +216,52 @@ def get_gallery_stats(request):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@conditional_read('media_stuff')
 def get_photo_galleries(request):
     """Get only photo galleries (events with images)"""
-    events = GalleryEvent.objects.filter(
+    events = GalleryEvent.objects.for_listing().filter(
         status='published',
-        images__isnull=False
-    ).distinct().order_by('-event_date')[:12]
+        image_count__gt=0
+    ).order_by('-event_date')[:12]
 
     serializer = GalleryEventListSerializer(events, many=True, context={'request': request})
 
     return Response({
         'success': True,
-        'count': events.count(),
+        'count': len(serializer.data),
         'data': serializer.data
     })
 
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@conditional_read('media_stuff')
 def get_video_galleries(request):
     """Get only video galleries (events with videos)"""
-    events = GalleryEvent.objects.filter(
+    events = GalleryEvent.objects.for_listing().filter(
         status='published',
-        videos__isnull=False
-    ).distinct().order_by('-event_date')[:12]
+        video_count__gt=0
+    ).order_by('-event_date')[:12]
 
     serializer = GalleryEventListSerializer(events, many=True, context={'request': request})
 
     return Response({
         'success': True,
-        'count': events.count(),
+        'count': len(serializer.data),
         'data': serializer.data
     })
 
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@conditional_read('media_stuff')
 def search_gallery_events(request):
     """Search gallery events"""
     query = request.query_params.get('q', '')
     category = request.query_params.get('category', None)
     year = request.query_params.get('year', None)
 
-    events = GalleryEvent.objects.filter(status='published')
+    events = GalleryEvent.objects.for_listing().filter(status='published')
 
     if query:
         events = events.filter(
@@ -257,6 +288,48 @@ def search_gallery_events(request):
     return Response({
         'success': True,
         'query': query,
-        'count': events.count(),
+        'count': len(serializer.data),
+        'data': serializer.data
+    })
+
+
+# ========== ADMIN API ENDPOINTS ==========
+
+@api_view(['POST'])
+@permission_classes([IsAdminUser])
+@parser_classes([MultiPartParser])
+def bulk_upload_gallery_images(request, slug):
+    """
+    Upload many images to a gallery event in one request
+    Form fields (multipart):
+    - images: image files (repeat the field for each file), or
+    - archive: one ZIP of images (added in path order)
+    """
+    event = get_object_or_404(GalleryEvent, slug=slug)
+
+    archive = request.FILES.get('archive')
+    files = request.FILES.getlist('images')
+    if not archive and not files:
+        return Response({
+            'success': False,
+            'message': 'Send image files as "images" or a ZIP as "archive"'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        check_file_count(len(files))
+        images, errors = bulk_upload(event, archive_members(archive) if archive else files)
+    except BulkUploadError as e:
+        return Response({
+            'success': False,
+            'message': str(e)
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    serializer = GalleryImageSerializer(images, many=True, context={'request': request})
+
+    return Response({
+        'success': True,
+        'message': f'{len(images)} images uploaded',
+        'count': len(images),
+        'errors': errors,
         'data': serializer.data
-    })
\ No newline at end of file
+    }, status=status.HTTP_201_CREATED if images else status.HTTP_400_BAD_REQUEST)
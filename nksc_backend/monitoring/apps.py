@@ -0,0 +1,19 @@
+from django.apps import AppConfig
+
+
+class MonitoringConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'monitoring'
+    verbose_name = 'Monitoring'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+
+        from . import metrics
+
+        def instrument_connection(sender, connection, **kwargs):
+            # Pooled connections are "created" again on every checkout; wrap once
+            if metrics.record_query not in connection.execute_wrappers:
+                connection.execute_wrappers.append(metrics.record_query)
+
+        connection_created.connect(instrument_connection, dispatch_uid='monitoring-sql-metrics')
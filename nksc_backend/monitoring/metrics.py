@@ -0,0 +1,291 @@
+"""
+Per-route request metrics, shared by every gunicorn worker through files.
+
+``MetricsMiddleware`` (``middleware.py``) records for each request, under its
+URL pattern (``api/news/detail/<slug:slug>/``) and method:
+
+* the number of requests per response status;
+* a latency histogram;
+* SQL query count and time, from an execute wrapper that every database
+  connection gets when it is opened (``apps.py``);
+* serializer time, i.e. time spent evaluating a top-level ``serializer.data``
+  (field work and lazy related queries) of the serializers built on
+  ``serializers.TimedModelSerializer``;
+* render time, i.e. time spent turning the response data into JSON
+  (``renderers.JSONRenderer`` and ``utils.async_views.json_response``);
+* response bytes.
+
+Each worker keeps its totals in memory. The first request after a write
+starts a timer thread that writes them to ``METRICS_DIR/<pid>.json``
+``METRICS_FLUSH_INTERVAL`` seconds later, so requests never wait on the file.
+``/api/metrics/`` sums every file into Prometheus text format.
+``gunicorn.conf.py`` removes a worker's file when the worker exits and clears
+the directory when the server starts; Prometheus' ``rate()`` treats the drop
+in the sums as a counter reset.
+"""
+import contextlib
+import contextvars
+import glob
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SUMS = ('count', 'duration', 'sql_queries', 'sql_seconds', 'serializer_seconds', 'render_seconds',
+        'response_bytes')
+
+_current = contextvars.ContextVar('nksc_request_metrics', default=None)
+_serializing = contextvars.ContextVar('nksc_serializing', default=False)
+
+_lock = threading.Lock()
+_routes = {}  # "route method" -> totals
+_timer = None  # writes the totals once the interval is up
+_write_lock = threading.Lock()  # one writer of the file at a time
+
+
+def metrics_dir():
+    return getattr(settings, 'METRICS_DIR', os.path.join(settings.BASE_DIR, 'logs', 'metrics'))
+
+
+class RequestMetrics:
+    """What one request has spent so far."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.sql_queries = 0
+        self.sql_seconds = 0.0
+        self.serializer_seconds = 0.0
+        self.render_seconds = 0.0
+
+
+# ─────────────────────────────────────────────────────────────
+# RECORDING
+# ─────────────────────────────────────────────────────────────
+
+def begin():
+    metrics = RequestMetrics()
+    return metrics, _current.set(metrics)
+
+
+def end(metrics, token, request, response):
+    _current.reset(token)
+    match = getattr(request, 'resolver_match', None)
+    route = match.route if match is not None and match.route else '<unmatched>'
+    record(
+        route, request.method, response.status_code,
+        duration=time.perf_counter() - metrics.started,
+        sql_queries=metrics.sql_queries,
+        sql_seconds=metrics.sql_seconds,
+        serializer_seconds=metrics.serializer_seconds,
+        render_seconds=metrics.render_seconds,
+        response_bytes=_response_bytes(response),
+    )
+
+
+def record(route, method, status, duration, sql_queries=0, sql_seconds=0.0, serializer_seconds=0.0,
+           render_seconds=0.0, response_bytes=0):
+    with _lock:
+        totals = _routes.get(f'{route} {method}')
+        if totals is None:
+            totals = _routes[f'{route} {method}'] = _empty(route, method)
+        totals['statuses'][str(status)] = totals['statuses'].get(str(status), 0) + 1
+        for index, bound in enumerate(BUCKETS):
+            if duration <= bound:
+                totals['buckets'][index] += 1
+                break
+        totals['count'] += 1
+        totals['duration'] += duration
+        totals['sql_queries'] += sql_queries
+        totals['sql_seconds'] += sql_seconds
+        totals['serializer_seconds'] += serializer_seconds
+        totals['render_seconds'] += render_seconds
+        totals['response_bytes'] += response_bytes
+        _schedule_flush()
+
+
+def _empty(route, method):
+    return {'route': route, 'method': method, 'statuses': {}, 'buckets': [0] * len(BUCKETS),
+            **dict.fromkeys(SUMS, 0)}
+
+
+def record_query(execute, sql, params, many, context):
+    """Database execute wrapper (see ``apps.py``): counts queries of the current request."""
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.sql_queries += 1
+        metrics.sql_seconds += time.perf_counter() - started
+
+
+@contextlib.contextmanager
+def serializing():
+    """Adds the time spent in the block to the current request's serializer time; nested blocks count once."""
+    metrics = _current.get()
+    if metrics is None or _serializing.get():
+        yield
+        return
+    token = _serializing.set(True)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        _serializing.reset(token)
+        metrics.serializer_seconds += time.perf_counter() - started
+
+
+@contextlib.contextmanager
+def rendering():
+    """Adds the time spent in the block to the current request's render time."""
+    metrics = _current.get()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if metrics is not None:
+            metrics.render_seconds += time.perf_counter() - started
+
+
+def _response_bytes(response):
+    if response.has_header('Content-Length'):
+        return int(response['Content-Length'])
+    if getattr(response, 'streaming', False):
+        return 0
+    return len(response.content)
+
+
+# ─────────────────────────────────────────────────────────────
+# SHARING BETWEEN WORKERS
+# ─────────────────────────────────────────────────────────────
+
+def _schedule_flush():
+    """Start the flush timer unless one is already waiting. Lock held."""
+    global _timer
+
+    if _timer is None:
+        _timer = threading.Timer(getattr(settings, 'METRICS_FLUSH_INTERVAL', 5), _flush_on_timer)
+        _timer.daemon = True
+        _timer.start()
+
+
+def flush():
+    """Write this worker's totals to its file now."""
+    global _timer
+
+    with _write_lock:
+        with _lock:
+            if _timer is not None:
+                _timer.cancel()  # no-op when called from the timer itself
+                _timer = None
+            body = json.dumps(list(_routes.values()))
+
+        directory = metrics_dir()
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as fh:
+                fh.write(body)
+            os.replace(tmp, os.path.join(directory, f'{os.getpid()}.json'))
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+
+def _flush_on_timer():
+    try:
+        flush()
+    except Exception:
+        logger.exception("Writing request metrics failed")
+        with _lock:
+            _schedule_flush()  # try again later
+
+
+def collect():
+    """Totals of every worker that has written its file, summed per route and method."""
+    flush()
+    merged = {}
+    workers = 0
+    for path in glob.glob(os.path.join(metrics_dir(), '*.json')):
+        try:
+            with open(path) as fh:
+                routes = json.load(fh)
+        except (OSError, ValueError):
+            continue
+        workers += 1
+        for totals in routes:
+            key = f"{totals['route']} {totals['method']}"
+            target = merged.setdefault(key, _empty(totals['route'], totals['method']))
+            for status, count in totals['statuses'].items():
+                target['statuses'][status] = target['statuses'].get(status, 0) + count
+            target['buckets'] = [a + b for a, b in zip(target['buckets'], totals['buckets'])]
+            for field in SUMS:
+                target[field] += totals[field]
+    return workers, sorted(merged.values(), key=lambda item: (item['route'], item['method']))
+
+
+# ─────────────────────────────────────────────────────────────
+# PROMETHEUS TEXT FORMAT
+# ─────────────────────────────────────────────────────────────
+
+def _labels(**labels):
+    escaped = (
+        (name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in labels.items()
+    )
+    return '{' + ','.join(f'{name}="{value}"' for name, value in escaped) + '}'
+
+
+def render():
+    workers, routes = collect()
+    lines = [
+        '# HELP nksc_metrics_workers Worker processes whose metrics are included.',
+        '# TYPE nksc_metrics_workers gauge',
+        f'nksc_metrics_workers {workers}',
+        '# HELP nksc_http_requests_total Requests served.',
+        '# TYPE nksc_http_requests_total counter',
+    ]
+    for totals in routes:
+        for status, count in sorted(totals['statuses'].items()):
+            labels = _labels(route=totals['route'], method=totals['method'], status=status)
+            lines.append(f'nksc_http_requests_total{labels} {count}')
+
+    lines += [
+        '# HELP nksc_http_request_duration_seconds Time from the first middleware to the response.',
+        '# TYPE nksc_http_request_duration_seconds histogram',
+    ]
+    for totals in routes:
+        cumulative = 0
+        for bound, count in zip(BUCKETS, totals['buckets']):
+            cumulative += count
+            labels = _labels(route=totals['route'], method=totals['method'], le=bound)
+            lines.append(f'nksc_http_request_duration_seconds_bucket{labels} {cumulative}')
+        labels = _labels(route=totals['route'], method=totals['method'], le='+Inf')
+        lines.append(f'nksc_http_request_duration_seconds_bucket{labels} {totals["count"]}')
+        labels = _labels(route=totals['route'], method=totals['method'])
+        lines.append(f'nksc_http_request_duration_seconds_sum{labels} {totals["duration"]:.6f}')
+        lines.append(f'nksc_http_request_duration_seconds_count{labels} {totals["count"]}')
+
+    for name, field, help_text in (
+        ('nksc_db_queries_total', 'sql_queries', 'SQL queries run.'),
+        ('nksc_db_query_seconds_total', 'sql_seconds', 'Time spent in SQL queries.'),
+        ('nksc_serializer_seconds_total', 'serializer_seconds', 'Time spent in serializer.data.'),
+        ('nksc_render_seconds_total', 'render_seconds', 'Time spent rendering response bodies.'),
+        ('nksc_http_response_bytes_total', 'response_bytes', 'Response body bytes sent.'),
+    ):
+        lines += [f'# HELP {name} {help_text}', f'# TYPE {name} counter']
+        for totals in routes:
+            value = totals[field]
+            value = f'{value:.6f}' if isinstance(value, float) else value
+            lines.append(f'{name}{_labels(route=totals["route"], method=totals["method"])} {value}')
+    return '\n'.join(lines) + '\n'
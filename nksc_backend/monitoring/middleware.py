@@ -0,0 +1,28 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from . import metrics
+
+
+class MetricsMiddleware:
+    """Records every request in ``monitoring.metrics``; listed first so its latency covers the whole stack."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        request_metrics, token = metrics.begin()
+        response = self.get_response(request)
+        metrics.end(request_metrics, token, request, response)
+        return response
+
+    async def __acall__(self, request):
+        request_metrics, token = metrics.begin()
+        response = await self.get_response(request)
+        metrics.end(request_metrics, token, request, response)
+        return response
@@ -0,0 +1,11 @@
+from rest_framework import renderers
+
+from . import metrics
+
+
+class JSONRenderer(renderers.JSONRenderer):
+    """DRF's ``JSONRenderer``, timed as the request's render time (see ``metrics.py``)."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with metrics.rendering():
+            return super().render(data, accepted_media_type, renderer_context)
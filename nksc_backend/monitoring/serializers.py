@@ -0,0 +1,30 @@
+from rest_framework import serializers
+
+from . import metrics
+
+
+class TimedListSerializer(serializers.ListSerializer):
+    """``many=True`` serializer whose ``.data`` counts as serializer time (see ``metrics.py``)."""
+
+    @property
+    def data(self):
+        with metrics.serializing():
+            return super().data
+
+
+class TimedModelSerializer(serializers.ModelSerializer):
+    """
+    ``ModelSerializer`` whose ``.data`` counts as serializer time, as does that
+    of its ``many=True`` lists unless ``Meta`` names another list serializer.
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        meta = getattr(cls, 'Meta', None)
+        if meta is not None and not hasattr(meta, 'list_serializer_class'):
+            meta.list_serializer_class = TimedListSerializer
+
+    @property
+    def data(self):
+        with metrics.serializing():
+            return super().data
@@ -0,0 +1,154 @@
+import json
+import os
+import runpy
+import shutil
+import tempfile
+import time
+from types import SimpleNamespace
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient
+
+from news.models import News
+from news.serializers import NewsListSerializer
+from nksc_backend.pooled_mysql.pool import ConnectionPool
+
+from . import metrics
+from .serializers import TimedListSerializer
+
+
+class PoolStatsEndpointTests(TestCase):
+    def test_admin_only(self):
+        client = APIClient()
+        self.assertIn(client.get('/api/monitoring/db-pool/').status_code, (401, 403))
+
+        client.force_authenticate(get_user_model().objects.create_user('ops', is_staff=True))
+        response = client.get('/api/monitoring/db-pool/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data']['pid'], os.getpid())
+        self.assertIn('default', response.data['data']['databases'])
+
+    def test_reports_pooled_and_unpooled_aliases(self):
+        client = APIClient()
+        client.force_authenticate(get_user_model().objects.create_user('ops', is_staff=True))
+        pool = ConnectionPool(mock.Mock, max_size=4)
+        pool.release(pool.acquire())
+
+        # Independent of the engine the tests run on, which may or may not pool
+        with mock.patch('monitoring.views.pools', return_value={}):
+            response = client.get('/api/monitoring/db-pool/')
+        self.assertEqual(response.data['data']['databases']['default'], {'pooled': False})
+
+        with mock.patch('monitoring.views.pools', return_value={'default': pool}):
+            response = client.get('/api/monitoring/db-pool/')
+        databases = response.data['data']['databases']
+        self.assertTrue(databases['default']['pooled'])
+        self.assertEqual(
+            (databases['default']['open'], databases['default']['idle'], databases['default']['connections_created']),
+            (1, 1, 1)
+        )
+        self.assertEqual(databases['default']['max_connections_all_workers'], 4 * response.data['data']['workers'])
+
+
+class MetricsTests(TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        settings_override = override_settings(METRICS_DIR=directory)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.directory = directory
+        self.addCleanup(self.stop_timer)
+
+        metrics._routes.clear()
+        self.addCleanup(metrics._routes.clear)
+        cache.clear()
+        self.addCleanup(cache.clear)
+        News.objects.create(title="Breaking", slug="breaking", short_description="S", content="C",
+                            urgency='breaking', is_published=True)
+
+    @staticmethod
+    def stop_timer():
+        with metrics._lock:
+            if metrics._timer is not None:
+                metrics._timer.cancel()
+                metrics._timer = None
+
+    def scrape(self):
+        client = APIClient()
+        client.force_authenticate(get_user_model().objects.create_user('ops', is_staff=True))
+        response = client.get('/api/metrics/')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        return dict(line.rsplit(' ', 1) for line in response.content.decode().splitlines() if not line.startswith('#'))
+
+    def test_per_route_metrics(self):
+        self.assertIn(APIClient().get('/api/metrics/').status_code, (401, 403))
+        for _ in range(2):
+            APIClient().get('/api/news/urgent/')
+
+        samples = self.scrape()
+        labels = '{route="api/news/urgent/",method="GET"}'
+        self.assertEqual(samples['nksc_http_requests_total{route="api/news/urgent/",method="GET",status="200"}'], '2')
+        self.assertEqual(samples['nksc_http_request_duration_seconds_count' + labels], '2')
+        self.assertEqual(
+            samples['nksc_http_request_duration_seconds_bucket{route="api/news/urgent/",method="GET",le="+Inf"}'], '2'
+        )
+        self.assertEqual(samples['nksc_db_queries_total' + labels], '2')
+        self.assertGreater(float(samples['nksc_serializer_seconds_total' + labels]), 0)
+        self.assertGreater(float(samples['nksc_render_seconds_total' + labels]), 0)
+        self.assertGreater(int(samples['nksc_http_response_bytes_total' + labels]), 0)
+
+    def test_serializer_time_includes_lazy_queries(self):
+        request_metrics, token = metrics.begin()
+        try:
+            serializer = NewsListSerializer(News.objects.all(), many=True)
+            self.assertIsInstance(serializer, TimedListSerializer)
+            data = serializer.data  # the queryset is evaluated here
+        finally:
+            metrics._current.reset(token)
+        self.assertEqual(len(data), 1)
+        self.assertEqual(request_metrics.sql_queries, 1)
+        self.assertGreaterEqual(request_metrics.serializer_seconds, request_metrics.sql_seconds)
+        self.assertGreater(request_metrics.serializer_seconds, 0)
+
+    def test_workers_are_summed(self):
+        APIClient().get('/api/news/urgent/')
+        other = metrics._empty('api/news/urgent/', 'GET')
+        other.update(statuses={'200': 3}, count=3, sql_queries=5)
+        with open(os.path.join(self.directory, '1.json'), 'w') as fh:
+            json.dump([other], fh)
+
+        samples = self.scrape()
+        self.assertEqual(samples['nksc_metrics_workers'], '2')
+        self.assertEqual(samples['nksc_http_requests_total{route="api/news/urgent/",method="GET",status="200"}'], '4')
+        self.assertEqual(samples['nksc_db_queries_total{route="api/news/urgent/",method="GET"}'], '6')
+
+    def test_totals_are_written_off_the_request_path(self):
+        path = os.path.join(self.directory, f'{os.getpid()}.json')
+        with override_settings(METRICS_FLUSH_INTERVAL=0.05):
+            APIClient().get('/api/news/urgent/')
+            self.assertFalse(os.path.exists(path))
+            deadline = time.monotonic() + 5
+            while not os.path.exists(path) and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+        with open(path) as fh:
+            routes = json.load(fh)
+        self.assertEqual([(totals['route'], totals['count']) for totals in routes], [('api/news/urgent/', 1)])
+        self.assertIsNone(metrics._timer)
+
+    def test_exited_workers_are_dropped(self):
+        for pid in (1, 2):
+            with open(os.path.join(self.directory, f'{pid}.json'), 'w') as fh:
+                json.dump([], fh)
+
+        config = runpy.run_path(os.path.join(settings.BASE_DIR, 'gunicorn.conf.py'))
+        with mock.patch.dict(os.environ, METRICS_DIR=self.directory):
+            config['child_exit'](None, SimpleNamespace(pid=1))
+            config['child_exit'](None, SimpleNamespace(pid=1))
+        self.assertEqual(os.listdir(self.directory), ['2.json'])
@@ -0,0 +1,6 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('db-pool/', views.get_db_pool_stats, name='db-pool-stats'),
+]
@@ -0,0 +1,54 @@
+import os
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+from nksc_backend.pooled_mysql.base import pools
+
+from . import metrics
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def get_db_pool_stats(request):
+    """
+    Connection pool counters of the worker process that served this request.
+    Each gunicorn worker has its own pool, so repeated calls may land on
+    different workers; ``pid`` tells them apart.
+    """
+    workers = int(os.environ.get('GUNICORN_WORKERS', 3))  # as in gunicorn.conf.py
+    pooled = pools()
+
+    databases = {}
+    for alias in connections:
+        if alias in pooled:
+            stats = pooled[alias].stats()
+            databases[alias] = {
+                'pooled': True,
+                **stats,
+                # What every worker together may hold open on the server
+                'max_connections_all_workers': stats['max_size'] * workers,
+            }
+        else:
+            databases[alias] = {'pooled': False}
+
+    return Response({
+        'success': True,
+        'data': {
+            'pid': os.getpid(),
+            'server_profile': settings.SERVER_PROFILE,
+            'workers': workers,
+            'databases': databases,
+        }
+    })
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def get_metrics(request):
+    """Per-route request, latency, SQL, serializer and size metrics of all workers, for Prometheus."""
+    return HttpResponse(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,70 @@
+"""
+Async versions of the public news reads, routed when ``ASYNC_READ_VIEWS`` is
+on (see ``utils/async_views.py``). Bodies match the views in ``views.py``.
+"""
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from utils.async_views import async_read
+
+from .models import News, NewsCategory
+from .serializers import NewsSerializer, NewsCategorySerializer
+from .stats import anews_stats
+
+
+async def _news_list(request, queryset):
+    news = [item async for item in queryset[:10]]
+    serializer = NewsSerializer(news, many=True, context={'request': request})
+    return {
+        'success': True,
+        'count': len(serializer.data),
+        'data': serializer.data
+    }
+
+
+def _published():
+    return News.objects.select_related('category').filter(is_published=True)
+
+
+@async_read('news', cached=True)
+async def get_all_categories(request):
+    """Get all news categories with their published news counts"""
+    categories = NewsCategory.objects.annotate(
+        news_count=Count('news', filter=Q(news__is_published=True))
+    )
+    serializer = NewsCategorySerializer([category async for category in categories], many=True)
+    return {
+        'success': True,
+        'data': serializer.data
+    }
+
+
+@async_read('news')
+async def get_urgent_news(request):
+    """Get urgent and breaking news"""
+    return await _news_list(
+        request, _published().filter(urgency__in=['urgent', 'breaking']).order_by('-publish_date')
+    )
+
+
+@async_read('news', daily=True)
+async def get_upcoming_events(request):
+    """Get upcoming events"""
+    return await _news_list(
+        request, _published().filter(is_event=True, event_date__gte=timezone.now().date()).order_by('event_date')
+    )
+
+
+@async_read('news')
+async def get_research_news(request):
+    """Get research-related news"""
+    return await _news_list(request, _published().filter(is_research=True).order_by('-publish_date'))
+
+
+@async_read('news')
+async def get_news_stats(request):
+    """Get news statistics"""
+    return {
+        'success': True,
+        'stats': await anews_stats()
+    }
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.11 on 2026-10-17 11:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0003_event'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='news',
+            index=models.Index(fields=['is_published', 'publish_date', 'created_at'], name='news_news_is_publ_1260d4_idx'),
+        ),
+    ]
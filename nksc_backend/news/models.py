@@ -2,6 +2,8 @@ from django.db import models
 from django.utils import timezone
 from ckeditor.fields import RichTextField  # Add this import
 
+from utils import view_counter
+
 
 class NewsCategory(models.Model):
     name = models.CharField(max_length=100)
@@ -72,13 +74,18 @@ class News(models.Model):
     class Meta:
         verbose_name_plural = "News"
         ordering = ['-publish_date', '-created_at']
+        indexes = [
+            # Keyset pagination walks this index (see utils/pagination.py)
+            models.Index(fields=['is_published', 'publish_date', 'created_at']),
+        ]
     
     def __str__(self):
         return self.title
     
     def increment_views(self):
+        # Buffered: written in batches by utils.view_counter, not on this request
+        view_counter.record(self)
         self.views_count += 1
-        self.save(update_fields=['views_count'])
     
     
     def get_tags_list(self):
@@ -4,11 +4,17 @@ from django.conf import settings
 from django.utils.text import slugify
 import re
 
+from monitoring.serializers import TimedModelSerializer
+from utils.images import image_url
+
+
+class NewsCategorySerializer(TimedModelSerializer):
+    # Only present on querysets annotated with it (the public category list)
+    news_count = serializers.IntegerField(read_only=True, required=False)
 
-class NewsCategorySerializer(serializers.ModelSerializer):
     class Meta:
         model = NewsCategory
-        fields = ['id', 'name', 'slug', 'description']
+        fields = ['id', 'name', 'slug', 'description', 'news_count']
         extra_kwargs = {
             'slug': {'required': False, 'allow_blank': True, 'read_only': True}
         }
@@ -46,7 +52,7 @@ class NewsCategorySerializer(serializers.ModelSerializer):
         return instance
 
 
-class NewsSerializer(serializers.ModelSerializer):
+class NewsSerializer(TimedModelSerializer):
     category_detail = NewsCategorySerializer(source='category', read_only=True)
     tags_list = serializers.SerializerMethodField()
     days_ago = serializers.SerializerMethodField()
@@ -80,17 +86,36 @@ class NewsSerializer(serializers.ModelSerializer):
         request = self.context.get('request')
         
         if request:
-            if instance.thumbnail_image:
-                data['thumbnail_image'] = request.build_absolute_uri(instance.thumbnail_image.url)
-            if instance.banner_image:
-                data['banner_image'] = request.build_absolute_uri(instance.banner_image.url)
-            if instance.attachment_file:
+            for field in ('thumbnail_image', 'banner_image'):
+                image = getattr(instance, field)
+                if field in data and image:
+                    data[field] = image_url(request, image)
+            if 'attachment_file' in data and instance.attachment_file:
                 data['attachment_file'] = request.build_absolute_uri(instance.attachment_file.url)
         
         return data
 
 
-class NewsCreateUpdateSerializer(serializers.ModelSerializer):
+class NewsListSerializer(NewsSerializer):
+    """
+    News as listed: everything but the rich-text ``content`` (fetch the detail
+    endpoint for that). ``fields`` narrows the output to a subset of the
+    listing fields; unknown names are ignored.
+    """
+
+    class Meta(NewsSerializer.Meta):
+        fields = [field for field in NewsSerializer.Meta.fields if field != 'content']
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields:
+            requested = set(fields) & set(self.fields)
+            if requested:
+                for name in set(self.fields) - requested:
+                    self.fields.pop(name)
+
+
+class NewsCreateUpdateSerializer(TimedModelSerializer):
     class Meta:
         model = News
         fields = [
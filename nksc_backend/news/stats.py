@@ -0,0 +1,73 @@
+"""
+Published news statistics for ``get_news_stats``.
+
+One grouped query over (category, language) with conditional counts
+(``Count(filter=Q(...))``) for urgent, event and research news gives every
+number the endpoint reports; the handful of grouped rows is folded into totals
+and per-category / per-language breakdowns in Python. The result is kept in
+the ``news`` cache namespace, so it lasts until the next news write.
+"""
+from django.db.models import Count, Max, Q
+
+from utils import cache
+
+from .models import News
+
+URGENT_LEVELS = ('urgent', 'breaking')
+
+
+def _grouped_query():
+    return (
+        News.objects.filter(is_published=True).order_by().values(
+            'category__slug', 'category__name', 'language'
+        ).annotate(
+            total=Count('id'),
+            urgent=Count('id', filter=Q(urgency__in=URGENT_LEVELS)),
+            events=Count('id', filter=Q(is_event=True)),
+            research=Count('id', filter=Q(is_research=True)),
+            latest=Max('publish_date'),
+        )
+    )
+
+
+def _summarize(rows):
+    categories = {}
+    languages = {}
+    for row in rows:
+        slug = row['category__slug']
+        if slug not in categories:
+            categories[slug] = {'slug': slug, 'name': row['category__name'], 'count': 0}
+        categories[slug]['count'] += row['total']
+        languages[row['language']] = languages.get(row['language'], 0) + row['total']
+
+    language_names = dict(News.LANGUAGE_CHOICES)
+    latest_dates = [row['latest'] for row in rows if row['latest']]
+    return {
+        'total_news': sum(row['total'] for row in rows),
+        'urgent_news': sum(row['urgent'] for row in rows),
+        'events': sum(row['events'] for row in rows),
+        'research': sum(row['research'] for row in rows),
+        'latest_news_date': max(latest_dates) if latest_dates else None,
+        'by_category': sorted(
+            categories.values(), key=lambda item: (-item['count'], item['name'] or '')
+        ),
+        'by_language': [
+            {'language': code, 'label': language_names.get(code, code), 'count': count}
+            for code, count in sorted(languages.items(), key=lambda item: -item[1])
+        ],
+    }
+
+
+def news_stats():
+    """Counts of published news, memoized until the next ``News`` write."""
+    return cache.namespace('news').get_or_set(('stats',), lambda: _summarize(list(_grouped_query())))
+
+
+async def anews_stats():
+    """``news_stats`` for async views."""
+    ns = cache.namespace('news')
+    stats = await ns.aget('stats')
+    if stats is None:
+        stats = _summarize([row async for row in _grouped_query()])
+        await ns.aset(stats, 'stats')
+    return stats
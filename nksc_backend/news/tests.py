@@ -1,3 +1,204 @@
-from django.test import TestCase
+import json
+import time
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.db import DatabaseError
+from django.db.models import QuerySet
+from django.test import RequestFactory, TestCase, TransactionTestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from utils import view_counter
+
+from . import async_views
+from .models import News, NewsCategory
+
+
+class NewsListingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        category = NewsCategory.objects.create(name="Seminar", slug="seminar")
+        for number in range(1, 6):
+            News.objects.create(
+                title=f"News {number}",
+                slug=f"news-{number}",
+                short_description="Short",
+                content="<p>A long body</p>" * 100,
+                category=category,
+                is_published=True,
+            )
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_listing_is_paginated_without_content(self):
+        # The total COUNT and the page, with categories joined in
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/news/all/', {'page': 2, 'page_size': 2})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 5)
+        self.assertEqual(response.data['total_pages'], 3)
+        self.assertEqual(len(response.data['data']), 2)
+        item = response.data['data'][0]
+        self.assertNotIn('content', item)
+        self.assertEqual(item['category_detail']['slug'], "seminar")
+
+    def test_sparse_fieldset(self):
+        response = self.client.get('/api/news/all/', {'fields': 'id,title,slug,unknown'})
+        self.assertEqual(set(response.data['data'][0]), {'id', 'title', 'slug'})
+
+        response = self.client.get('/api/news/all/', {'fields': 'content'})
+        self.assertNotIn('content', response.data['data'][0])
+
+    def test_conditional_get(self):
+        response = self.client.get('/api/news/all/')
+        self.assertIn('s-maxage=60', response['Cache-Control'])
+        self.assertIn('stale-while-revalidate=300', response['Cache-Control'])
+
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/news/all/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+        etag = response['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            News.objects.get(slug='news-1').save()
+        response = self.client.get('/api/news/all/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+        # An evicted version does not start over at a number that was handed out before
+        cache.delete('cache-version:news')
+        response = self.client.get('/api/news/all/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_upcoming_events_revalidate_after_midnight(self):
+        now = timezone.now()
+        News.objects.filter(slug='news-3').update(is_event=True, event_date=now.date())
+
+        response = self.client.get('/api/news/upcoming-events/')
+        self.assertEqual([item['slug'] for item in response.data['data']], ['news-3'])
+        etag = response['ETag']
+        self.assertEqual(
+            self.client.get('/api/news/upcoming-events/', HTTP_IF_NONE_MATCH=etag).status_code, 304
+        )
+
+        # Nothing was saved, but the event is in the past tomorrow
+        with mock.patch('django.utils.timezone.now', return_value=now + timedelta(days=1)):
+            response = self.client.get('/api/news/upcoming-events/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data'], [])
+
+    def test_stats_in_one_query_until_next_write(self):
+        News.objects.filter(slug='news-2').update(urgency='breaking', language='en', is_event=True)
+        cache.clear()
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/news/stats/')
+        stats = response.data['stats']
+        self.assertEqual((stats['total_news'], stats['urgent_news'], stats['events']), (5, 1, 1))
+        self.assertEqual(stats['by_category'], [{'slug': 'seminar', 'name': "Seminar", 'count': 5}])
+        self.assertEqual([(item['language'], item['count']) for item in stats['by_language']], [('bn', 4), ('en', 1)])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            News.objects.create(title="Draft", slug="draft", short_description="S", content="C", is_research=True)
+        with self.assertNumQueries(1):
+            self.client.get('/api/news/stats/')
+        self.assertEqual(self.client.get('/api/news/categories/').data['data'][0]['news_count'], 5)
+
+    def test_detail_views_are_buffered(self):
+        view_counter.flush()
+        with self.settings(VIEW_COUNT_FLUSH_INTERVAL=3600):
+            for _ in range(3):
+                # Only the lookup; the hit is not written on the request
+                with self.assertNumQueries(1):
+                    response = self.client.get('/api/news/detail/news-1/')
+                self.assertEqual(response.status_code, 200)
+
+        news = News.objects.get(slug='news-1')
+        self.assertEqual(news.views_count, 0)
+        self.assertEqual(view_counter.pending(news), 3)
+
+        self.assertEqual(view_counter.flush(), 3)
+        news.refresh_from_db()
+        self.assertEqual(news.views_count, 3)
+
+    def test_failed_flush_writes_nothing(self):
+        view_counter.flush()
+        first, second = News.objects.get(slug='news-1'), News.objects.get(slug='news-2')
+        with self.settings(VIEW_COUNT_FLUSH_INTERVAL=3600):
+            view_counter.record(first)
+            view_counter.record(second)
+            view_counter.record(second)
+
+        # Two increments, two UPDATEs; the second one fails
+        update = QuerySet.update
+        calls = []
+
+        def failing_update(queryset, **kwargs):
+            calls.append(kwargs)
+            if len(calls) == 2:
+                raise DatabaseError("lost connection")
+            return update(queryset, **kwargs)
+
+        with mock.patch.object(QuerySet, 'update', failing_update), self.assertRaises(DatabaseError):
+            view_counter.flush()
+        counts = News.objects.filter(slug__in=['news-1', 'news-2']).order_by('slug').values_list('views_count', flat=True)
+        self.assertEqual(list(counts), [0, 0])
+        self.assertEqual((view_counter.pending(first), view_counter.pending(second)), (1, 2))
+
+        self.assertEqual(view_counter.flush(), 3)
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual((first.views_count, second.views_count), (1, 2))
+
+
+class ViewCounterTimerTests(TransactionTestCase):
+    def test_idle_buffer_is_written_by_the_timer(self):
+        view_counter.flush()
+        news = News.objects.create(title="News", slug="news", short_description="Short", content="Body")
+
+        with self.settings(VIEW_COUNT_FLUSH_INTERVAL=0.05):
+            view_counter.record(news)
+            view_counter.record(news)
+
+        # No further hits and no explicit flush: the timer thread writes them
+        deadline = time.monotonic() + 5
+        while news.views_count != 2 and time.monotonic() < deadline:
+            time.sleep(0.02)
+            news.refresh_from_db()
+        self.assertEqual(news.views_count, 2)
+        self.assertEqual(view_counter.pending(news), 0)
+
+
+class NewsAsyncViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        category = NewsCategory.objects.create(name="Seminar", slug="seminar")
+        News.objects.create(title="Breaking", slug="breaking", short_description="S", content="C",
+                            category=category, urgency='breaking', is_research=True, is_published=True)
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.client = APIClient()
+
+    def test_async_views_match_the_sync_views(self):
+        for path, view in (
+            ('/api/news/urgent/', async_views.get_urgent_news),
+            ('/api/news/research/', async_views.get_research_news),
+            ('/api/news/upcoming-events/', async_views.get_upcoming_events),
+            ('/api/news/categories/', async_views.get_all_categories),
+            ('/api/news/stats/', async_views.get_news_stats),
+        ):
+            expected = self.client.get(path)
+            response = async_to_sync(view)(RequestFactory().get(path))
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(json.loads(response.content), json.loads(expected.content), path)
+            self.assertEqual(response['ETag'], expected['ETag'])
+
+            with self.assertNumQueries(0):
+                cached = async_to_sync(view)(RequestFactory().get(path, HTTP_IF_NONE_MATCH=response['ETag']))
+            self.assertEqual(cached.status_code, 304)
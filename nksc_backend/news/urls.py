@@ -1,5 +1,6 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import async_views, views
 
 urlpatterns = [
     # Public endpoints
@@ -17,4 +18,13 @@ urlpatterns = [
     path('admin/update/<int:id>/', views.update_news),
     path('admin/delete/<int:id>/', views.delete_news),
     path('admin/all/', views.get_all_news_admin),
-]
\ No newline at end of file
+]
+
+if settings.ASYNC_READ_VIEWS:
+    urlpatterns = [
+        path('categories/', async_views.get_all_categories),
+        path('urgent/', async_views.get_urgent_news),
+        path('upcoming-events/', async_views.get_upcoming_events),
+        path('research/', async_views.get_research_news),
+        path('stats/', async_views.get_news_stats),
+    ] + urlpatterns
@@ -4,21 +4,30 @@ from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.parsers import MultiPartParser, FormParser
 from django.shortcuts import get_object_or_404
-from django.db.models import Q
+from django.db.models import Count, Q
 from django.utils import timezone
 from django.utils.text import slugify
 
+from utils.cache import cached_response
+from utils.http_cache import conditional_read
+from utils.pagination import CursorPaginator, InvalidCursor, cursor_requested, page_size_param
+
 from .models import News, NewsCategory
-from .serializers import NewsSerializer, NewsCreateUpdateSerializer, NewsCategorySerializer
+from .serializers import NewsSerializer, NewsListSerializer, NewsCreateUpdateSerializer, NewsCategorySerializer
+from .stats import news_stats
 
 
 # ========== NEWS CATEGORY VIEWS ==========
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@conditional_read('news')
+@cached_response('news')
 def get_all_categories(request):
-    """Get all news categories"""
-    categories = NewsCategory.objects.all()
+    """Get all news categories with their published news counts"""
+    categories = NewsCategory.objects.annotate(
+        news_count=Count('news', filter=Q(news__is_published=True))
+    )
     serializer = NewsCategorySerializer(categories, many=True)
     return Response({
         'success': True,
@@ -64,8 +73,41 @@ def create_category(request):
 
 # ========== NEWS VIEWS ==========
 
+NEWS_ORDERING = ['-publish_date', '-created_at']
+
+
+def _listing_fields(request):
+    """Sparse fieldset from ?fields=id,title,slug (None means every listing field)."""
+    fields = request.query_params.get('fields', '')
+    return [field.strip() for field in fields.split(',') if field.strip()] or None
+
+
+def _news_cursor_page(request, news_list, serializer_class=NewsSerializer, **serializer_kwargs):
+    """Keyset page of news for ?cursor= requests (infinite scroll, no COUNT)."""
+    page_size = page_size_param(request)
+    try:
+        news_page = CursorPaginator(news_list, NEWS_ORDERING, page_size).get_page(
+            request.query_params.get('cursor')
+        )
+    except InvalidCursor as e:
+        return Response({
+            'success': False,
+            'message': str(e)
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    serializer = serializer_class(
+        news_page.object_list, many=True, context={'request': request}, **serializer_kwargs
+    )
+    return Response({
+        'success': True,
+        **news_page.pagination_data(page_size),
+        'data': serializer.data
+    })
+
+
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@conditional_read('news')
 def get_all_news(request):
     """Get all published news with filtering options"""
     # Get query parameters
@@ -76,8 +118,8 @@ def get_all_news(request):
     is_research = request.query_params.get('is_research', None)
     search = request.query_params.get('search', None)
     
-    # Start with published news
-    news_list = News.objects.filter(is_published=True)
+    # Start with published news; the listing never shows the rich-text body
+    news_list = News.objects.filter(is_published=True).select_related('category').defer('content')
     
     # Apply filters
     if category_slug:
@@ -103,14 +145,38 @@ def get_all_news(request):
             Q(tags__icontains=search)
         )
     
+    fields = _listing_fields(request)
+    if cursor_requested(request):
+        return _news_cursor_page(request, news_list, NewsListSerializer, fields=fields)
+
     # Order by publish date (newest first)
-    news_list = news_list.order_by('-publish_date', '-created_at')
+    news_list = news_list.order_by(*NEWS_ORDERING)
     
-    serializer = NewsSerializer(news_list, many=True, context={'request': request})
+    # Pagination
+    try:
+        page = max(1, int(request.query_params.get('page', 1)))
+    except ValueError:
+        page = 1
+    page_size = page_size_param(request)
+    
+    total_count = news_list.count()
+    total_pages = (total_count + page_size - 1) // page_size
+    start = (page - 1) * page_size
+    
+    serializer = NewsListSerializer(
+        news_list[start:start + page_size], many=True, context={'request': request}, fields=fields
+    )
     
     return Response({
         'success': True,
-        'count': news_list.count(),
+        'count': total_count,
+        'page': page,
+        'page_size': page_size,
+        'total_pages': total_pages,
+        'has_next': page < total_pages,
+        'has_previous': page > 1,
+        'next_page': page + 1 if page < total_pages else None,
+        'previous_page': page - 1 if page > 1 else None,
         'data': serializer.data
     })
 
@@ -119,7 +185,7 @@ def get_all_news(request):
 @permission_classes([AllowAny])
 def get_news_detail(request, slug):
     """Get detailed view of a single news article"""
-    news = get_object_or_404(News, slug=slug, is_published=True)
+    news = get_object_or_404(News.objects.select_related('category'), slug=slug, is_published=True)
     
     # Increment view count
     news.increment_views()
@@ -134,9 +200,10 @@ def get_news_detail(request, slug):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@conditional_read('news')
 def get_urgent_news(request):
     """Get urgent and breaking news"""
-    urgent_news = News.objects.filter(
+    urgent_news = News.objects.select_related('category').filter(
         is_published=True,
         urgency__in=['urgent', 'breaking']
     ).order_by('-publish_date')[:10]
@@ -145,16 +212,17 @@ def get_urgent_news(request):
     
     return Response({
         'success': True,
-        'count': urgent_news.count(),
+        'count': len(serializer.data),
         'data': serializer.data
     })
 
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@conditional_read('news', daily=True)
 def get_upcoming_events(request):
     """Get upcoming events"""
-    upcoming_events = News.objects.filter(
+    upcoming_events = News.objects.select_related('category').filter(
         is_published=True,
         is_event=True,
         event_date__gte=timezone.now().date()
@@ -164,16 +232,17 @@ def get_upcoming_events(request):
     
     return Response({
         'success': True,
-        'count': upcoming_events.count(),
+        'count': len(serializer.data),
         'data': serializer.data
     })
 
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@conditional_read('news')
 def get_research_news(request):
     """Get research-related news"""
-    research_news = News.objects.filter(
+    research_news = News.objects.select_related('category').filter(
         is_published=True,
         is_research=True
     ).order_by('-publish_date')[:10]
@@ -182,7 +251,7 @@ def get_research_news(request):
     
     return Response({
         'success': True,
-        'count': research_news.count(),
+        'count': len(serializer.data),
         'data': serializer.data
     })
 
@@ -294,7 +363,7 @@ def get_all_news_admin(request):
     search = request.query_params.get('search', None)
     
     # Start with published news
-    news_list = News.objects.filter(is_published=True)
+    news_list = News.objects.filter(is_published=True).select_related('category')
     
     # Apply filters with proper normalization
     if category_slug:
@@ -369,8 +438,11 @@ def get_all_news_admin(request):
             Q(tags__icontains=search)
         )
     
+    if cursor_requested(request):
+        return _news_cursor_page(request, news_list)
+
     # Order by publish date (newest first)
-    news_list = news_list.order_by('-publish_date', '-created_at')
+    news_list = news_list.order_by(*NEWS_ORDERING)
     
     serializer = NewsSerializer(news_list, many=True, context={'request': request})
     
@@ -388,26 +460,12 @@ def get_all_news_admin(request):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@conditional_read('news')
 def get_news_stats(request):
     """Get news statistics"""
-    total_news = News.objects.filter(is_published=True).count()
-    urgent_news = News.objects.filter(is_published=True, urgency__in=['urgent', 'breaking']).count()
-    events = News.objects.filter(is_published=True, is_event=True).count()
-    research = News.objects.filter(is_published=True, is_research=True).count()
-    
-    # Get latest news date
-    latest_news = News.objects.filter(is_published=True).order_by('-publish_date').first()
-    latest_date = latest_news.publish_date if latest_news else None
-    
     return Response({
         'success': True,
-        'stats': {
-            'total_news': total_news,
-            'urgent_news': urgent_news,
-            'events': events,
-            'research': research,
-            'latest_news_date': latest_date
-        }
+        'stats': news_stats()
     })
 
 
@@ -415,10 +473,11 @@ def get_news_stats(request):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@conditional_read('news')
 def get_news_by_category(request, category_slug):
     """Get news by category slug"""
     category = get_object_or_404(NewsCategory, slug=category_slug)
-    news_list = News.objects.filter(
+    news_list = News.objects.select_related('category').filter(
         category=category,
         is_published=True
     ).order_by('-publish_date')
@@ -435,9 +494,10 @@ def get_news_by_category(request, category_slug):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@conditional_read('news')
 def get_latest_news(request):
     """Get latest news (limit: 10)"""
-    latest_news = News.objects.filter(
+    latest_news = News.objects.select_related('category').filter(
         is_published=True
     ).order_by('-publish_date')[:10]
     
@@ -445,6 +505,6 @@ def get_latest_news(request):
     
     return Response({
         'success': True,
-        'count': latest_news.count(),
+        'count': len(serializer.data),
         'data': serializer.data
     })
\ No newline at end of file
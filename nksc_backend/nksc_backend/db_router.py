@@ -0,0 +1,272 @@
+"""
+Read replicas for the public read path.
+
+``ReplicaRoutingMiddleware`` gives every request a routing state and
+``ReplicaRouter`` reads it:
+
+* Only public reads opt in: ``conditional_read`` and ``async_read`` (and the
+  home bundle) call ``allow_replica_reads()`` with the cache namespaces the
+  response is built from, for anonymous GET and HEAD requests. From then on
+  the request reads from one healthy replica, picked at random once per
+  request so a request never mixes replicas. Everything else (the admin,
+  signed-in users, middleware, writes) uses ``default``.
+* No stale cache fills: for ``REPLICA_MAX_LAG`` seconds after one of those
+  namespaces is invalidated, the view reads ``default``. Otherwise a lagging
+  replica could hand it the old rows, to be cached under the new namespace
+  version with a fresh ``ETag``.
+* Read-your-writes: once a request writes, the rest of it reads from
+  ``default``. The response then sets the ``REPLICA_PIN_COOKIE`` for
+  ``REPLICA_PIN_SECONDS``, and requests carrying that cookie read from
+  ``default`` too. An editor therefore sees their own change even while the
+  replicas catch up.
+* A daemon thread per process checks every replica each
+  ``REPLICA_CHECK_INTERVAL`` seconds, off the request path. A replica is
+  skipped if its last check failed, if it reported replication stopped or more
+  than ``REPLICA_MAX_LAG`` seconds of lag (MySQL/MariaDB ``SHOW SLAVE
+  STATUS``), or until it has been checked at all. A replica that fails with a
+  connection error during a request is marked down at once. With no healthy
+  replica everything reads from ``default``.
+
+Reads inside ``transaction.atomic()`` and code running outside a request
+(management commands, background tasks) always use ``default``.
+
+Replicas are listed in ``settings.DATABASE_REPLICAS``. Locally two SQLite
+files stand in for the primary and a replica::
+
+    DATABASES = {
+        'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': 'primary.sqlite3'},
+        'replica': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': 'replica.sqlite3',
+                    'TEST': {'MIRROR': 'default'}},
+    }
+    DATABASE_REPLICAS = ['replica']
+"""
+import contextvars
+import logging
+import os
+import random
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, InterfaceError, OperationalError, connections
+
+from utils import cache
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = ('GET', 'HEAD')
+_UNSET = object()
+
+_route = contextvars.ContextVar('nksc_db_route', default=None)
+
+
+def allow_replica_reads(*namespaces):
+    """
+    Called by a public read view (``conditional_read``, ``async_read``, the home
+    bundle) before it queries: the rest of an eligible request may read from a
+    replica, unless one of ``namespaces`` was invalidated within the last
+    ``REPLICA_MAX_LAG`` seconds.
+    """
+    route = _route.get()
+    if route is not None and route.eligible:
+        route.use_replicas = not _recently_invalidated(cache.namespace(name).changed_at() for name in namespaces)
+
+
+async def aallow_replica_reads(*namespaces):
+    """``allow_replica_reads`` for async views."""
+    route = _route.get()
+    if route is not None and route.eligible:
+        route.use_replicas = not _recently_invalidated(
+            [await cache.namespace(name).achanged_at() for name in namespaces]
+        )
+
+
+def _recently_invalidated(changed):
+    # changed_at is in whole seconds
+    horizon = time.time() - getattr(settings, 'REPLICA_MAX_LAG', 5) - 1
+    return any(changed_at is not None and changed_at >= horizon for changed_at in changed)
+
+
+class Route:
+    """Routing state of one request."""
+
+    def __init__(self, eligible):
+        self.eligible = eligible
+        # Until a public read view calls allow_replica_reads(), reads use the primary
+        self.use_replicas = False
+        self.replica = _UNSET
+        self.wrote = False
+
+    def read_alias(self):
+        if not self.use_replicas or self.wrote:
+            return DEFAULT_DB_ALIAS
+        if self.replica is _UNSET:
+            self.replica = health.pick()
+        return self.replica or DEFAULT_DB_ALIAS
+
+
+# ─────────────────────────────────────────────────────────────
+# HEALTH
+# ─────────────────────────────────────────────────────────────
+
+def replica_lag(connection):
+    """Seconds the replica is behind, or None when replication is stopped."""
+    with connection.cursor() as cursor:
+        if connection.vendor != 'mysql':
+            cursor.execute('SELECT 1')
+            return 0
+        cursor.execute('SHOW SLAVE STATUS')
+        row = cursor.fetchone()
+        if row is None:
+            # Not set up as a replica (e.g. a copy standing in for one)
+            return 0
+        columns = [column[0] for column in cursor.description]
+        return dict(zip(columns, row)).get('Seconds_Behind_Master')
+
+
+class ReplicaHealth:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._checked = {}  # alias -> (monotonic time, healthy)
+        self._checker_pid = None
+
+    def pick(self):
+        """A random healthy replica, or None."""
+        self.start()
+        replicas = [alias for alias in getattr(settings, 'DATABASE_REPLICAS', ()) if self.is_healthy(alias)]
+        return random.choice(replicas) if replicas else None
+
+    def is_healthy(self, alias):
+        """The last check's verdict; unknown or outdated (the checker stalled) counts as down."""
+        checked = self._checked.get(alias)
+        max_age = 3 * getattr(settings, 'REPLICA_CHECK_INTERVAL', 5)
+        return checked is not None and checked[1] and time.monotonic() - checked[0] < max_age
+
+    def record(self, alias, healthy):
+        with self._lock:
+            self._checked[alias] = (time.monotonic(), healthy)
+
+    def start(self):
+        """Start this process's checker thread, once (again in a forked worker)."""
+        if self._checker_pid == os.getpid() or not getattr(settings, 'DATABASE_REPLICAS', ()):
+            return
+        with self._lock:
+            if self._checker_pid == os.getpid():
+                return
+            self._checker_pid = os.getpid()
+        threading.Thread(target=self._run, name='nksc-replica-health', daemon=True).start()
+
+    def check_all(self):
+        for alias in getattr(settings, 'DATABASE_REPLICAS', ()):
+            self.record(alias, self._check(alias))
+
+    def _run(self):
+        while True:
+            try:
+                self.check_all()
+            except Exception:
+                logger.exception("Replica health checks failed")
+            time.sleep(getattr(settings, 'REPLICA_CHECK_INTERVAL', 5))
+
+    def _check(self, alias):
+        connection = None
+        try:
+            connection = connections[alias]
+            lag = replica_lag(connection)
+        except Exception:
+            logger.warning("Replica %s failed its health check", alias, exc_info=True)
+            return False
+        finally:
+            # Hand the connection back between checks (to the pool, for pooled_mysql)
+            if connection is not None:
+                connection.close()
+        if lag is None or lag > getattr(settings, 'REPLICA_MAX_LAG', 5):
+            logger.warning("Replica %s is lagging (%s s behind)", alias, lag)
+            return False
+        return True
+
+
+health = ReplicaHealth()
+
+
+# ─────────────────────────────────────────────────────────────
+# ROUTER
+# ─────────────────────────────────────────────────────────────
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        route = _route.get()
+        if route is None or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return route.read_alias()
+
+    def db_for_write(self, model, **hints):
+        route = _route.get()
+        if route is not None:
+            route.wrote = True
+        # Explicit, so instances read from a replica are still saved to the primary
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        # Replicas receive schema changes through replication
+        return db not in getattr(settings, 'DATABASE_REPLICAS', ())
+
+
+# ─────────────────────────────────────────────────────────────
+# MIDDLEWARE
+# ─────────────────────────────────────────────────────────────
+
+class ReplicaRoutingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        route, token = self._begin(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            _route.reset(token)
+        return self._finish(route, response)
+
+    async def __acall__(self, request):
+        route, token = self._begin(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _route.reset(token)
+        return self._finish(route, response)
+
+    def process_exception(self, request, exception):
+        route = _route.get()
+        if (route is not None and isinstance(exception, (OperationalError, InterfaceError))
+                and route.replica not in (_UNSET, None)):
+            logger.warning("Replica %s failed during a request; using the primary", route.replica)
+            health.record(route.replica, False)
+
+    @staticmethod
+    def _begin(request):
+        cookie = getattr(settings, 'REPLICA_PIN_COOKIE', 'db_pin')
+        route = Route(eligible=request.method in SAFE_METHODS and cookie not in request.COOKIES)
+        return route, _route.set(route)
+
+    @staticmethod
+    def _finish(route, response):
+        if route.wrote:
+            response.set_cookie(
+                getattr(settings, 'REPLICA_PIN_COOKIE', 'db_pin'), '1',
+                max_age=getattr(settings, 'REPLICA_PIN_SECONDS', 15),
+                httponly=True, samesite='Lax',
+            )
+        return response
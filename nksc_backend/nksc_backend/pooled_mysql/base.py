@@ -0,0 +1,101 @@
+"""
+MySQL engine (PyMySQL through ``install_as_MySQLdb``) whose connections come
+from a per-process pool instead of a fresh TCP connect, authentication and
+``init_command`` per request.
+
+Django still "closes" the connection at the end of every request
+(``CONN_MAX_AGE = 0``); here that returns it to the pool, so the next request
+in any thread of the same worker picks it up. Session state set up by
+``init_connection_state`` survives on the connection and is not sent again.
+Connections closed inside a transaction, or found broken after a database
+error, are dropped instead of returned.
+
+Settings, under ``DATABASES[alias]['POOL']``: ``MAX_SIZE`` (open connections
+per worker), ``RECYCLE`` (maximum age in seconds), ``TIMEOUT`` (seconds to wait
+when all are in use), ``HEALTH_CHECK_AFTER`` (idle seconds after which a
+connection is pinged before reuse) and ``MAX_IDLE`` (idle seconds after which
+it is closed). See ``pool.py``.
+
+A pool is keyed by the connection parameters as well as the alias, so changed
+settings (e.g. a test database name, or a rotated password) get a pool of
+their own; the pool they replace is closed.
+"""
+import os
+import threading
+
+from django.db.backends.mysql import base as mysql
+
+from .pool import ConnectionPool, PoolExhausted
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(alias):
+    """This process's pool for ``alias``, or None if nothing has been pooled yet."""
+    return pools().get(alias)
+
+
+def pools():
+    """``{alias: pool}`` of this process."""
+    pid = os.getpid()
+    return {alias: pool for (owner, alias, _), pool in _pools.items() if owner == pid}
+
+
+def _params_key(conn_params):
+    # 'conv' is Django's shared converter table, the same for every connection
+    return repr(sorted((name, value) for name, value in conn_params.items() if name != 'conv'))
+
+
+class DatabaseWrapper(mysql.DatabaseWrapper):
+    def _pool(self, conn_params):
+        # Keyed by pid: a forked worker must not share its parent's sockets
+        key = (os.getpid(), self.alias, _params_key(conn_params))
+        replaced = []
+        if key not in _pools:
+            with _pools_lock:
+                if key not in _pools:
+                    replaced = [_pools.pop(other) for other in list(_pools) if other[:2] == key[:2]]
+                    options = self.settings_dict.get('POOL', {})
+                    _pools[key] = ConnectionPool(
+                        lambda: super(DatabaseWrapper, self).get_new_connection(conn_params),
+                        max_size=options.get('MAX_SIZE', 8),
+                        recycle=options.get('RECYCLE', 3600),
+                        timeout=options.get('TIMEOUT', 10),
+                        health_check_after=options.get('HEALTH_CHECK_AFTER', 30),
+                        max_idle=options.get('MAX_IDLE', 300),
+                    )
+            for pool in replaced:
+                pool.close_idle()
+        return _pools[key]
+
+    def get_new_connection(self, conn_params):
+        pool = self._pool(conn_params)
+        try:
+            connection = pool.acquire()
+        except PoolExhausted as exc:
+            raise mysql.Database.OperationalError(str(exc)) from exc
+        self._connection_pool = pool
+        return connection
+
+    def init_connection_state(self):
+        if getattr(self.connection, '_nksc_initialized', False):
+            return
+        super().init_connection_state()
+        self.connection._nksc_initialized = True
+
+    def _close(self):
+        if self.connection is None:
+            return
+        # The pool it came from, which may since have been replaced
+        pool = getattr(self, '_connection_pool', None)
+        if pool is None:
+            return super()._close()
+
+        reusable = not self.in_atomic_block and (not self.errors_occurred or self.is_usable())
+        if reusable and not self.autocommit:
+            try:
+                self.connection.rollback()
+            except mysql.Database.Error:
+                reusable = False
+        pool.release(self.connection, reusable=reusable)
@@ -0,0 +1,189 @@
+"""
+A thread-safe pool of DB-API connections, one per process and database alias.
+
+``acquire()`` hands out the most recently returned idle connection (the one
+least likely to have been dropped by the server), opening a new one while
+fewer than ``max_size`` are open and otherwise waiting up to ``timeout``
+seconds for one to come back. Connections are:
+
+* health checked with a ping when they have sat idle for ``health_check_after``
+  seconds or more; a failed ping discards the connection and tries the next;
+* closed once they have sat idle for ``max_idle`` seconds, checked on every
+  checkout, so a quiet worker gives back what it opened during a burst;
+* recycled (closed and replaced) once they are ``recycle`` seconds old, so
+  server-side limits such as ``wait_timeout`` are never reached;
+* discarded instead of returned when the caller says they are not reusable.
+
+``stats()`` reports the counters of this process, which is what a gunicorn
+worker needs to size ``max_size``.
+"""
+import collections
+import os
+import threading
+import time
+
+
+class PoolExhausted(Exception):
+    pass
+
+
+class ConnectionPool:
+    def __init__(self, connect, max_size=8, recycle=3600, timeout=10, health_check_after=30, max_idle=300):
+        self._connect = connect
+        self.max_size = max_size
+        self.recycle = recycle
+        self.timeout = timeout
+        self.health_check_after = health_check_after
+        self.max_idle = max_idle
+
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._idle = collections.deque()  # (connection, created, returned), most recent last
+        self._in_use = {}  # id(connection) -> created
+        self._open = 0
+
+        self._counters = dict.fromkeys((
+            'connections_created', 'connections_reused', 'connections_recycled',
+            'health_check_failures', 'connections_discarded', 'connections_idle_closed', 'waits', 'timeouts',
+        ), 0)
+        self._wait_seconds = 0.0
+
+    # ─────────────────────────────────────────────────────────────
+    # CHECKOUT / RETURN
+    # ─────────────────────────────────────────────────────────────
+
+    def acquire(self):
+        self.close_idle(self.max_idle)
+        deadline = time.monotonic() + self.timeout
+        while True:
+            with self._lock:
+                entry = self._pop_idle()
+                if entry is None:
+                    if self._open < self.max_size:
+                        self._open += 1
+                    else:
+                        self._wait(deadline)
+                        continue
+
+            if entry is None:
+                return self._new_connection()
+
+            connection, created, returned = entry
+            if time.monotonic() - returned >= self.health_check_after and not self._ping(connection):
+                self._discard(connection, 'health_check_failures')
+                continue
+            with self._lock:
+                self._in_use[id(connection)] = created
+                self._counters['connections_reused'] += 1
+            return connection
+
+    def release(self, connection, reusable=True):
+        """Give ``connection`` back, or close it when it is not ``reusable`` or too old."""
+        with self._lock:
+            created = self._in_use.pop(id(connection), None)
+        if created is None:
+            # Not handed out by this pool (e.g. opened before a fork)
+            self._close(connection)
+            return
+        if not reusable:
+            self._discard(connection, 'connections_discarded')
+        elif time.monotonic() - created >= self.recycle:
+            self._discard(connection, 'connections_recycled')
+        else:
+            with self._lock:
+                self._idle.append((connection, created, time.monotonic()))
+                self._available.notify()
+
+    def close_idle(self, idle_for=0):
+        """
+        Close the connections that have sat idle for ``idle_for`` seconds or more;
+        all of them by default, e.g. before the process exits.
+        """
+        idle = []
+        with self._lock:
+            now = time.monotonic()
+            # Oldest returned first
+            while self._idle and now - self._idle[0][2] >= idle_for:
+                idle.append(self._idle.popleft())
+            if idle:
+                self._open -= len(idle)
+                self._counters['connections_idle_closed'] += len(idle)
+                self._available.notify_all()
+        for connection, _, _ in idle:
+            self._close(connection)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'pid': os.getpid(),
+                'max_size': self.max_size,
+                'open': self._open,
+                'in_use': len(self._in_use),
+                'idle': len(self._idle),
+                **self._counters,
+                'wait_seconds_total': round(self._wait_seconds, 3),
+            }
+
+    # ─────────────────────────────────────────────────────────────
+    # INTERNALS
+    # ─────────────────────────────────────────────────────────────
+
+    def _pop_idle(self):
+        """The warmest idle connection still young enough; older ones are recycled. Lock held."""
+        while self._idle:
+            connection, created, returned = self._idle.pop()
+            if time.monotonic() - created < self.recycle:
+                return connection, created, returned
+            self._open -= 1
+            self._counters['connections_recycled'] += 1
+            self._close(connection)
+        return None
+
+    def _wait(self, deadline):
+        """Wait for a connection to come back. Lock held."""
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            self._counters['timeouts'] += 1
+            raise PoolExhausted(
+                f"No database connection available: all {self.max_size} are in use "
+                f"after waiting {self.timeout}s"
+            )
+        self._counters['waits'] += 1
+        started = time.monotonic()
+        self._available.wait(remaining)
+        self._wait_seconds += time.monotonic() - started
+
+    def _new_connection(self):
+        try:
+            connection = self._connect()
+        except Exception:
+            with self._lock:
+                self._open -= 1
+                self._available.notify()
+            raise
+        with self._lock:
+            self._in_use[id(connection)] = time.monotonic()
+            self._counters['connections_created'] += 1
+        return connection
+
+    def _discard(self, connection, counter):
+        with self._lock:
+            self._open -= 1
+            self._counters[counter] += 1
+            self._available.notify()
+        self._close(connection)
+
+    @staticmethod
+    def _ping(connection):
+        try:
+            connection.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _close(connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
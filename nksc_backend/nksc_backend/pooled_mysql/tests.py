@@ -0,0 +1,121 @@
+import threading
+import time
+from unittest import mock
+
+from django.db.backends.mysql import base as mysql
+from django.test import SimpleTestCase
+
+from . import base
+from .pool import ConnectionPool, PoolExhausted
+
+
+class FakeConnection:
+    def __init__(self):
+        self.alive = True
+        self.closed = False
+
+    def ping(self, reconnect=False):
+        if not self.alive:
+            raise ConnectionError("gone away")
+
+    def close(self):
+        self.closed = True
+
+
+class ConnectionPoolTests(SimpleTestCase):
+    def make_pool(self, **options):
+        self.opened = []
+
+        def connect():
+            self.opened.append(FakeConnection())
+            return self.opened[-1]
+        return ConnectionPool(connect, **options)
+
+    def test_connections_are_reused(self):
+        pool = self.make_pool()
+        first = pool.acquire()
+        pool.release(first)
+        self.assertIs(pool.acquire(), first)
+
+        stats = pool.stats()
+        self.assertEqual((stats['connections_created'], stats['connections_reused']), (1, 1))
+        self.assertEqual((stats['open'], stats['in_use'], stats['idle']), (1, 1, 0))
+
+    def test_broken_and_old_connections_are_replaced(self):
+        pool = self.make_pool(health_check_after=0)
+        connection = pool.acquire()
+        pool.release(connection)
+        connection.alive = False
+        self.assertIsNot(pool.acquire(), connection)
+        self.assertTrue(connection.closed)
+        self.assertEqual(pool.stats()['health_check_failures'], 1)
+
+        pool = self.make_pool(recycle=0)
+        connection = pool.acquire()
+        pool.release(connection)
+        self.assertTrue(connection.closed)
+        self.assertEqual(pool.stats()['connections_recycled'], 1)
+
+        pool = self.make_pool()
+        connection = pool.acquire()
+        pool.release(connection, reusable=False)
+        self.assertTrue(connection.closed)
+        self.assertEqual(pool.stats()['open'], 0)
+
+    def test_max_size_waits_then_times_out(self):
+        pool = self.make_pool(max_size=1, timeout=0.05)
+        connection = pool.acquire()
+        with self.assertRaises(PoolExhausted):
+            pool.acquire()
+
+        pool.timeout = 5
+        threading.Timer(0.05, pool.release, (connection,)).start()
+        self.assertIs(pool.acquire(), connection)
+        stats = pool.stats()
+        self.assertEqual((stats['timeouts'], stats['waits'], stats['connections_created']), (1, 2, 1))
+
+    def test_idle_connections_are_closed_on_checkout(self):
+        pool = self.make_pool(max_idle=60)
+        first, second = pool.acquire(), pool.acquire()
+        pool.release(first)
+        pool.release(second)
+
+        with mock.patch('time.monotonic', return_value=time.monotonic() + 61):
+            third = pool.acquire()
+        self.assertTrue(first.closed and second.closed)
+        self.assertNotIn(third, (first, second))
+        stats = pool.stats()
+        self.assertEqual((stats['open'], stats['connections_idle_closed']), (1, 2))
+
+        pool.release(third)
+        pool.close_idle()
+        self.assertTrue(third.closed)
+        self.assertEqual(pool.stats()['open'], 0)
+
+
+class PooledDatabaseWrapperTests(SimpleTestCase):
+    def setUp(self):
+        patcher = mock.patch.object(mysql.DatabaseWrapper, 'get_new_connection', lambda self, params: FakeConnection())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(base._pools.clear)
+
+    def connect(self, wrapper, name):
+        connection = wrapper.get_new_connection({'db': name, 'conv': {}})
+        wrapper.connection, wrapper.autocommit = connection, True
+        return connection
+
+    def test_pools_are_keyed_by_connection_params(self):
+        wrapper = base.DatabaseWrapper({'NAME': 'nksc_db', 'POOL': {}}, alias='pooled')
+        first = self.connect(wrapper, 'nksc_db')
+        pool = base.get_pool('pooled')
+        wrapper._close()
+        self.assertIs(self.connect(wrapper, 'nksc_db'), first)
+        wrapper._close()
+
+        # New settings get a new pool, and the old one closes what it kept
+        other = self.connect(wrapper, 'test_nksc_db')
+        self.assertIsNot(other, first)
+        self.assertTrue(first.closed)
+        self.assertIsNot(base.get_pool('pooled'), pool)
+        self.assertEqual(list(base.pools()), ['pooled'])
@@ -2,6 +2,8 @@ import logging
 from datetime import timedelta
 from pathlib import Path
 import os
+import sys
+import tempfile
 import pymysql
 
 # Monkey patch for Django to work with PyMySQL
@@ -19,6 +21,7 @@ SECRET_KEY = 'django-insecure-1gm7eozzeu3ac8c6_rycbegs6x3*hxu%z_^bnthml(qrhr%50_
 
 DEBUG = True
 PRODUCTION = True
+TESTING = sys.argv[1:2] == ['test']
 
 # ========== ALLOWED HOSTS ==========
 ALLOWED_HOSTS = [
@@ -57,10 +60,14 @@ INSTALLED_APPS = [
     "publications",
     "user_management",
     "about",
+    "home",
+    "monitoring",
 ]
 
 MIDDLEWARE = [
+    'monitoring.middleware.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'nksc_backend.db_router.ReplicaRoutingMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -90,11 +97,23 @@ TEMPLATES = [
 WSGI_APPLICATION = 'nksc_backend.wsgi.application'
 
 # ========== DATABASE CONFIGURATION WITH IF/ELSE ==========
+# Connections are pooled per worker process (see nksc_backend/pooled_mysql/).
+# Django hands each connection back at the end of the request (CONN_MAX_AGE 0)
+# and the pool keeps it open for the next one. Pool stats per worker:
+# /api/monitoring/db-pool/.
+DATABASE_POOL = {
+    'MAX_SIZE': int(os.environ.get('DB_POOL_MAX_SIZE', 8)),
+    'RECYCLE': int(os.environ.get('DB_POOL_RECYCLE', 3600)),
+    'TIMEOUT': int(os.environ.get('DB_POOL_TIMEOUT', 10)),
+    'HEALTH_CHECK_AFTER': int(os.environ.get('DB_POOL_HEALTH_CHECK_AFTER', 30)),
+    'MAX_IDLE': int(os.environ.get('DB_POOL_MAX_IDLE', 300)),
+}
+
 if PRODUCTION:
     # Production database (Docker container)
     DATABASES = {
         'default': {
-            'ENGINE': 'django.db.backends.mysql',
+            'ENGINE': 'nksc_backend.pooled_mysql',
             'NAME': 'nksc_db',
             'USER': 'root',
             'PASSWORD': 'Nksc@2026',  # Your MySQL password
@@ -103,7 +122,9 @@ if PRODUCTION:
             'OPTIONS': {
                 'init_command': "SET sql_mode='STRICT_TRANS_TABLES'",
                 'charset': 'utf8mb4',
-            }
+            },
+            'CONN_MAX_AGE': 0,
+            'POOL': DATABASE_POOL,
         }
     }
     print("=" * 50)
@@ -114,7 +135,7 @@ else:
     # Development database (local machine)
     DATABASES = {
         'default': {
-            'ENGINE': 'django.db.backends.mysql',
+            'ENGINE': 'nksc_backend.pooled_mysql',
             'NAME': 'nksc_db',
             'USER': 'root',
             'PASSWORD': '',  # Your local MySQL password (empty for development)
@@ -123,7 +144,9 @@ else:
             'OPTIONS': {
                 'init_command': "SET sql_mode='STRICT_TRANS_TABLES'",
                 'charset': 'utf8mb4',
-            }
+            },
+            'CONN_MAX_AGE': 0,
+            'POOL': DATABASE_POOL,
         }
     }
     print("=" * 50)
@@ -131,6 +154,71 @@ else:
     print(f"Database Host: {DATABASES['default']['HOST']}")
     print("=" * 50)
 
+# ========== READ REPLICAS ==========
+# DB_REPLICA_HOSTS=host1,host2 adds a read-only alias per host (a copy of
+# 'default' on that host). Public GETs read from a healthy replica and writers
+# keep reading the primary for REPLICA_PIN_SECONDS; see nksc_backend/db_router.py.
+DATABASE_REPLICAS = []
+for number, host in enumerate(filter(None, os.environ.get('DB_REPLICA_HOSTS', '').split(',')), 1):
+    DATABASES[f'replica_{number}'] = {**DATABASES['default'], 'HOST': host.strip(), 'TEST': {'MIRROR': 'default'}}
+    DATABASE_REPLICAS.append(f'replica_{number}')
+if TESTING:
+    # A second alias for the routing tests in nksc_backend/tests.py; reads only
+    # go there while a test lists it in DATABASE_REPLICAS
+    DATABASES['test_replica'] = {**DATABASES['default'], 'TEST': {'MIRROR': 'default'}}
+
+DATABASE_ROUTERS = ['nksc_backend.db_router.ReplicaRouter']
+REPLICA_MAX_LAG = 5
+REPLICA_CHECK_INTERVAL = 5
+REPLICA_PIN_COOKIE = 'db_pin'
+REPLICA_PIN_SECONDS = 15
+
+# ========== CACHE ==========
+# Shared Redis (the nksc-redis service) in production so every gunicorn worker
+# sees the same entries; per-process memory for development and the test runner.
+# Apps cache under versioned namespaces, see utils/cache.py.
+CACHE_DEFAULT_TIMEOUT = 300
+
+if PRODUCTION and not TESTING:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ.get('REDIS_URL', 'redis://nksc-redis:6379/1'),
+            'KEY_PREFIX': 'nksc',
+            'TIMEOUT': CACHE_DEFAULT_TIMEOUT,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'nksc',
+            'TIMEOUT': CACHE_DEFAULT_TIMEOUT,
+        }
+    }
+
+# Per-route metrics at /api/metrics/ (see monitoring/metrics.py): each worker
+# writes its totals here, from a timer thread, every METRICS_FLUSH_INTERVAL seconds
+METRICS_DIR = os.environ.get('METRICS_DIR', os.path.join(BASE_DIR, 'logs', 'metrics'))
+if TESTING:
+    METRICS_DIR = os.path.join(tempfile.gettempdir(), 'nksc-test-metrics')
+METRICS_FLUSH_INTERVAL = 5
+
+# Shared-cache lifetimes of public read endpoints (see utils/http_cache.py)
+HTTP_CACHE_S_MAXAGE = 60
+HTTP_CACHE_STALE_WHILE_REVALIDATE = 300
+
+# /api/home/ runs its sections on this many threads (0 runs them one after another)
+HOME_BUNDLE_WORKERS = 4
+HOME_BUNDLE_CACHE_TIMEOUT = 300
+
+# ========== SERVER PROFILE ==========
+# 'sync': gunicorn sync workers on wsgi.py. 'async': uvicorn workers on asgi.py,
+# with the hot public reads routed to their async views (each app's
+# async_views.py). Both are read by gunicorn.conf.py.
+SERVER_PROFILE = os.environ.get('SERVER_PROFILE', 'sync')
+ASYNC_READ_VIEWS = SERVER_PROFILE == 'async'
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -157,6 +245,11 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.AllowAny",
     ),
+    # DRF's defaults, with JSON rendering timed for /api/metrics/
+    "DEFAULT_RENDERER_CLASSES": (
+        "monitoring.renderers.JSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
 }
 
 SPECTACULAR_SETTINGS = {
@@ -207,6 +300,39 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 MEDIA_URL = '/media/'
 MEDIA_ROOT = MEDIA_DIR
 
+# Pre-split article/prelims PDFs (see journal/pdf_cache.py)
+JOURNAL_PDF_CACHE_DIR = os.path.join(MEDIA_DIR, 'journal_cache')
+
+# Seconds filter_journals statistics stay memoized (journal writes invalidate them sooner)
+JOURNAL_STATS_CACHE_TIMEOUT = 600
+
+# Signed on-demand image resizes (see utils/images.py), pruned least recently used first
+IMAGE_CACHE_DIR = os.path.join(MEDIA_DIR, 'image_cache')
+IMAGE_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+# Rendered /api/about/ responses (see about/snapshot.py), rebuilt when about content changes
+ABOUT_SNAPSHOT_DIR = os.path.join(MEDIA_DIR, 'about_snapshot')
+
+# Large file delivery (see utils/file_delivery.py)
+# '' streams from Django, 'x-accel' hands off to nginx, 'x-sendfile' to Apache/lighttpd
+FILE_DELIVERY_OFFLOAD = os.environ.get('FILE_DELIVERY_OFFLOAD', '')
+# nginx `internal` location aliased to MEDIA_ROOT, e.g.
+#   location /protected-media/ { internal; alias /app/media/; }
+FILE_DELIVERY_ACCEL_PREFIX = '/protected-media/'
+
+# In-process worker pool for post-upload processing (see utils/background.py).
+# Inline under the test runner: a pool thread can't see the rows of a test's
+# open transaction (and SQLite locks it out of the table).
+BACKGROUND_TASKS_ASYNC = not TESTING
+BACKGROUND_TASK_WORKERS = 2
+
+# Bulk gallery uploads (see media_stuff/bulk_upload.py): files per request and processing threads
+DATA_UPLOAD_MAX_NUMBER_FILES = 500
+GALLERY_UPLOAD_WORKERS = 4
+
+# Detail views buffer hits and write them at most this often (see utils/view_counter.py)
+VIEW_COUNT_FLUSH_INTERVAL = 30
+
 # ========== CSRF AND CORS SETTINGS ==========
 CSRF_TRUSTED_ORIGINS = [
     "http://localhost:4200",
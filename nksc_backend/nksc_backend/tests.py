@@ -0,0 +1,168 @@
+import time
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache as django_cache
+from django.db import OperationalError, connections
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from news.models import News, NewsCategory
+from utils import cache
+
+from . import db_router
+
+
+class ReplicaTestMixin:
+    def setUp(self):
+        # Health is recorded by hand; no checker thread
+        patcher = mock.patch.object(db_router.health, 'start')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(db_router.health._checked.clear)
+        django_cache.clear()
+        self.addCleanup(django_cache.clear)
+
+
+@override_settings(DATABASE_REPLICAS=['replica'], REPLICA_CHECK_INTERVAL=3600)
+class ReplicaRouterTests(ReplicaTestMixin, SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        db_router.health.record('replica', True)
+        self.router = db_router.ReplicaRouter()
+
+    def request(self, request, public=True, write=False):
+        """
+        Run ``request`` through the middleware; the response body is the alias
+        reads used. ``public`` views opt in to replica reads like ``conditional_read``.
+        """
+        def view(request):
+            if public:
+                db_router.allow_replica_reads('news')
+            reads = [self.router.db_for_read(News)]
+            if write:
+                self.router.db_for_write(News)
+                reads.append(self.router.db_for_read(News))
+            return HttpResponse(','.join(reads))
+        return db_router.ReplicaRoutingMiddleware(view)(request)
+
+    def test_only_public_reads_use_the_replica(self):
+        self.assertEqual(self.request(RequestFactory().get('/api/news/')).content, b'replica')
+        self.assertEqual(self.request(RequestFactory().get('/admin/news/'), public=False).content, b'default')
+        self.assertEqual(self.request(RequestFactory().post('/api/news/')).content, b'default')
+        # Outside a request
+        self.assertEqual(self.router.db_for_read(News), 'default')
+        self.assertEqual(self.router.db_for_write(News), 'default')
+
+    def test_reads_the_primary_right_after_an_invalidation(self):
+        cache.invalidate('news')
+        self.assertEqual(self.request(RequestFactory().get('/api/news/')).content, b'default')
+
+        with mock.patch('time.time', return_value=time.time() + 10):
+            self.assertEqual(self.request(RequestFactory().get('/api/news/')).content, b'replica')
+
+    def test_writers_read_their_writes(self):
+        response = self.request(RequestFactory().post('/api/news/admin/create/'), write=True)
+        self.assertEqual(response.content, b'default,default')
+        self.assertEqual(response.cookies['db_pin']['max-age'], 15)
+
+        pinned = RequestFactory().get('/api/news/')
+        pinned.COOKIES['db_pin'] = '1'
+        self.assertEqual(self.request(pinned).content, b'default')
+
+        # A write in a GET moves the rest of that request to the primary
+        self.assertEqual(self.request(RequestFactory().get('/api/news/'), write=True).content, b'replica,default')
+
+    def test_falls_back_to_the_primary(self):
+        db_router.health.record('replica', False)
+        self.assertEqual(self.request(RequestFactory().get('/api/news/')).content, b'default')
+
+        # Not checked yet
+        db_router.health._checked.clear()
+        self.assertEqual(self.request(RequestFactory().get('/api/news/')).content, b'default')
+
+        # A failing check ('replica' is not a configured database here)
+        with self.assertLogs('nksc_backend.db_router', 'WARNING'):
+            db_router.health.check_all()
+        self.assertFalse(db_router.health.is_healthy('replica'))
+
+        # A verdict the checker has not renewed for three intervals
+        db_router.health.record('replica', True)
+        with mock.patch('time.monotonic', return_value=time.monotonic() + 3 * 3600):
+            self.assertFalse(db_router.health.is_healthy('replica'))
+
+    def test_replica_errors_mark_it_down(self):
+        def view(request):
+            db_router.allow_replica_reads('news')
+            self.router.db_for_read(News)
+            middleware.process_exception(request, OperationalError("gone away"))
+            return HttpResponse()
+        middleware = db_router.ReplicaRoutingMiddleware(view)
+        with self.assertLogs('nksc_backend.db_router', 'WARNING'):
+            middleware(RequestFactory().get('/api/news/'))
+        self.assertFalse(db_router.health.is_healthy('replica'))
+
+
+@override_settings(DATABASE_REPLICAS=['test_replica'], REPLICA_CHECK_INTERVAL=3600)
+class ReplicaRoutingDatabaseTests(ReplicaTestMixin, TransactionTestCase):
+    """
+    Whole requests against two aliases: 'test_replica' is a second connection to
+    the test database, so the rows have to be committed for it to see them.
+    """
+    databases = {'default', 'test_replica'}
+
+    def setUp(self):
+        super().setUp()
+        category = NewsCategory.objects.create(name="Seminar", slug="seminar")
+        News.objects.create(title="News", slug="news", short_description="S", content="C",
+                            category=category, is_published=True)
+        # Forget the invalidations, as if the rows were old
+        django_cache.clear()
+        db_router.health.record('test_replica', True)
+        self.client = APIClient()
+
+    def get(self, client, path):
+        """``(response, queries on default, queries on the replica)``"""
+        with CaptureQueriesContext(connections['default']) as primary, \
+                CaptureQueriesContext(connections['test_replica']) as replica:
+            response = client.get(path)
+        return response, len(primary), len(replica)
+
+    def test_anonymous_public_reads_use_the_replica(self):
+        response, primary, replica = self.get(self.client, '/api/news/all/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['data'][0]['slug'], "news")
+        self.assertEqual(primary, 0)
+        self.assertGreater(replica, 0)
+
+    def test_signed_in_and_admin_reads_use_the_primary(self):
+        self.client.force_authenticate(User.objects.create_user('editor', is_staff=True))
+        for path in ('/api/news/all/', '/api/news/admin/all/'):
+            response, primary, replica = self.get(self.client, path)
+            self.assertEqual(response.status_code, 200, path)
+            self.assertGreater(primary, 0, path)
+            self.assertEqual(replica, 0, path)
+
+    def test_writer_is_pinned_and_fresh_changes_read_the_primary(self):
+        editor = APIClient()
+        editor.force_authenticate(User.objects.create_user('editor', is_staff=True))
+        response = editor.post('/api/news/admin/categories/create/', {'name': "Lecture"}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertIn('db_pin', response.cookies)
+
+        # While the replicas may lag behind the invalidation the cache is filled from the primary
+        response, primary, replica = self.get(self.client, '/api/news/categories/')
+        self.assertEqual((primary > 0, replica), (True, 0))
+        self.assertIn("Lecture", [item['name'] for item in response.json()['data']])
+
+        with mock.patch('time.time', return_value=time.time() + 10):
+            _, primary, replica = self.get(self.client, '/api/news/all/')
+            self.assertEqual((primary, replica > 0), (0, True))
+
+            # The public site in the editor's browser carries the pin cookie
+            browser = APIClient()
+            browser.cookies.update(editor.cookies)
+            _, primary, replica = self.get(browser, '/api/news/all/?page=1')
+            self.assertEqual((primary > 0, replica), (True, 0))
@@ -8,6 +8,9 @@ from drf_spectacular.views import (
 from django.conf.urls.static import static
 from django.conf import settings
 
+from monitoring import views as monitoring_views
+from utils import images
+
 urlpatterns = [
     path('jet/', include('jet.urls', 'jet')),
     path('jet/dashboard/', include('jet.dashboard.urls', 'jet-dashboard')),
@@ -39,6 +42,10 @@ urlpatterns = [
     path('api/gallery/', include('media_stuff.urls')),
     path('api/staff/', include('staff.urls')),
     path('api/about/', include('about.urls')),
+    path('api/home/', include('home.urls')),
+    path('api/monitoring/', include('monitoring.urls')),
+    path('api/metrics/', monitoring_views.get_metrics, name='metrics'),
+    path('api/img/<path:path>', images.resized_image, name='resized-image'),
 
 ]
 urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
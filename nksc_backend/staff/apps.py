@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class StaffConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'staff'
+
+    def ready(self):
+        from utils import cache
+
+        cache.register_dependency(
+            'staff',
+            'staff.Department', 'staff.Staff', 'staff.StaffEducation', 'staff.StaffExperience',
+        )
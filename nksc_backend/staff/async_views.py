@@ -0,0 +1,31 @@
+"""
+Async versions of the public staff reads, routed when ``ASYNC_READ_VIEWS``
+is on (see ``utils/async_views.py``). Bodies match the views in ``views.py``.
+"""
+from utils.async_views import async_read
+
+from .models import Department
+from .serializers import DepartmentSerializer
+from .stats import astaff_stats
+
+
+@async_read('staff', cached=True)
+async def get_departments(request):
+    """Get all departments"""
+    departments = Department.objects.with_staff_count().order_by('display_order', 'name')
+    serializer = DepartmentSerializer([department async for department in departments], many=True)
+
+    return {
+        'success': True,
+        'count': len(serializer.data),
+        'data': serializer.data
+    }
+
+
+@async_read('staff')
+async def get_staff_stats(request):
+    """Get staff statistics"""
+    return {
+        'success': True,
+        'stats': await astaff_stats()
+    }
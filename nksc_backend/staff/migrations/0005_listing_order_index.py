@@ -0,0 +1,17 @@
+# Generated by Django 4.2.11 on 2026-10-17 11:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('staff', '0004_alter_department_color'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='staff',
+            index=models.Index(fields=['display_order', 'name'], name='staff_staff_display_dcecb4_idx'),
+        ),
+    ]
@@ -1,7 +1,14 @@
 from django.db import models
+from django.db.models import Count, Q
 from django.utils.text import slugify
 
 
+class DepartmentQuerySet(models.QuerySet):
+    def with_staff_count(self):
+        """Annotate active staff per department, read by ``Department.staff_count``."""
+        return self.annotate(active_staff_count=Count('staff', filter=Q(staff__is_active=True)))
+
+
 class Department(models.Model):
     """Staff department/category"""
     name = models.CharField(max_length=100)
@@ -10,6 +17,8 @@ class Department(models.Model):
     icon = models.CharField(max_length=50, default='pi-users', help_text='PrimeNG icon class')
     color = models.CharField(max_length=50, default='bg-blue-100 text-blue-800')
     display_order = models.PositiveIntegerField(default=0)
+
+    objects = DepartmentQuerySet.as_manager()
     
     class Meta:
         ordering = ['display_order', 'name']
@@ -26,6 +35,8 @@ class Department(models.Model):
     
     @property
     def staff_count(self):
+        if getattr(self, 'active_staff_count', None) is not None:
+            return self.active_staff_count
         # FIXED: Use the correct related_name 'staff' (singular)
         return self.staff.filter(is_active=True).count()
 
@@ -94,6 +105,10 @@ class Staff(models.Model):
     
     class Meta:
         ordering = ['display_order', 'name']
+        indexes = [
+            # Keyset pagination walks this index (see utils/pagination.py)
+            models.Index(fields=['display_order', 'name']),
+        ]
         verbose_name = "Staff"
         verbose_name_plural = "Staff"
     
@@ -2,8 +2,11 @@ from rest_framework import serializers
 from .models import Department, Staff, StaffEducation, StaffExperience
 from django.conf import settings
 
+from monitoring.serializers import TimedModelSerializer
+from utils.images import image_url
 
-class DepartmentSerializer(serializers.ModelSerializer):
+
+class DepartmentSerializer(TimedModelSerializer):
     class Meta:
         model = Department
         fields = ['id', 'name', 'slug', 'description', 'icon', 'color', 'display_order']
@@ -15,13 +18,13 @@ class DepartmentSerializer(serializers.ModelSerializer):
         return data
 
 
-class StaffEducationSerializer(serializers.ModelSerializer):
+class StaffEducationSerializer(TimedModelSerializer):
     class Meta:
         model = StaffEducation
         fields = ['id', 'degree', 'institution', 'year', 'description', 'display_order']
 
 
-class StaffExperienceSerializer(serializers.ModelSerializer):
+class StaffExperienceSerializer(TimedModelSerializer):
     duration = serializers.ReadOnlyField()
     
     class Meta:
@@ -29,7 +32,7 @@ class StaffExperienceSerializer(serializers.ModelSerializer):
         fields = ['id', 'position', 'organization', 'start_date', 'end_date', 'is_current', 'duration', 'description', 'display_order']
 
 
-class StaffSerializer(serializers.ModelSerializer):
+class StaffSerializer(TimedModelSerializer):
     department_detail = DepartmentSerializer(source='department', read_only=True)
     education = StaffEducationSerializer(many=True, read_only=True)
     experience = StaffExperienceSerializer(many=True, read_only=True)
@@ -56,7 +59,7 @@ class StaffSerializer(serializers.ModelSerializer):
         # Build absolute URLs for media files
         if request:
             if instance.profile_image:
-                data['profile_image'] = request.build_absolute_uri(instance.profile_image.url)
+                data['profile_image'] = image_url(request, instance.profile_image)
             if instance.cv:
                 data['cv'] = request.build_absolute_uri(instance.cv.url)
         
@@ -66,7 +69,7 @@ class StaffSerializer(serializers.ModelSerializer):
         return data
 
 
-class StaffListSerializer(serializers.ModelSerializer):
+class StaffListSerializer(TimedModelSerializer):
     department_detail = DepartmentSerializer(source='department', read_only=True)
     designation_display = serializers.CharField(source='get_designation_display', read_only=True)
     
@@ -83,6 +86,6 @@ class StaffListSerializer(serializers.ModelSerializer):
         request = self.context.get('request')
         
         if request and instance.profile_image:
-            data['profile_image'] = request.build_absolute_uri(instance.profile_image.url)
+            data['profile_image'] = image_url(request, instance.profile_image)
         
         return data
\ No newline at end of file
@@ -0,0 +1,76 @@
+"""
+Staff statistics for ``StaffStatsAPIView``.
+
+One query groups staff by (designation, department, is_active); totals, the
+active designation breakdown and the active department breakdown are folded
+from those few rows in Python. The result is kept in the ``staff`` cache
+namespace, so it lasts until the next staff or department write.
+"""
+from django.db.models import Count
+
+from utils import cache
+
+from .models import Staff
+
+
+def _grouped_query():
+    return (
+        Staff.objects.order_by().values(
+            'designation', 'is_active',
+            'department_id', 'department__name', 'department__slug', 'department__display_order',
+        ).annotate(count=Count('id'))
+    )
+
+
+def _summarize(rows):
+    total = sum(row['count'] for row in rows)
+    active_rows = [row for row in rows if row['is_active']]
+
+    designations = {}
+    for row in active_rows:
+        designations[row['designation']] = designations.get(row['designation'], 0) + row['count']
+
+    departments = {}
+    for row in active_rows:
+        if row['department_id'] is None:
+            continue
+        if row['department_id'] not in departments:
+            departments[row['department_id']] = {
+                'id': row['department_id'],
+                'name': row['department__name'],
+                'slug': row['department__slug'],
+                'count': 0,
+                '_order': (row['department__display_order'], row['department__name']),
+            }
+        departments[row['department_id']]['count'] += row['count']
+
+    active = sum(row['count'] for row in active_rows)
+    return {
+        'total_staff': total,
+        'active_staff': active,
+        'inactive_staff': total - active,
+        # Labelled and ordered as in DESIGNATION_CHOICES
+        'designation_counts': {
+            label: designations[value]
+            for value, label in Staff.DESIGNATION_CHOICES if designations.get(value)
+        },
+        'department_counts': [
+            {key: value for key, value in department.items() if key != '_order'}
+            for department in sorted(departments.values(), key=lambda item: item['_order'])
+        ],
+    }
+
+
+def staff_stats():
+    """Staff counts, memoized until the next ``staff`` namespace write."""
+    return cache.namespace('staff').get_or_set(('stats',), lambda: _summarize(list(_grouped_query())))
+
+
+async def astaff_stats():
+    """``staff_stats`` for async views."""
+    ns = cache.namespace('staff')
+    stats = await ns.aget('stats')
+    if stats is None:
+        stats = _summarize([row async for row in _grouped_query()])
+        await ns.aset(stats, 'stats')
+    return stats
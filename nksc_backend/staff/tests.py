@@ -1,3 +1,64 @@
+from django.core.cache import cache
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from .models import Department, Staff
+
+
+class DepartmentCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        Department.objects.create(name="Research")
+        self.client = APIClient()
+
+    def test_listing_is_cached_until_a_department_changes(self):
+        self.client.get('/api/staff/departments/')
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/staff/departments/')
+        self.assertEqual([d['name'] for d in response.data['data']], ["Research"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Department.objects.create(name="Archive")
+        response = self.client.get('/api/staff/departments/')
+        self.assertEqual([d['name'] for d in response.data['data']], ["Archive", "Research"])
+
+
+class StaffStatsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        research = Department.objects.create(name="Research", display_order=1)
+        archive = Department.objects.create(name="Archive", display_order=2)
+        Department.objects.create(name="Empty", display_order=3)
+        for number, (designation, department, is_active) in enumerate((
+            ('professor', research, True),
+            ('professor', research, True),
+            ('lecturer', archive, True),
+            ('librarian', archive, False),
+            ('other', None, True),
+        )):
+            Staff.objects.create(
+                name=f"Staff {number}", email=f"staff{number}@example.com",
+                designation=designation, department=department, is_active=is_active,
+            )
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.client = APIClient()
+
+    def test_stats_in_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/staff/stats/')
+        stats = response.data['stats']
+        self.assertEqual((stats['total_staff'], stats['active_staff'], stats['inactive_staff']), (5, 4, 1))
+        self.assertEqual(list(stats['designation_counts'].values()), [2, 1, 1])
+        self.assertEqual([(d['name'], d['count']) for d in stats['department_counts']], [("Research", 2), ("Archive", 1)])
+
+    def test_departments_with_counts_in_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/staff/departments/')
+        self.assertEqual(
+            [(d['name'], d['staff_count']) for d in response.data['data']],
+            [("Research", 2), ("Archive", 1), ("Empty", 0)]
+        )
@@ -1,4 +1,6 @@
+from django.conf import settings
 from django.urls import path
+from . import async_views
 from .views import StaffAPIView, DepartmentAPIView, StaffStatsAPIView
 
 urlpatterns = [
@@ -11,4 +13,10 @@ urlpatterns = [
     
     # Statistics
     path('stats/', StaffStatsAPIView.as_view(), name='staff-stats'),
-]
\ No newline at end of file
+]
+
+if settings.ASYNC_READ_VIEWS:
+    urlpatterns = [
+        path('departments/', async_views.get_departments, name='departments'),
+        path('stats/', async_views.get_staff_stats, name='staff-stats'),
+    ] + urlpatterns
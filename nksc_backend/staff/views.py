@@ -5,12 +5,17 @@ from rest_framework.permissions import AllowAny, IsAdminUser
 from django.shortcuts import get_object_or_404
 from django.db.models import Q
 
+from utils.cache import cached_response
+from utils.http_cache import conditional_read
+from utils.pagination import CursorPaginator, InvalidCursor, cursor_requested, page_size_param
+
 from .models import Department, Staff
 from .serializers import (
     DepartmentSerializer,
     StaffSerializer,
     StaffListSerializer
 )
+from .stats import staff_stats
 
 
 class StaffAPIView(APIView):
@@ -32,6 +37,7 @@ class StaffAPIView(APIView):
         return [IsAdminUser()]
 
     # ========== GET ALL STAFF ==========
+    @conditional_read('staff')
     def get(self, request, id=None):
         """Get all staff or single staff by ID"""
         if id:
@@ -180,6 +186,39 @@ class StaffAPIView(APIView):
         # ===== APPLY FILTERS =====
         staff_list = Staff.objects.filter(filters).order_by(*order_fields)
 
+        filters_applied = {
+            'search': search,
+            'department': department_slug or department_id,
+            'designation': designation,
+            'is_active': is_active,
+            # Add other filters if needed
+        }
+
+        # ===== CURSOR PAGINATION (?cursor=, no COUNT/OFFSET) =====
+        if cursor_requested(request):
+            page_size = page_size_param(request)
+            try:
+                staff_page = CursorPaginator(staff_list, order_fields, page_size).get_page(
+                    request.query_params.get('cursor')
+                )
+            except InvalidCursor as e:
+                return Response({
+                    'success': False,
+                    'message': str(e)
+                }, status=status.HTTP_400_BAD_REQUEST)
+
+            serializer = StaffListSerializer(
+                staff_page.object_list,
+                many=True,
+                context={'request': request}
+            )
+            return Response({
+                'success': True,
+                **staff_page.pagination_data(page_size),
+                'filters_applied': filters_applied,
+                'data': serializer.data
+            })
+
         # ===== PAGINATION =====
         page = int(request.query_params.get('page', 1))
         page_size = int(request.query_params.get('page_size', 20))
@@ -213,13 +252,7 @@ class StaffAPIView(APIView):
             'has_previous': page > 1,
             'next_page': page + 1 if page < total_pages else None,
             'previous_page': page - 1 if page > 1 else None,
-            'filters_applied': {
-                'search': search,
-                'department': department_slug or department_id,
-                'designation': designation,
-                'is_active': is_active,
-                # Add other filters if needed
-            },
+            'filters_applied': filters_applied,
             'data': serializer.data
         })
 
@@ -335,14 +368,16 @@ class StaffAPIView(APIView):
 class DepartmentAPIView(APIView):
     """Department API endpoints"""
 
+    @conditional_read('staff')
+    @cached_response('staff')
     def get(self, request):
         """Get all departments"""
-        departments = Department.objects.all().order_by('display_order', 'name')
+        departments = Department.objects.with_staff_count().order_by('display_order', 'name')
         serializer = DepartmentSerializer(departments, many=True)
 
         return Response({
             'success': True,
-            'count': departments.count(),
+            'count': len(serializer.data),
             'data': serializer.data
         })
 
@@ -350,39 +385,10 @@ class DepartmentAPIView(APIView):
 class StaffStatsAPIView(APIView):
     """Staff statistics"""
 
+    @conditional_read('staff')
     def get(self, request):
         """Get staff statistics"""
-        total_staff = Staff.objects.count()
-        active_staff = Staff.objects.filter(is_active=True).count()
-
-        # Count by designation
-        designation_counts = {}
-        for choice in Staff.DESIGNATION_CHOICES:
-            count = Staff.objects.filter(
-                designation=choice[0], is_active=True).count()
-            if count > 0:
-                designation_counts[choice[1]] = count
-
-        # Count by department
-        department_counts = []
-        departments = Department.objects.all()
-        for dept in departments:
-            count = dept.staff_set.filter(is_active=True).count()
-            if count > 0:
-                department_counts.append({
-                    'id': dept.id,
-                    'name': dept.name,
-                    'slug': dept.slug,
-                    'count': count
-                })
-
         return Response({
             'success': True,
-            'stats': {
-                'total_staff': total_staff,
-                'active_staff': active_staff,
-                'inactive_staff': total_staff - active_staff,
-                'designation_counts': designation_counts,
-                'department_counts': department_counts
-            }
-        })
\ No newline at end of file
+            'stats': staff_stats()
+        })
@@ -36,12 +36,6 @@ EOF
 echo "Collecting static files..."
 python manage.py collectstatic --noinput --clear
 
-# Start Gunicorn
-echo "Starting Gunicorn server..."
-exec gunicorn --bind 0.0.0.0:8000 \
-    --workers 3 \
-    --timeout 120 \
-    --access-logfile - \
-    --error-logfile - \
-    --log-level info \
-    nksc_backend.wsgi:application
\ No newline at end of file
+# Start Gunicorn (SERVER_PROFILE=sync|async, see gunicorn.conf.py)
+echo "Starting Gunicorn server (${SERVER_PROFILE:-sync} profile)..."
+exec gunicorn -c gunicorn.conf.py
\ No newline at end of file
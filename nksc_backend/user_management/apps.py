@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class UserManagementConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'user_management'
+
+    def ready(self):
+        from utils import cache
+
+        cache.register_dependency('user_management', 'user_management.Chairman', 'user_management.UserProfile')
@@ -2,8 +2,11 @@ from rest_framework import serializers
 from rest_framework import serializers
 from .models import Chairman
 
+from monitoring.serializers import TimedModelSerializer
+from utils.images import image_url
 
-class ChairmanSerializer(serializers.ModelSerializer):
+
+class ChairmanSerializer(TimedModelSerializer):
     """Serializer for Chairman model - Only for GET API"""
 
     qualifications_list = serializers.SerializerMethodField()
@@ -53,7 +56,7 @@ class ChairmanSerializer(serializers.ModelSerializer):
 
         # Add absolute URLs for media files
         if instance.profile_image and request:
-            data['profile_image'] = request.build_absolute_uri(instance.profile_image.url)
+            data['profile_image'] = image_url(request, instance.profile_image)
         else:
             data['profile_image'] = None
 
@@ -3,12 +3,18 @@ from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import AllowAny
 from django.shortcuts import get_object_or_404
+
+from utils.cache import cached_response
+from utils.http_cache import conditional_read
+
 from .models import Chairman
 from .serializers import ChairmanSerializer
 
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@conditional_read('user_management')
+@cached_response('user_management')
 def get_current_chairman(request):
     """
     Get the current active chairman information
@@ -56,6 +62,8 @@ def get_current_chairman(request):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@conditional_read('user_management')
+@cached_response('user_management')
 def get_all_chairmen(request):
     """
     Get all active chairmen (optional - if you want to list all)
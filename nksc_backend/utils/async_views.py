@@ -0,0 +1,103 @@
+"""
+Async implementations of the hottest public reads, for the ASGI profile.
+
+With ``SERVER_PROFILE=async`` gunicorn runs uvicorn workers on
+``nksc_backend.asgi`` (see ``gunicorn.conf.py``) and the app URLconfs route
+the endpoints listed in each app's ``async_views.py`` to ``async def`` views
+that query through Django's async ORM. While one of them waits on MariaDB the
+worker's event loop keeps serving other requests, instead of a whole sync
+worker sitting idle; every other view (admin writes, PDF splitting) still
+runs, in asgiref's thread pool.
+
+DRF 3.14 has no async views, so these are plain Django views. ``async_read``
+gives them what ``conditional_read`` and ``cached_response`` give the sync
+versions: the same JSON body, ``ETag``/``Last-Modified`` from the cache
+namespaces, 304s before any query and, optionally, the shared response cache
+(the sync and async versions of an endpoint read the same entries).
+
+Requests carrying credentials (an ``Authorization`` header or a session
+cookie) always get a freshly built response without validators, as signed-in
+users do on the sync path; resolving ``request.user`` would need a
+synchronous session lookup.
+"""
+import functools
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpResponseNotAllowed, JsonResponse
+from django.utils.cache import get_conditional_response
+from rest_framework.utils.encoders import JSONEncoder
+
+from monitoring import metrics
+from nksc_backend.db_router import aallow_replica_reads
+from utils import cache
+from utils.http_cache import avalidators, set_cache_headers
+
+
+def json_response(data, status=200):
+    """``data`` rendered the way DRF's ``JSONRenderer`` renders it."""
+    with metrics.rendering():
+        return JsonResponse(
+            data, status=status, encoder=JSONEncoder, safe=False,
+            json_dumps_params={'ensure_ascii': False, 'separators': (',', ':')},
+        )
+
+
+def has_credentials(request):
+    return 'HTTP_AUTHORIZATION' in request.META or settings.SESSION_COOKIE_NAME in request.COOKIES
+
+
+def async_read(*namespaces, cached=False, daily=False):
+    """
+    Decorator for an ``async def view(request, ...)`` that returns the response
+    data of a public GET built from the models of ``namespaces``. With
+    ``cached=True`` the data is also kept in the first namespace, keyed by the
+    absolute URL like ``cached_response``. ``daily`` is ``conditional_read``'s:
+    for reads that depend on today's date.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return HttpResponseNotAllowed(['GET', 'HEAD'])
+            if has_credentials(request):
+                return json_response(await view(request, *args, **kwargs))
+
+            await aallow_replica_reads(*namespaces)
+            etag, last_modified = await avalidators(request, namespaces, daily)
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if response is None:
+                response = json_response(await _data(view, cached and namespaces[0], request, args, kwargs))
+            return set_cache_headers(response, etag, last_modified)
+        return wrapper
+    return decorator
+
+
+async def _data(view, cache_name, request, args, kwargs):
+    if not cache_name:
+        return await view(request, *args, **kwargs)
+
+    ns = cache.namespace(cache_name)
+    parts = ('response', request.build_absolute_uri())
+    data = await ns.aget(*parts)
+    if data is None:
+        data = await view(request, *args, **kwargs)
+        await ns.aset(data, *parts)
+    return data
+
+
+def split_by_method(async_view, sync_view):
+    """
+    One URL whose GET/HEAD is ``async_view`` while writes still go to the
+    (DRF, CSRF-checking) ``sync_view``.
+    """
+    sync_view = sync_to_async(sync_view)
+
+    async def view(request, *args, **kwargs):
+        if request.method in ('GET', 'HEAD'):
+            return await async_view(request, *args, **kwargs)
+        return await sync_view(request, *args, **kwargs)
+
+    # Set by hand: Django 4.2's csrf_exempt() wraps in a sync function
+    view.csrf_exempt = True
+    return view
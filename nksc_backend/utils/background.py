@@ -0,0 +1,58 @@
+"""
+Small in-process worker queue for post-upload processing.
+
+Jobs run on a shared thread pool inside the web worker, so a slow PDF parse or
+image conversion never holds up the request that triggered it. With
+``BACKGROUND_TASKS_ASYNC = False`` jobs run inline, which keeps tests and
+management commands deterministic.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, connections, transaction
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'BACKGROUND_TASK_WORKERS', 2),
+                    thread_name_prefix='nksc-background',
+                )
+    return _executor
+
+
+def _run(func, args, kwargs):
+    close_old_connections()
+    try:
+        return func(*args, **kwargs)
+    except Exception:
+        logger.exception("Background task %s failed", getattr(func, '__name__', func))
+    finally:
+        # Worker threads own their DB connections; don't leave them open between jobs
+        connections.close_all()
+
+
+def submit(func, *args, **kwargs):
+    """Run ``func`` on the background pool (or inline when background tasks are disabled)."""
+    if not getattr(settings, 'BACKGROUND_TASKS_ASYNC', True):
+        try:
+            return func(*args, **kwargs)
+        except Exception:
+            logger.exception("Background task %s failed", getattr(func, '__name__', func))
+            return None
+    return _get_executor().submit(_run, func, args, kwargs)
+
+
+def submit_on_commit(func, *args, **kwargs):
+    """Queue ``func`` once the current transaction commits, so the job sees the saved rows."""
+    transaction.on_commit(lambda: submit(func, *args, **kwargs))
@@ -0,0 +1,178 @@
+"""
+Namespaced, versioned cache entries with model-driven invalidation.
+
+Each app caches under its own namespace (``journal``, ``news``, ...). Keys
+carry the namespace's current version number, so invalidating a namespace is
+a single ``incr`` of that number: every older entry simply stops being read
+and expires on its own. Nothing has to enumerate or delete keys, which keeps
+this working the same on Redis, LocMem or file caches.
+
+A version starts at a random number rather than 1, so a version key that is
+evicted (or lost with a cache restart) never comes back as a number that was
+already used: entries and ETags from before the eviction are not matched again.
+
+Apps declare which models their cached data is built from, usually in
+``AppConfig.ready``::
+
+    cache.register_dependency('news', 'news.News', 'news.NewsCategory')
+
+Any save or delete of those models (including bulk deletes, which send
+``post_delete`` per row) bumps the namespace once the transaction commits; if
+the cache is unreachable then, the write still succeeds and the error is logged.
+Writes that bypass signals (``QuerySet.update``) must call ``invalidate``
+themselves.
+
+Read endpoints use ``cached_response(namespace)`` to keep their response data
+for anonymous GETs, keyed by the full URL. The ``a``-prefixed methods are the
+same operations for async views (see ``utils/async_views.py``).
+"""
+import functools
+import hashlib
+import logging
+import random
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.http import HttpRequest
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+_namespaces = {}
+
+
+def _new_version():
+    return random.randrange(1, 2 ** 31)
+
+
+class Namespace:
+    def __init__(self, name):
+        self.name = name
+        self.version_key = f'cache-version:{name}'
+        self.changed_key = f'cache-changed:{name}'
+
+    def version(self):
+        return cache.get_or_set(self.version_key, _new_version, None)
+
+    def changed_at(self):
+        """Unix time of the last invalidation, or None if none was recorded."""
+        return cache.get(self.changed_key)
+
+    def key(self, *parts):
+        """Cache key for ``parts`` under the current version; long parts are hashed."""
+        return self._versioned_key(self.version(), parts)
+
+    def get(self, *parts, default=None):
+        return cache.get(self.key(*parts), default)
+
+    def set(self, value, *parts, timeout=None):
+        cache.set(self.key(*parts), value, self._timeout(timeout))
+
+    async def aversion(self):
+        return await cache.aget_or_set(self.version_key, _new_version, None)
+
+    async def achanged_at(self):
+        return await cache.aget(self.changed_key)
+
+    async def akey(self, *parts):
+        return self._versioned_key(await self.aversion(), parts)
+
+    async def aget(self, *parts, default=None):
+        return await cache.aget(await self.akey(*parts), default)
+
+    async def aset(self, value, *parts, timeout=None):
+        await cache.aset(await self.akey(*parts), value, self._timeout(timeout))
+
+    def get_or_set(self, parts, compute, timeout=None):
+        """Cached value for ``parts``, calling ``compute()`` and storing it on a miss."""
+        key = self.key(*parts)
+        value = cache.get(key)
+        if value is None:
+            value = compute()
+            cache.set(key, value, self._timeout(timeout))
+        return value
+
+    def invalidate(self):
+        """
+        Retire every entry of this namespace. Runs after the write has committed,
+        so a cache outage is logged rather than raised: the old entries are
+        served until they expire (``CACHE_DEFAULT_TIMEOUT``).
+        """
+        try:
+            try:
+                cache.incr(self.version_key)
+            except ValueError:
+                cache.set(self.version_key, _new_version(), None)
+            cache.set(self.changed_key, int(time.time()), None)
+        except Exception:
+            logger.exception("Could not invalidate cache namespace %s", self.name)
+
+    def invalidate_on_commit(self, *args, **kwargs):
+        transaction.on_commit(self.invalidate)
+
+    def _versioned_key(self, version, parts):
+        raw = ':'.join(str(part) for part in parts)
+        if len(raw) > 100:
+            raw = hashlib.sha1(raw.encode('utf-8')).hexdigest()
+        return f'{self.name}:{version}:{raw}'
+
+    @staticmethod
+    def _timeout(timeout):
+        return timeout if timeout is not None else getattr(settings, 'CACHE_DEFAULT_TIMEOUT', 300)
+
+
+def namespace(name):
+    if name not in _namespaces:
+        _namespaces[name] = Namespace(name)
+    return _namespaces[name]
+
+
+def invalidate(name):
+    namespace(name).invalidate()
+
+
+def register_dependency(name, *models):
+    """
+    Invalidate namespace ``name`` whenever one of ``models`` (classes or
+    ``'app_label.ModelName'`` strings) is saved or deleted.
+    """
+    ns = namespace(name)
+    for model in models:
+        label = model if isinstance(model, str) else model._meta.label
+        uid = f'cache-dependency:{name}:{label}'
+        post_save.connect(ns.invalidate_on_commit, sender=model, weak=False, dispatch_uid=f'{uid}:save')
+        post_delete.connect(ns.invalidate_on_commit, sender=model, weak=False, dispatch_uid=f'{uid}:delete')
+    return ns
+
+
+def cached_response(name, timeout=None):
+    """
+    Keep the response data of a public read endpoint in namespace ``name``.
+
+    Only successful anonymous GETs are cached, keyed by the absolute URL, so
+    query parameters and the host in absolute media URLs are part of the key.
+    Works on ``@api_view`` functions and on ``APIView`` methods.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            request = next(arg for arg in args if isinstance(arg, (Request, HttpRequest)))
+            if request.method != 'GET' or request.user.is_authenticated:
+                return view(*args, **kwargs)
+
+            ns = namespace(name)
+            parts = ('response', request.build_absolute_uri())
+            cached = ns.get(*parts)
+            if cached is not None:
+                return Response(cached)
+
+            response = view(*args, **kwargs)
+            if response.status_code == 200 and isinstance(response, Response):
+                ns.set(response.data, *parts, timeout=timeout)
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,150 @@
+"""
+Shared file delivery for large downloads (journal PDFs and their pre-split parts).
+
+``send_file`` answers conditional requests (ETag / Last-Modified) with 304,
+serves single ``Range: bytes=`` requests as 206 partial content, and can hand
+the transfer over to the front web server with ``X-Accel-Redirect`` (nginx) or
+``X-Sendfile`` (Apache/lighttpd) when ``FILE_DELIVERY_OFFLOAD`` is set.
+"""
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe, quote_etag
+
+STREAM_CHUNK_SIZE = 64 * 1024
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def file_etag(stat_result):
+    """Strong validator derived from mtime and size, so it changes whenever the file does."""
+    return quote_etag(f"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}")
+
+
+def parse_range_header(header, size):
+    """
+    Parse a single ``bytes=`` range into an inclusive ``(start, end)`` tuple.
+
+    Returns None when the header should be ignored (malformed or multi-range, in
+    which case the whole file is sent) and raises RangeNotSatisfiable for ranges
+    that start past the end of the file.
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        return None
+
+    first, last = match.groups()
+    if first == '' and last == '':
+        return None
+
+    if first == '':
+        # Suffix range: the last N bytes
+        suffix_length = int(last)
+        if suffix_length == 0:
+            raise RangeNotSatisfiable
+        return max(0, size - suffix_length), size - 1
+
+    start = int(first)
+    end = int(last) if last else size - 1
+    if last and end < start:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable
+    return start, min(end, size - 1)
+
+
+def _range_applies(request, etag, last_modified):
+    """Honour If-Range: only serve a partial response if the client's copy is still current."""
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if not if_range:
+        return True
+    if if_range.startswith('W/'):
+        return False  # If-Range needs strong comparison, which a weak tag never passes
+    if if_range.startswith('"'):
+        return bool(etag) and not etag.startswith('W/') and if_range == etag
+    return parse_http_date_safe(if_range) == last_modified
+
+
+def _iter_file_range(path, start, length):
+    with open(path, 'rb') as fh:
+        fh.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = fh.read(min(STREAM_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def _offload_response(path, content_type):
+    mode = getattr(settings, 'FILE_DELIVERY_OFFLOAD', '')
+    if mode == 'x-sendfile':
+        response = HttpResponse(content_type=content_type)
+        response['X-Sendfile'] = path
+        return response
+
+    if mode == 'x-accel':
+        media_root = os.path.abspath(settings.MEDIA_ROOT)
+        absolute_path = os.path.abspath(path)
+        if os.path.commonpath([media_root, absolute_path]) != media_root:
+            return None
+        relative_path = os.path.relpath(absolute_path, media_root).replace(os.sep, '/')
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = settings.FILE_DELIVERY_ACCEL_PREFIX + quote(relative_path)
+        return response
+
+    return None
+
+
+def send_file(request, path, content_type='application/octet-stream', filename=None,
+              as_attachment=False, cache_control='public, max-age=3600'):
+    """Send a file from disk with conditional GET, byte-range and offload support."""
+    stat_result = os.stat(path)
+    size = stat_result.st_size
+    etag = file_etag(stat_result)
+    last_modified = int(stat_result.st_mtime)
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = _offload_response(path, content_type)
+
+    if response is None:
+        byte_range = None
+        range_header = request.META.get('HTTP_RANGE')
+        if range_header and _range_applies(request, etag, last_modified):
+            try:
+                byte_range = parse_range_header(range_header, size)
+            except RangeNotSatisfiable:
+                response = HttpResponse(status=416)
+                response['Content-Range'] = f'bytes */{size}'
+                return response
+
+        if byte_range:
+            start, end = byte_range
+            length = end - start + 1
+            response = StreamingHttpResponse(
+                _iter_file_range(path, start, length),
+                status=206,
+                content_type=content_type,
+            )
+            response['Content-Length'] = str(length)
+            response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        else:
+            response = FileResponse(open(path, 'rb'), content_type=content_type)
+
+    if filename and response.status_code in (200, 206):
+        response['Content-Disposition'] = content_disposition_header(as_attachment, filename)
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    if cache_control:
+        response['Cache-Control'] = cache_control
+    return response
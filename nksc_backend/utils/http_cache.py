@@ -0,0 +1,113 @@
+"""
+HTTP validators and shared-cache headers for public read endpoints.
+
+``conditional_read('news')`` wraps a GET view so that:
+
+* the ``ETag`` is derived from the URL, the ``Accept`` header and the version
+  of the listed cache namespaces (see ``utils/cache.py``), and
+  ``Last-Modified`` is the time those namespaces were last invalidated. Every
+  save or delete of a model a namespace depends on moves both, including
+  models without an ``updated_at`` column, and neither costs a database query.
+* a matching ``If-None-Match`` / ``If-Modified-Since`` is answered with 304
+  before the view runs, so nothing is queried or serialized.
+* ``Cache-Control`` makes browsers revalidate every time while nginx may serve
+  the response for ``s-maxage`` seconds, and a stale copy for
+  ``stale-while-revalidate`` more while it refetches.
+
+Reads that filter on today's date (upcoming events) pass ``daily=True``: the
+date is part of the ``ETag`` and ``Last-Modified`` is at least the start of
+the day, so a copy from yesterday is never revalidated with a 304.
+
+Only anonymous requests get validators, and only they may read from a replica
+(see ``nksc_backend/db_router.py``); signed-in users (the admin SPA) always
+receive a fresh, uncached response from the primary.
+"""
+import functools
+import hashlib
+
+from django.conf import settings
+from django.http import HttpRequest
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils import timezone
+from django.utils.http import http_date
+from rest_framework.request import Request
+
+from nksc_backend.db_router import allow_replica_reads
+from utils import cache
+
+
+def set_cache_headers(response, etag=None, last_modified=None, s_maxage=None, stale_while_revalidate=None):
+    """Validators plus the shared-cache ``Cache-Control`` used by public reads."""
+    if etag:
+        response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(last_modified)
+    patch_cache_control(
+        response,
+        public=True,
+        max_age=0,
+        s_maxage=s_maxage if s_maxage is not None else getattr(settings, 'HTTP_CACHE_S_MAXAGE', 60),
+        stale_while_revalidate=(
+            stale_while_revalidate if stale_while_revalidate is not None
+            else getattr(settings, 'HTTP_CACHE_STALE_WHILE_REVALIDATE', 300)
+        ),
+    )
+    patch_vary_headers(response, ('Accept',))
+    return response
+
+
+def validators(request, namespaces, daily=False):
+    """``(etag, last_modified)`` of a read built from ``namespaces`` (and today's date when ``daily``)."""
+    spaces = [cache.namespace(name) for name in namespaces]
+    return _validators(
+        request, [(ns.name, ns.version()) for ns in spaces], [ns.changed_at() for ns in spaces], daily
+    )
+
+
+async def avalidators(request, namespaces, daily=False):
+    """``validators`` for async views."""
+    spaces = [cache.namespace(name) for name in namespaces]
+    return _validators(
+        request,
+        [(ns.name, await ns.aversion()) for ns in spaces],
+        [await ns.achanged_at() for ns in spaces],
+        daily,
+    )
+
+
+def _validators(request, versions, changed, daily=False):
+    versions = ','.join(f'{name}={version}' for name, version in versions)
+    raw = f"{request.get_full_path()}|{request.META.get('HTTP_ACCEPT', '')}|{versions}"
+    last_modified = max(changed) if changed and None not in changed else None
+    if daily:
+        # The same date the views filter on (timezone.now().date())
+        day_start = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        raw += f'|{day_start.date().isoformat()}'
+        if last_modified is not None:
+            last_modified = max(last_modified, int(day_start.timestamp()))
+    return f'"{hashlib.sha1(raw.encode("utf-8")).hexdigest()}"', last_modified
+
+
+def conditional_read(*namespaces, daily=False, s_maxage=None, stale_while_revalidate=None):
+    """
+    Decorator for ``@api_view`` functions and ``APIView.get`` methods whose
+    response is built from the models of ``namespaces`` (and, with ``daily``,
+    today's date); see the module docstring.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            request = next(arg for arg in args if isinstance(arg, (Request, HttpRequest)))
+            if request.method not in ('GET', 'HEAD') or request.user.is_authenticated:
+                return view(*args, **kwargs)
+
+            allow_replica_reads(*namespaces)
+            etag, last_modified = validators(request, namespaces, daily)
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if response is None:
+                response = view(*args, **kwargs)
+                if response.status_code != 200:
+                    return response
+            return set_cache_headers(response, etag, last_modified, s_maxage, stale_while_revalidate)
+        return wrapper
+    return decorator
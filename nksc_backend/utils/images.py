@@ -0,0 +1,207 @@
+"""
+On-demand resized copies of uploaded images.
+
+``/api/img/<media path>?size=&fmt=&s=`` answers with the image scaled to fit
+inside one of the named ``PRESETS`` (never upscaled) in one of the
+``FORMATS``. Only URLs built by ``sized_url`` work: ``s`` is an HMAC of the
+path, preset and format, and nothing else is ever signed, so at most
+``len(PRESETS) * len(FORMATS)`` copies of an image can be rendered and stored.
+
+Results are kept under ``IMAGE_CACHE_DIR``, keyed by the source path, its
+mtime and size and the parameters, so a replaced source simply misses. Hits
+touch the file's access time; once the cache grows past
+``IMAGE_CACHE_MAX_BYTES`` the least recently used files are removed in the
+background.
+
+Serializers call ``image_url(request, field_file)``. It returns the plain
+absolute URL unless the API request names a preset (``img_size=card``, with an
+optional ``img_fmt=jpeg``), in which case every image in the response is a
+signed, resized URL. Unknown presets and formats are ignored.
+"""
+import hashlib
+import io
+import os
+import tempfile
+import threading
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core import signing
+from django.http import Http404, HttpResponseForbidden
+from django.urls import reverse
+from django.utils.crypto import constant_time_compare
+from django.utils._os import safe_join
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from utils import background
+from utils.file_delivery import send_file
+
+SOURCE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.webp', '.gif', '.bmp'}
+PRESETS = {  # name -> box the image is scaled to fit
+    'thumb': (320, 320),
+    'card': (640, 640),
+    'full': (1600, 1600),
+}
+FORMATS = {
+    'webp': ('WEBP', 'image/webp', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', 'image/jpeg', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+_signer = signing.Signer(salt='utils.images')
+_prune_lock = threading.Lock()
+_last_prune = 0.0
+PRUNE_INTERVAL = 60
+
+
+def cache_root():
+    return getattr(settings, 'IMAGE_CACHE_DIR', os.path.join(settings.MEDIA_ROOT, 'image_cache'))
+
+
+def requested_preset(request):
+    """``(preset, format)`` asked for with ``img_size``/``img_fmt``, or None."""
+    params = getattr(request, 'query_params', request.GET)
+    preset = params.get('img_size')
+    if preset not in PRESETS:
+        return None
+    fmt = params.get('img_fmt')
+    return preset, fmt if fmt in FORMATS else 'webp'
+
+
+def _signature(path, preset, fmt):
+    return _signer.signature(f"{path}|{preset}|{fmt}")
+
+
+# ─────────────────────────────────────────────────────────────
+# URLS
+# ─────────────────────────────────────────────────────────────
+
+def sized_url(request, field_file, preset, fmt='webp'):
+    """Absolute, signed URL of ``field_file`` resized to the named ``preset``."""
+    if preset not in PRESETS or fmt not in FORMATS:
+        raise ValueError(f"Unknown image preset {preset!r} or format {fmt!r}")
+    path = field_file.name
+    params = {'size': preset, 'fmt': fmt, 's': _signature(path, preset, fmt)}
+    url = reverse('resized-image', kwargs={'path': path})
+    return request.build_absolute_uri(f"{url}?{urlencode(params)}")
+
+
+def image_url(request, field_file):
+    """
+    Absolute URL of an uploaded image for API responses: sized when the request
+    names a preset (``?img_size=card&img_fmt=webp``), the original otherwise.
+    """
+    requested = requested_preset(request)
+    if requested is not None:
+        return sized_url(request, field_file, *requested)
+    return request.build_absolute_uri(field_file.url)
+
+
+# ─────────────────────────────────────────────────────────────
+# RESIZING AND CACHE
+# ─────────────────────────────────────────────────────────────
+
+def _cache_path(source_path, stat_result, preset, fmt):
+    key = f"{source_path}|{stat_result.st_mtime_ns}|{stat_result.st_size}|{preset}|{fmt}"
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+    return os.path.join(cache_root(), digest[:2], f"{digest}.{fmt}")
+
+
+def _render(source_path, preset, fmt):
+    pil_format, _, options = FORMATS[fmt]
+    with Image.open(source_path) as source:
+        image = ImageOps.exif_transpose(source)
+        image.thumbnail(PRESETS[preset], Image.LANCZOS)
+        if pil_format == 'JPEG' or image.mode not in ('RGB', 'RGBA', 'L', 'LA'):
+            image = image.convert('RGB' if pil_format == 'JPEG' else 'RGBA')
+        buffer = io.BytesIO()
+        image.save(buffer, pil_format, **options)
+    return buffer.getvalue()
+
+
+def _write_atomic(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as fh:
+            fh.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def prune_cache(max_bytes=None):
+    """Delete least recently used files until the cache is at 90% of its budget."""
+    if max_bytes is None:
+        max_bytes = getattr(settings, 'IMAGE_CACHE_MAX_BYTES', 512 * 1024 * 1024)
+    if not _prune_lock.acquire(blocking=False):
+        return 0  # another prune is already running
+
+    try:
+        entries = []
+        total = 0
+        for directory, _, filenames in os.walk(cache_root()):
+            for filename in filenames:
+                path = os.path.join(directory, filename)
+                try:
+                    stat_result = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat_result.st_atime, stat_result.st_size, path))
+                total += stat_result.st_size
+
+        removed = 0
+        if total > max_bytes:
+            target = max_bytes * 0.9
+            for _, size, path in sorted(entries):
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+                removed += 1
+        return removed
+    finally:
+        _prune_lock.release()
+
+
+def _schedule_prune():
+    global _last_prune
+    if time.monotonic() - _last_prune >= PRUNE_INTERVAL:
+        _last_prune = time.monotonic()
+        background.submit(prune_cache)
+
+
+def resized_image(request, path):
+    """Serve a signed resize of a media file, rendering and caching it on first use."""
+    preset, fmt = request.GET.get('size'), request.GET.get('fmt', 'webp')
+    if preset not in PRESETS or fmt not in FORMATS:
+        raise Http404
+    if not constant_time_compare(request.GET.get('s', ''), _signature(path, preset, fmt)):
+        return HttpResponseForbidden("Invalid image signature")
+
+    if os.path.splitext(path)[1].lower() not in SOURCE_EXTENSIONS:
+        raise Http404
+    try:
+        source_path = safe_join(settings.MEDIA_ROOT, path)
+        stat_result = os.stat(source_path)
+    except (ValueError, OSError):
+        raise Http404
+
+    cache_path = _cache_path(path, stat_result, preset, fmt)
+    if os.path.exists(cache_path):
+        # Mark as recently used; mtime is left alone because the ETag is built from it
+        os.utime(cache_path, ns=(time.time_ns(), os.stat(cache_path).st_mtime_ns))
+    else:
+        try:
+            content = _render(source_path, preset, fmt)
+        except (UnidentifiedImageError, Image.DecompressionBombError, OSError):
+            raise Http404
+        _write_atomic(cache_path, content)
+        _schedule_prune()
+
+    return send_file(request, cache_path, content_type=FORMATS[fmt][1], cache_control='public, max-age=86400')
@@ -0,0 +1,52 @@
+"""
+Model helpers shared by the apps.
+"""
+
+
+class LoadedValuesMixin:
+    """
+    Remembers the ``TRACKED_FIELDS`` values a row was loaded from (or last saved
+    to) the database with, so ``save()`` and ``pre_save`` handlers can see what
+    a save changes without reading the row again. Fields deferred at load time
+    are left out. Call ``remember_loaded_values()`` after a save (the apps do it
+    from ``post_save``).
+    """
+    TRACKED_FIELDS = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_loaded_values()
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None):
+        super().refresh_from_db(using=using, fields=fields)
+        self.remember_loaded_values(fields)
+
+    def remember_loaded_values(self, fields=None):
+        loaded = dict(getattr(self, '_loaded_values', {})) if fields else {}
+        for attname in self.TRACKED_FIELDS:
+            if fields and attname not in fields and attname.removesuffix('_id') not in fields:
+                continue
+            if attname in self.__dict__:
+                value = self.__dict__[attname]
+                loaded[attname] = getattr(value, 'name', value)  # FieldFile -> stored name
+        self._loaded_values = loaded
+
+
+def previous_values(instance):
+    """
+    The tracked values ``instance`` had in the database before this save, or None
+    for a new row. Taken from what it was loaded with (see ``LoadedValuesMixin``),
+    so saving costs no extra SELECT; only fields deferred at load time are fetched.
+    """
+    if instance._state.adding or not instance.pk:
+        return None
+    previous = dict(getattr(instance, '_loaded_values', {}))
+    missing = [field for field in instance.TRACKED_FIELDS if field not in previous]
+    if missing:
+        fetched = type(instance).objects.filter(pk=instance.pk).values(*missing).first()
+        if fetched is None:
+            return None
+        previous.update(fetched)
+    return previous
@@ -0,0 +1,171 @@
+"""
+Keyset (cursor) pagination for list endpoints.
+
+Instead of COUNT(*) plus OFFSET, each page continues from the sort key of the
+last row of the previous page: ``WHERE (a, b, pk) > (last_a, last_b, last_pk)``
+spelled out per column so mixed ASC/DESC orderings work. With an index on the
+ordering columns every page, however deep, reads only ``page_size + 1`` rows.
+
+The cursor handed to the client is an opaque URL-safe token holding the sort
+key values of the last row and the ordering it belongs to. The primary key is
+always appended to the ordering as a tie-breaker so the order is total.
+"""
+import base64
+import binascii
+import json
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import F, Q
+
+CURSOR_PARAM = 'cursor'
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def cursor_requested(request):
+    """Cursor mode is opt-in: ``?cursor=`` (empty for the first page) or ``?cursor=<token>``."""
+    return CURSOR_PARAM in request.query_params
+
+
+def page_size_param(request, name='page_size', default=20, maximum=100):
+    try:
+        page_size = int(request.query_params.get(name, default))
+    except (TypeError, ValueError):
+        page_size = default
+    return min(max(page_size, 1), maximum)
+
+
+class CursorPage:
+    def __init__(self, object_list, next_cursor):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def pagination_data(self, page_size):
+        return {
+            "next_cursor": self.next_cursor,
+            "has_next": self.has_next,
+            "page_size": page_size,
+        }
+
+
+class CursorPaginator:
+    """
+    Paginate ``queryset`` by ``ordering`` (model field names, ``-`` for descending).
+
+    Descending columns sort NULLs last and ascending columns NULLs first, on
+    every database, so nullable columns can take part in the key.
+    """
+
+    def __init__(self, queryset, ordering, page_size):
+        self.queryset = queryset
+        self.page_size = page_size
+        self.model = queryset.model
+
+        ordering = [field for field in ordering if field.lstrip('-') not in ('pk', 'id')]
+        last_descending = ordering[-1].startswith('-') if ordering else False
+        ordering.append('-pk' if last_descending else 'pk')
+
+        self.keys = []
+        for field in ordering:
+            descending = field.startswith('-')
+            name = field.lstrip('-')
+            model_field = self.model._meta.pk if name == 'pk' else self._get_field(name)
+            self.keys.append((name, model_field, descending))
+
+    def _get_field(self, name):
+        try:
+            return self.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            raise ValueError(f"Cannot paginate {self.model.__name__} by unknown field '{name}'")
+
+    @property
+    def signature(self):
+        return ','.join(('-' if descending else '') + name for name, _, descending in self.keys)
+
+    # ── cursor encoding ──────────────────────────────────────
+
+    def encode_cursor(self, obj):
+        values = [
+            None if model_field.value_from_object(obj) is None else model_field.value_to_string(obj)
+            for _, model_field, _ in self.keys
+        ]
+        payload = json.dumps({'o': self.signature, 'v': values}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+    def decode_cursor(self, cursor):
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+            values = payload['v']
+        except (binascii.Error, UnicodeError, ValueError, KeyError, TypeError):
+            raise InvalidCursor("Malformed cursor")
+
+        if payload.get('o') != self.signature or len(values) != len(self.keys):
+            raise InvalidCursor("Cursor does not belong to this ordering")
+
+        decoded = []
+        for (_, model_field, _), value in zip(self.keys, values):
+            if value is None:
+                decoded.append(None)
+                continue
+            try:
+                decoded.append(model_field.to_python(value))
+            except ValidationError:
+                raise InvalidCursor("Malformed cursor")
+        return decoded
+
+    # ── queries ──────────────────────────────────────────────
+
+    def _order_expressions(self):
+        expressions = []
+        for name, model_field, descending in self.keys:
+            if not model_field.null:
+                # Plain ORDER BY, so the database can walk an index on the ordering columns
+                expressions.append(f'-{name}' if descending else name)
+            elif descending:
+                expressions.append(F(name).desc(nulls_last=True))
+            else:
+                expressions.append(F(name).asc(nulls_first=True))
+        return expressions
+
+    @staticmethod
+    def _after(name, model_field, value, descending):
+        """Rows strictly after ``value`` in this column's direction."""
+        if descending:
+            if value is None:
+                return Q(pk__in=[])  # NULLs sort last
+            after = Q(**{f'{name}__lt': value})
+            return after | Q(**{f'{name}__isnull': True}) if model_field.null else after
+        if value is None:
+            return Q(**{f'{name}__isnull': False})  # NULLs sort first
+        return Q(**{f'{name}__gt': value})
+
+    @staticmethod
+    def _equal(name, value):
+        if value is None:
+            return Q(**{f'{name}__isnull': True})
+        return Q(**{name: value})
+
+    def _after_cursor(self, values):
+        condition = Q(pk__in=[])
+        equal_so_far = Q()
+        for (name, model_field, descending), value in zip(self.keys, values):
+            condition |= equal_so_far & self._after(name, model_field, value, descending)
+            equal_so_far &= self._equal(name, value)
+        return condition
+
+    def get_page(self, cursor=None):
+        queryset = self.queryset.order_by(*self._order_expressions())
+        if cursor:
+            queryset = queryset.filter(self._after_cursor(self.decode_cursor(cursor)))
+
+        rows = list(queryset[:self.page_size + 1])
+        object_list = rows[:self.page_size]
+        next_cursor = self.encode_cursor(object_list[-1]) if len(rows) > self.page_size else None
+        return CursorPage(object_list, next_cursor)
@@ -0,0 +1,94 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from PIL import Image
+
+from news.models import News
+
+from .async_views import async_read
+
+
+class ImageResizeTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(
+            MEDIA_ROOT=media_root, IMAGE_CACHE_DIR=os.path.join(media_root, 'image_cache')
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        buffer = io.BytesIO()
+        Image.new('RGB', (1200, 600), 'navy').save(buffer, 'JPEG')
+        self.news = News(title="Seminar", slug="seminar", short_description="Short", content="Body",
+                         is_published=True)
+        self.news.thumbnail_image.save("seminar.jpg", ContentFile(buffer.getvalue()), save=False)
+        self.news.save()
+
+    def test_sized_urls_resize_and_cache(self):
+        response = self.client.get('/api/news/all/', {'img_size': 'thumb'})
+        url = response.data['data'][0]['thumbnail_image']
+        self.assertIn('/api/img/news/thumbnails/', url)
+
+        resized = self.client.get(url)
+        self.assertEqual(resized.status_code, 200)
+        self.assertEqual(resized['Content-Type'], 'image/webp')
+        with Image.open(io.BytesIO(b''.join(resized.streaming_content))) as image:
+            self.assertEqual(image.size, (320, 160))
+
+        cached = self.client.get(url, HTTP_IF_NONE_MATCH=resized['ETag'])
+        self.assertEqual(cached.status_code, 304)
+
+    def test_unsigned_sizes_are_rejected(self):
+        url = self.client.get('/api/news/all/', {'img_size': 'thumb'}).data['data'][0]['thumbnail_image']
+        self.assertEqual(self.client.get(url.replace('size=thumb', 'size=full')).status_code, 403)
+        self.assertEqual(self.client.get(url.replace('size=thumb', 'size=300')).status_code, 404)
+
+        # Only presets are ever signed
+        for params in ({'img_size': '2000'}, {'img_w': 300}):
+            unsized = self.client.get('/api/news/all/', params).data['data'][0]['thumbnail_image']
+            self.assertTrue(unsized.endswith('/media/' + self.news.thumbnail_image.name))
+        png = self.client.get('/api/news/all/', {'img_size': 'card', 'img_fmt': 'png'}).data['data'][0]
+        self.assertIn('fmt=webp', png['thumbnail_image'])
+
+        plain = self.client.get('/api/news/all/').data['data'][0]['thumbnail_image']
+        self.assertTrue(plain.endswith('/media/' + self.news.thumbnail_image.name))
+
+
+class AsyncReadTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.calls = 0
+
+        @async_read('news', cached=True)
+        async def view(request):
+            self.calls += 1
+            return {'success': True, 'data': self.calls}
+        self.view = async_to_sync(view)
+
+    def test_validators_and_shared_cache(self):
+        response = self.view(RequestFactory().get('/api/test/'))
+        self.assertEqual(json.loads(response.content), {'success': True, 'data': 1})
+        self.assertIn('public', response['Cache-Control'])
+
+        cached = self.view(RequestFactory().get('/api/test/', HTTP_IF_NONE_MATCH=response['ETag']))
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(json.loads(self.view(RequestFactory().get('/api/test/')).content)['data'], 1)
+        self.assertEqual(self.calls, 1)
+
+        self.assertEqual(self.view(RequestFactory().post('/api/test/')).status_code, 405)
+
+    def test_requests_with_credentials_are_not_cached(self):
+        self.view(RequestFactory().get('/api/test/'))
+        request = RequestFactory().get('/api/test/', HTTP_AUTHORIZATION='Bearer token')
+        response = self.view(request)
+        self.assertEqual(json.loads(response.content)['data'], 2)
+        self.assertFalse(response.has_header('ETag'))
@@ -0,0 +1,121 @@
+"""
+Buffered view counters.
+
+Detail endpoints record a hit in a per-process buffer instead of writing the
+row. The first hit after a flush starts a timer thread that flushes the buffer
+``VIEW_COUNT_FLUSH_INTERVAL`` seconds later, so hits are written at most that
+often and within that time even when the worker goes idle (a killed worker
+loses at most one interval). The buffer is also flushed when the process exits.
+
+A flush is a few ``UPDATE ... SET views_count = views_count + n WHERE id IN
+(...)`` statements, one per model and distinct increment, in one transaction.
+Increments are added in the database, so concurrent workers never overwrite
+each other's counts.
+"""
+import atexit
+import logging
+import threading
+from collections import defaultdict
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import F
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_pending = defaultdict(int)  # (model label, field, pk) -> hits not yet written
+_timer = None  # flushes the buffer once the interval is up
+
+
+def _flush_interval():
+    return getattr(settings, 'VIEW_COUNT_FLUSH_INTERVAL', 30)
+
+
+def record(instance, field='views_count'):
+    """Count one view of ``instance``; written to ``field`` on the next flush."""
+    key = (instance._meta.label, field, instance.pk)
+    with _lock:
+        _pending[key] += 1
+        _schedule_flush()
+
+
+def _schedule_flush():
+    """Start the flush timer unless one is already waiting. Lock held."""
+    global _timer
+
+    if _timer is None:
+        _timer = threading.Timer(_flush_interval(), _flush_on_timer)
+        _timer.daemon = True
+        _timer.start()
+
+
+def pending(instance, field='views_count'):
+    """Hits recorded in this process and not written yet."""
+    with _lock:
+        return _pending.get((instance._meta.label, field, instance.pk), 0)
+
+
+def _take():
+    global _timer
+
+    with _lock:
+        batch = dict(_pending)
+        _pending.clear()
+        if _timer is not None:
+            _timer.cancel()  # no-op when called from the timer itself
+            _timer = None
+    return batch
+
+
+def _restore(batch):
+    with _lock:
+        for key, hits in batch.items():
+            _pending[key] += hits
+
+
+def _write(batch):
+    by_increment = defaultdict(list)
+    for (label, field, pk), hits in batch.items():
+        by_increment[(label, field, hits)].append(pk)
+
+    # All or nothing, so a failed flush can put the whole batch back
+    with transaction.atomic():
+        for (label, field, hits), pks in by_increment.items():
+            apps.get_model(label).objects.filter(pk__in=pks).update(**{field: F(field) + hits})
+
+
+def flush():
+    """Write every buffered hit now. Returns the number of hits written."""
+    batch = _take()
+    if not batch:
+        return 0
+    try:
+        _write(batch)
+    except Exception:
+        # Keep the hits for the next flush rather than dropping them
+        _restore(batch)
+        raise
+    return sum(batch.values())
+
+
+def _flush_on_timer():
+    try:
+        flush()
+    except Exception:
+        logger.exception("Flushing view counts failed")
+        with _lock:
+            if _pending:
+                _schedule_flush()  # try the restored hits again later
+    finally:
+        # The timer thread owns its connection; don't leave it open until the next flush
+        connections.close_all()
+
+
+@atexit.register
+def _flush_at_exit():
+    try:
+        flush()
+    except Exception:
+        logger.exception("Flushing view counts at exit failed")
@@ -17,7 +17,7 @@ export interface NewsItem {
   title: string;
   slug: string;
   short_description: string;
-  content: string;
+  content?: string; // omitted by the /api/news/all/ listing
   category: number;
   category_detail: NewsCategory;
   tags: string;
@@ -46,9 +46,18 @@ export interface NewsItem {
 export interface NewsResponse {
   success: boolean;
   count: number;
+  page?: number;
+  page_size?: number;
+  total_pages?: number;
+  has_next?: boolean;
   data: NewsItem[];
 }
 
+export interface NewsDetailResponse {
+  success: boolean;
+  data: NewsItem;
+}
+
 export interface CategoryResponse {
   success: boolean;
   data: NewsCategory[];
@@ -126,6 +135,12 @@ export class NewsService {
     return this.http.get<NewsResponse>(url);
   }
 
+  // Get a single news item with its full content
+  getNewsDetail(slug: string): Observable<NewsDetailResponse> {
+    const url = `${this.baseUrl}/api/news/detail/${slug}/`;
+    return this.http.get<NewsDetailResponse>(url);
+  }
+
   // Get news by ID
   getNewsById(id: number): Observable<NewsResponse> {
     const url = `${this.baseUrl}/api/news/${id}/`;
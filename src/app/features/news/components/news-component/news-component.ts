@@ -558,6 +558,19 @@ export class NewsComponent implements OnInit, OnDestroy {
     this.selectedNews = news;
     this.isNewsDetailOpen = true;
     document.body.style.overflow = 'hidden';
+
+    // Listings leave out the article body; load it on demand
+    if (news.content === undefined) {
+      const sub = this.newsService.getNewsDetail(news.slug).subscribe({
+        next: (response) => {
+          if (response.success && this.selectedNews?.id === news.id) {
+            this.selectedNews = response.data;
+          }
+        },
+        error: (error) => console.error('Error loading news detail:', error)
+      });
+      this.subscriptions.add(sub);
+    }
   }
 
   // Close news detail
@@ -694,7 +707,10 @@ export class NewsComponent implements OnInit, OnDestroy {
   }
 
   // Get read time estimate
-  getReadTime(content: string): string {
+  getReadTime(content: string | undefined): string {
+    if (!content) {
+      return '';
+    }
     const words = this.stripHtml(content).split(/\s+/).length;
     const minutes = Math.ceil(words / 200);
     return `${minutes} মিনিট পড়া`;